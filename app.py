@@ -1,5 +1,5 @@
 from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
+from database import db
 import os
 import json
 
@@ -26,23 +26,58 @@ def to_json_filter(value):
 
 # Database configuration
 basedir = os.path.abspath(os.path.dirname(__file__))
-app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(basedir, "instance", "hr_platform.db")}'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
+    'SQLALCHEMY_DATABASE_URI', f'sqlite:///{os.path.join(basedir, "instance", "hr_platform.db")}'
+)
+# Load the bundled employee and resume data into an empty database at startup
+app.config['AUTOLOAD_REAL_DATA'] = os.environ.get('AUTOLOAD_REAL_DATA', '1') == '1'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 
+# Resume screening worker processes (defaults to one per CPU)
+app.config['SCREENING_WORKERS'] = int(os.environ.get('SCREENING_WORKERS', os.cpu_count() or 1))
+# Uploads larger than this are screened as a background job instead of in the request
+app.config['SCREENING_ASYNC_THRESHOLD'] = int(os.environ.get('SCREENING_ASYNC_THRESHOLD', 50))
+# Upload caps: larger requests are rejected with 413 before parsing, larger files are skipped
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('SCREENING_MAX_REQUEST_MB', 200)) * 1024 * 1024
+app.config['SCREENING_MAX_FILE_BYTES'] = int(os.environ.get('SCREENING_MAX_FILE_MB', 10)) * 1024 * 1024
+# Directory for uploads waiting in background screening jobs (defaults to the system temp dir)
+app.config['SCREENING_SPOOL_DIR'] = os.environ.get('SCREENING_SPOOL_DIR')
+# Seconds without a heartbeat after which a queued or running screening job is failed at startup
+app.config['SCREENING_JOB_TIMEOUT'] = int(os.environ.get('SCREENING_JOB_TIMEOUT', 600))
+# OCR for scanned PDFs: render resolution, concurrent tesseract processes per document,
+# and seconds one document may spend in OCR before remaining pages are skipped (0 = no limit)
+app.config['OCR_DPI'] = int(os.environ.get('OCR_DPI', 144))
+app.config['OCR_WORKERS'] = int(os.environ.get('OCR_WORKERS', min(4, os.cpu_count() or 1)))
+app.config['OCR_TIME_BUDGET'] = float(os.environ.get('OCR_TIME_BUDGET', 60))
+# Token required in the X-Admin-Token header by admin API writes (unset = those endpoints are disabled)
+app.config['ADMIN_API_TOKEN'] = os.environ.get('ADMIN_API_TOKEN')
+# Seconds the company insights leaderboard is cached between writes (0 = always recompute); each worker
+# drops its cache on its own writes, so this is also how stale other workers' leaderboards can get
+app.config['LEADERBOARD_CACHE_SECONDS'] = int(os.environ.get('LEADERBOARD_CACHE_SECONDS', 300))
+
 # Initialize extensions
-db = SQLAlchemy(app)
+db.init_app(app)
 
 # Import models after db initialization
 from models import *
 
+# Register the session hook that scores reviews as they are inserted
+import utils.sentiment_scorer
+
 # Create tables
 with app.app_context():
     db.create_all()
 
+    # Add columns and indexes introduced since the database was created
+    from utils.schema_migrations import upgrade_schema
+    schema_changes = upgrade_schema(db)
+    if schema_changes:
+        print(f"Upgraded database schema: {', '.join(schema_changes)}")
+
     # Auto-initialize data if database is empty
     from models import Employee, Resume, PerformanceReview
-    if Employee.query.count() == 0:
+    if app.config['AUTOLOAD_REAL_DATA'] and Employee.query.count() == 0:
         print("Database is empty. Initializing with real data...")
         try:
             from data.real_data_loader import RealDataLoader
@@ -72,6 +107,7 @@ with app.app_context():
 
             # Generate performance reviews based on manager ratings
             employees = Employee.query.all()
+            reviews = []
             for employee in employees:
                 review_data = {
                     'employee_id': employee.id,
@@ -81,8 +117,10 @@ with app.app_context():
                     'sentiment_score': 0.0,
                     'created_at': datetime.now()
                 }
-                review = PerformanceReview(**review_data)
-                db.session.add(review)
+                reviews.append(PerformanceReview(**review_data))
+
+            # Sentiment is scored as the reviews are flushed
+            db.session.add_all(reviews)
 
             db.session.commit()
 
@@ -192,5 +230,22 @@ with app.app_context():
 
     print("Database tables created successfully!")
 
+@app.cli.command('score-sentiment')
+def score_sentiment_command():
+    """Score performance reviews that have no sentiment score yet"""
+    from utils.nlp_processor import get_nlp_processor
+    from utils.sentiment_scorer import SentimentBatchScorer
+
+    scored = SentimentBatchScorer(app, get_nlp_processor()).score_pending()
+    print(f"Scored sentiment for {scored} performance reviews")
+
+@app.cli.command('build-company-metrics')
+def build_company_metrics_command():
+    """Rebuild the monthly CompanyMetrics snapshots from HR transactions"""
+    from utils.company_metrics import company_metrics
+
+    rows = company_metrics.rebuild()
+    print(f"Wrote {rows} company metrics snapshot rows")
+
 # Import routes after everything is set up
 import routes
\ No newline at end of file
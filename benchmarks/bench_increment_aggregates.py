@@ -0,0 +1,134 @@
+"""
+Benchmark: SQL-side increment aggregation vs. the original ORM loop over every increment
+
+Run from the repository root:
+    python benchmarks/bench_increment_aggregates.py [--sizes 10000,100000]
+
+Each size is the number of increment transactions seeded into a throwaway
+SQLite database, spread over three years and six departments. The
+benchmark times the original _analyze_increments, which hydrated every
+increment of the year, against one trend-cube query plus a snapshot
+rebuild and read. tests/test_company_metrics.py checks that both return the
+same increment figures.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import extract, insert
+
+from database import db
+from models import HRTransaction
+from utils.company_metrics import CompanyMetricsSnapshots
+
+DEPARTMENTS = ('Engineering', 'Sales', 'Marketing', 'HR', 'Finance', 'Operations', None)
+
+
+def legacy_analyze_increments(year):
+    """Original RealHRAnalytics._analyze_increments, kept here as the reference implementation"""
+    increments = HRTransaction.query.filter(
+        HRTransaction.transaction_type == 'increment',
+        extract('year', HRTransaction.effective_date) == year
+    ).all()
+
+    if not increments:
+        return {'total_increments': 0, 'total_amount': 0, 'average_percentage': 0, 'by_department': {}, 'by_month': {}}
+
+    total_increments = len(increments)
+    total_amount = sum(inc.amount or 0 for inc in increments)
+    avg_percentage = sum(inc.percentage or 0 for inc in increments) / total_increments
+
+    dept_increments = defaultdict(lambda: {'count': 0, 'total_amount': 0})
+    for inc in increments:
+        if inc.department:
+            dept_increments[inc.department]['count'] += 1
+            dept_increments[inc.department]['total_amount'] += inc.amount or 0
+
+    monthly_increments = defaultdict(lambda: {'count': 0, 'total_amount': 0})
+    for inc in increments:
+        month = inc.effective_date.month
+        monthly_increments[month]['count'] += 1
+        monthly_increments[month]['total_amount'] += inc.amount or 0
+
+    return {
+        'total_increments': total_increments,
+        'total_amount': total_amount,
+        'average_percentage': round(avg_percentage, 2),
+        'by_department': dict(dept_increments),
+        'by_month': dict(monthly_increments)
+    }
+
+
+def seed(count, year, seed=42):
+    """Insert `count` increments dated across year - 2 .. year"""
+    rng = random.Random(seed)
+    first_day = date(year - 2, 1, 1)
+    days = (date(year, 12, 31) - first_day).days
+
+    db.session.execute(insert(HRTransaction), [
+        {
+            'employee_id': rng.randint(1, 5000),
+            'transaction_type': 'increment',
+            'amount': float(rng.randrange(1000, 20000, 250)) if rng.random() < 0.95 else None,
+            'percentage': rng.choice((3.0, 5.0, 7.5, 10.0, 12.5)),
+            'department': rng.choice(DEPARTMENTS),
+            'effective_date': first_day + timedelta(days=rng.randint(0, days))
+        }
+        for _ in range(count)
+    ])
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000')
+    args = parser.parse_args()
+
+    year = date.today().year
+    snapshots = CompanyMetricsSnapshots()
+    print(f"{'increments':>10}  {'legacy':>9}  {'cube':>9}  {'rebuild':>9}  {'read':>9}  speedup")
+    for size in (int(value) for value in args.sizes.split(',')):
+        with tempfile.TemporaryDirectory() as directory:
+            bench_app = Flask(__name__)
+            bench_app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(directory, "bench.db")}'
+            db.init_app(bench_app)
+
+            with bench_app.app_context():
+                db.create_all()
+                seed(size, year)
+
+                start = time.perf_counter()
+                expected = legacy_analyze_increments(year)
+                legacy_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                snapshots.trend_cube(*snapshots._period_bounds(year, None))
+                cube_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                snapshots.rebuild()
+                rebuild_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                increment_data = snapshots.year_summary(year)['increment_data']
+                read_time = time.perf_counter() - start
+
+                assert increment_data['total_increments'] == expected['total_increments']
+                print(f"{size:>10}  {legacy_time:>8.3f}s  {cube_time:>8.3f}s  {rebuild_time:>8.3f}s  "
+                      f"{read_time:>8.3f}s  {legacy_time / cube_time:.0f}x")
+
+                db.session.remove()
+                db.engine.dispose()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Benchmark: single-statement employee leaderboard vs. the original 2N+1 query loop
+
+Run from the repository root:
+    python benchmarks/bench_leaderboard.py [--sizes 1000,10000,100000] [--legacy-max 10000]
+
+Each size is seeded into a throwaway SQLite database with two reviews per
+employee and one increment for every other employee. The legacy loop issues
+two queries per employee, so it is skipped above --legacy-max.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert
+
+from database import db
+from models import Employee, HRTransaction, PerformanceReview
+from utils.employee_leaderboard import EmployeeLeaderboard
+
+DEPARTMENTS = ('Engineering', 'Sales', 'Marketing', 'HR', 'Finance', 'Operations')
+
+
+def legacy_leaderboard():
+    """Original RealHRAnalytics._get_employee_leaderboard, kept here as the reference implementation"""
+    employees = Employee.query.filter_by(status='active').all()
+
+    leaderboard_data = []
+    for emp in employees:
+        latest_review = PerformanceReview.query.filter_by(
+            employee_id=emp.id
+        ).order_by(PerformanceReview.created_at.desc()).first()
+
+        rating = latest_review.overall_rating if latest_review else emp.performance_score or 7.0
+
+        recent_increments = HRTransaction.query.filter(
+            HRTransaction.employee_id == emp.id,
+            HRTransaction.transaction_type == 'increment',
+            HRTransaction.effective_date >= datetime.now().date() - timedelta(days=365)
+        ).count()
+
+        leaderboard_data.append({
+            'id': emp.id,
+            'name': emp.name,
+            'department': emp.department,
+            'position': emp.position,
+            'rating': rating,
+            'increments_this_year': recent_increments
+        })
+
+    leaderboard_data.sort(key=lambda x: (x['rating'], x['increments_this_year']), reverse=True)
+    return leaderboard_data[:10]
+
+
+def seed(count, seed=42):
+    """Insert `count` employees with reviews and increments"""
+    rng = random.Random(seed)
+    today = date.today()
+
+    db.session.execute(insert(Employee), [
+        {
+            'name': f'Employee {index}',
+            'email': f'employee{index}@example.com',
+            'department': rng.choice(DEPARTMENTS),
+            'position': 'Engineer',
+            'hire_date': today - timedelta(days=rng.randint(30, 3000)),
+            'performance_score': round(rng.uniform(4, 10), 1),
+            'status': 'active' if rng.random() < 0.9 else 'inactive'
+        }
+        for index in range(count)
+    ])
+    db.session.execute(insert(PerformanceReview), [
+        {
+            'employee_id': employee_id,
+            'review_period': period,
+            'feedback': 'Review',
+            'overall_rating': round(rng.uniform(4, 10), 1),
+            'created_at': datetime(2024, month, 1)
+        }
+        for employee_id in range(1, count + 1)
+        for period, month in (('H1', 1), ('H2', 7))
+    ])
+    db.session.execute(insert(HRTransaction), [
+        {
+            'employee_id': employee_id,
+            'transaction_type': 'increment',
+            'percentage': 5.0,
+            'effective_date': today - timedelta(days=rng.randint(0, 700))
+        }
+        for employee_id in range(1, count + 1, 2)
+    ])
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--legacy-max', type=int, default=10000)
+    args = parser.parse_args()
+
+    leaderboard = EmployeeLeaderboard()
+    print(f"{'employees':>9}  {'legacy':>10}  {'single':>10}  speedup")
+    for size in (int(value) for value in args.sizes.split(',')):
+        with tempfile.TemporaryDirectory() as directory:
+            bench_app = Flask(__name__)
+            bench_app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(directory, "bench.db")}'
+            db.init_app(bench_app)
+
+            with bench_app.app_context():
+                db.create_all()
+                seed(size)
+
+                start = time.perf_counter()
+                rows = leaderboard.compute(10)
+                single_time = time.perf_counter() - start
+
+                if size <= args.legacy_max:
+                    start = time.perf_counter()
+                    expected = legacy_leaderboard()
+                    legacy_time = time.perf_counter() - start
+                    assert rows == expected, 'leaderboards differ'
+                    print(f"{size:>9}  {legacy_time:>9.2f}s  {single_time:>9.3f}s  {legacy_time / single_time:.0f}x")
+                else:
+                    print(f"{size:>9}  {'-':>10}  {single_time:>9.3f}s  -")
+
+                db.session.remove()
+                db.engine.dispose()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
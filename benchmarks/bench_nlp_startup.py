@@ -0,0 +1,69 @@
+"""
+Benchmark: NLPProcessor start-up cost with per-instance vs. shared precompiled skill tables
+
+Run from the repository root:
+    python benchmarks/bench_nlp_startup.py [--instances 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import skill_taxonomy
+from utils.nlp_processor import NLPProcessor, get_nlp_processor
+from utils.term_matcher import TermMatcher
+
+
+def legacy_collect_prefixes(self, trie):
+    """Original pairwise prefix table, kept here as the reference implementation"""
+    prefixes = {}
+    for term in self.terms:
+        shorter = [other for other in self.terms if other != term and term.startswith(other)]
+        if shorter:
+            prefixes[term] = shorter
+    return prefixes
+
+
+def legacy_construct():
+    """Build an NLPProcessor the old way: recompile the skill tables for every instance"""
+    skill_taxonomy.SkillTaxonomy.from_file(skill_taxonomy.TAXONOMY_PATH)
+    return NLPProcessor()
+
+
+def time_per_call(func, count):
+    """Average milliseconds per call"""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--instances', type=int, default=50)
+    args = parser.parse_args()
+
+    collect_prefixes = TermMatcher._collect_prefixes
+    TermMatcher._collect_prefixes = legacy_collect_prefixes
+    try:
+        legacy_ms = time_per_call(legacy_construct, args.instances)
+    finally:
+        TermMatcher._collect_prefixes = collect_prefixes
+
+    taxonomy_ms = time_per_call(lambda: skill_taxonomy.SkillTaxonomy.from_file(skill_taxonomy.TAXONOMY_PATH), args.instances)
+    instance_ms = time_per_call(NLPProcessor, args.instances)
+    shared_ms = time_per_call(get_nlp_processor, args.instances)
+
+    print(f"instances:                 {args.instances}")
+    print(f"per-instance tables (old): {legacy_ms:.2f} ms/instance")
+    print(f"taxonomy compile (once):   {taxonomy_ms:.2f} ms")
+    print(f"NLPProcessor() on shared:  {instance_ms:.2f} ms/instance")
+    print(f"get_nlp_processor():       {shared_ms:.4f} ms/call")
+    print(f"construction speedup:      {legacy_ms / instance_ms:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
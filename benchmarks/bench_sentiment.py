@@ -0,0 +1,90 @@
+"""
+Benchmark: batch lexicon sentiment scoring vs. the original per-review substring scan
+
+Run from the repository root:
+    python benchmarks/bench_sentiment.py [--sizes 10000,100000,1000000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sentiment_lexicon import NEGATIVE_TERMS, NEGATORS, POSITIVE_TERMS, SENTIMENT_LEXICON
+
+FILLER_WORDS = (
+    'the', 'team', 'project', 'quarter', 'delivery', 'work', 'with', 'on', 'and', 'was',
+    'has', 'their', 'goals', 'review', 'client', 'code', 'process', 'results', 'very', 'in'
+)
+
+
+def legacy_analyze_sentiment(text):
+    """Original substring-count scorer, kept here as the reference implementation"""
+    positive_words = [
+        'excellent', 'outstanding', 'exceptional', 'great', 'good', 'positive', 'strong',
+        'impressed', 'exceeded', 'successful', 'effective', 'innovative', 'creative',
+        'dedicated', 'motivated', 'reliable', 'professional', 'skilled', 'talented'
+    ]
+    negative_words = [
+        'poor', 'bad', 'weak', 'inadequate', 'disappointing', 'failed', 'struggling',
+        'needs improvement', 'below average', 'unsatisfactory', 'problematic',
+        'concerning', 'difficult', 'challenging', 'issues', 'problems'
+    ]
+
+    text_lower = text.lower()
+    positive_count = sum(1 for word in positive_words if word in text_lower)
+    negative_count = sum(1 for word in negative_words if word in text_lower)
+
+    total_words = len(text.split())
+    if total_words == 0:
+        return 0.0
+
+    sentiment_score = (positive_count - negative_count) / max(total_words / 10, 1)
+    return round(max(0, min(10, (sentiment_score + 1) * 5)), 2)
+
+
+def synthetic_reviews(count, seed=42):
+    """Generate review-like texts mixing filler, lexicon terms, negators and punctuation"""
+    rng = random.Random(seed)
+    vocabulary = FILLER_WORDS * 4 + POSITIVE_TERMS + NEGATIVE_TERMS + NEGATORS[:4]
+    reviews = []
+    for _ in range(count):
+        sentences = []
+        for _ in range(rng.randint(2, 5)):
+            sentences.append(' '.join(rng.choice(vocabulary) for _ in range(rng.randint(6, 14))).capitalize() + '.')
+        reviews.append(' '.join(sentences))
+    return reviews
+
+
+def best_time(function, repeat):
+    """Fastest of `repeat` runs, which filters out scheduler and allocator noise"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'reviews':>9}  {'legacy':>10}  {'batch':>10}  {'reviews/s':>12}  speedup")
+    for size in (int(value) for value in args.sizes.split(',')):
+        reviews = synthetic_reviews(size)
+
+        legacy_time = best_time(lambda: [legacy_analyze_sentiment(review) for review in reviews], args.repeat)
+        batch_time = best_time(lambda: SENTIMENT_LEXICON.score_many(reviews), args.repeat)
+
+        print(f"{size:>9}  {legacy_time:>9.2f}s  {batch_time:>9.2f}s  {size / batch_time:>12,.0f}  "
+              f"{legacy_time / batch_time:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
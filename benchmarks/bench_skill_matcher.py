@@ -0,0 +1,79 @@
+"""
+Micro-benchmark: single-scan skill matcher vs. the original per-skill regex loop
+
+Run from the repository root:
+    python benchmarks/bench_skill_matcher.py [--resumes 2000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.nlp_processor import NLPProcessor
+
+
+def legacy_extract_skills(nlp, text):
+    """Original extract_skills loop, kept here as the reference implementation"""
+    text_lower = text.lower()
+    found_skills = []
+
+    for skill in nlp.all_skills:
+        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
+        if re.search(pattern, text_lower):
+            found_skills.append(skill)
+
+    for main_skill, variations in nlp.skill_aliases.items():
+        for variation in variations:
+            pattern = r'\b' + re.escape(variation) + r'\b'
+            if re.search(pattern, text_lower) and main_skill not in [s.lower() for s in found_skills]:
+                found_skills.append(main_skill)
+
+    return list(set(found_skills))
+
+
+def make_resumes(nlp, count, seed=42):
+    """Generate synthetic resumes mixing skills, synonyms and filler prose"""
+    rng = random.Random(seed)
+    filler = ('worked on the team delivering projects for clients across several regions with '
+              'responsibility for planning reporting and stakeholder updates').split()
+    vocabulary = list(nlp.all_skills) + ['C++ developer', 'Node.JS', 'react-native', 'python3', 'AI/ML', 'CI/CD,']
+    resumes = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(300, 900)):
+            words.append(rng.choice(vocabulary) if rng.random() < 0.08 else rng.choice(filler))
+        resumes.append(' '.join(words))
+    return resumes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=2000)
+    args = parser.parse_args()
+
+    nlp = NLPProcessor()
+    resumes = make_resumes(nlp, args.resumes)
+
+    start = time.perf_counter()
+    legacy = [set(legacy_extract_skills(nlp, text)) for text in resumes]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [set(nlp.extract_skills(text)) for text in resumes]
+    compiled_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(legacy, compiled) if a != b)
+    print(f"resumes:            {len(resumes)}")
+    print(f"per-skill loop:     {legacy_time:.3f}s ({legacy_time / len(resumes) * 1000:.2f} ms/resume)")
+    print(f"single-scan match:  {compiled_time:.3f}s ({compiled_time / len(resumes) * 1000:.2f} ms/resume)")
+    print(f"speedup:            {legacy_time / compiled_time:.1f}x")
+    print(f"mismatched results: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
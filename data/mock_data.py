@@ -3,6 +3,8 @@ import json
 from datetime import datetime, timedelta
 from faker import Faker
 
+from utils.skill_taxonomy import get_skill_taxonomy
+
 class MockDataGenerator:
     """Generate mock data for HR platform demonstration"""
     
@@ -18,19 +20,6 @@ class MockDataGenerator:
             'Operations': ['Operations Manager', 'Project Manager', 'Operations Coordinator', 'Process Analyst', 'Logistics Manager']
         }
         
-        self.skills_database = {
-            'programming': ['Python', 'Java', 'JavaScript', 'C++', 'C#', 'Ruby', 'PHP', 'Go', 'Rust', 'Kotlin'],
-            'web_development': ['HTML', 'CSS', 'React', 'Angular', 'Vue.js', 'Node.js', 'Express', 'Django', 'Flask'],
-            'database': ['SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'SQLite', 'Oracle', 'Cassandra'],
-            'cloud': ['AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Terraform', 'Ansible'],
-            'data_science': ['Pandas', 'NumPy', 'Scikit-learn', 'TensorFlow', 'PyTorch', 'Jupyter', 'R', 'Tableau'],
-            'soft_skills': ['Leadership', 'Communication', 'Teamwork', 'Problem Solving', 'Creativity', 'Adaptability'],
-            'project_management': ['Agile', 'Scrum', 'Kanban', 'Jira', 'Confluence', 'Project Planning'],
-            'design': ['Photoshop', 'Illustrator', 'Figma', 'Sketch', 'UI/UX', 'Graphic Design'],
-            'marketing': ['SEO', 'SEM', 'Content Marketing', 'Social Media', 'Email Marketing', 'Analytics'],
-            'finance': ['Financial Analysis', 'Accounting', 'Budgeting', 'Excel', 'QuickBooks', 'SAP']
-        }
-        
         self.learning_modules = [
             {
                 'id': 'leadership-101',
@@ -105,18 +94,20 @@ class MockDataGenerator:
         
         return employees
     
+    @property
+    def skills_database(self):
+        """Skill categories from the shared taxonomy, in display casing"""
+        taxonomy = get_skill_taxonomy()
+        return {
+            category: [taxonomy.display_name(skill) for skill in skills]
+            for category, skills in taxonomy.categories.items()
+        }
+
     def _get_department_skills(self, department):
         """Get relevant skills for a department"""
-        skill_mapping = {
-            'Engineering': self.skills_database['programming'] + self.skills_database['web_development'] + self.skills_database['cloud'],
-            'Marketing': self.skills_database['marketing'] + self.skills_database['design'] + self.skills_database['soft_skills'],
-            'Sales': self.skills_database['soft_skills'] + ['CRM', 'Negotiation', 'Lead Generation'],
-            'HR': self.skills_database['soft_skills'] + ['Recruitment', 'Employee Relations', 'HRIS'],
-            'Finance': self.skills_database['finance'] + ['Risk Management', 'Compliance', 'Taxation'],
-            'Operations': self.skills_database['project_management'] + ['Process Improvement', 'Supply Chain', 'Quality Management']
-        }
-        
-        return skill_mapping.get(department, self.skills_database['soft_skills'])
+        taxonomy = get_skill_taxonomy()
+        skills = taxonomy.department_skills.get(department) or taxonomy.categories.get('soft_skills', ())
+        return [taxonomy.display_name(skill) for skill in skills]
     
     def generate_performance_review(self, employee_id):
         """Generate a mock performance review"""
@@ -159,12 +150,13 @@ class MockDataGenerator:
         
         # Extract skills from job description (simplified)
         job_skills = self._extract_skills_from_text(job_description)
+        skill_pool = [skill for skills in self.skills_database.values() for skill in skills]
         
         for _ in range(count):
             # Generate candidate skills with some overlap with job requirements
             candidate_skills = list(set(
                 random.sample(job_skills, k=min(len(job_skills), random.randint(2, 4))) +
-                random.sample([skill for skills in self.skills_database.values() for skill in skills], k=random.randint(3, 6))
+                random.sample(skill_pool, k=random.randint(3, 6))
             ))
             
             # Calculate relevance score based on skill overlap
@@ -192,15 +184,10 @@ class MockDataGenerator:
     
     def _extract_skills_from_text(self, text):
         """Extract skills from job description text"""
-        text_lower = text.lower()
-        found_skills = []
-        
-        for category_skills in self.skills_database.values():
-            for skill in category_skills:
-                if skill.lower() in text_lower:
-                    found_skills.append(skill)
+        taxonomy = get_skill_taxonomy()
+        found_skills = [taxonomy.display_name(skill) for skill in taxonomy.extract(text)]
         
-        return list(set(found_skills)) if found_skills else ['Communication', 'Teamwork', 'Problem Solving']
+        return found_skills if found_skills else ['Communication', 'Teamwork', 'Problem Solving']
     
     def _generate_similar_role(self, job_title):
         """Generate a similar role title"""
@@ -4,7 +4,8 @@ import json
 import os
 import zipfile
 from datetime import datetime
-from werkzeug.utils import secure_filename
+
+from utils.skill_taxonomy import get_skill_taxonomy
 
 class RealDataLoader:
     """Load real employee data from uploaded files"""
@@ -129,24 +130,8 @@ class RealDataLoader:
     
     def _generate_skills_from_role(self, job_role):
         """Generate relevant skills based on job role"""
-        role_lower = job_role.lower()
-        
-        skill_sets = {
-            'engineer': ['Python', 'Java', 'JavaScript', 'SQL', 'Git', 'Agile', 'Problem Solving'],
-            'manager': ['Leadership', 'Project Management', 'Communication', 'Strategic Planning', 'Team Building'],
-            'analyst': ['Excel', 'SQL', 'Data Analysis', 'Reporting', 'Critical Thinking'],
-            'sales': ['Negotiation', 'CRM', 'Communication', 'Lead Generation', 'Customer Relations'],
-            'marketing': ['Digital Marketing', 'Content Creation', 'SEO', 'Social Media', 'Analytics'],
-            'hr': ['Recruitment', 'Employee Relations', 'HRIS', 'Communication', 'Conflict Resolution'],
-            'finance': ['Financial Analysis', 'Excel', 'Accounting', 'Budgeting', 'Risk Management']
-        }
-        
-        for role_type, skills in skill_sets.items():
-            if role_type in role_lower:
-                return json.dumps(skills)
-        
-        # Default skills
-        return json.dumps(['Communication', 'Teamwork', 'Problem Solving', 'Time Management'])
+        taxonomy = get_skill_taxonomy()
+        return json.dumps([taxonomy.display_name(skill) for skill in taxonomy.skills_for_role(job_role)])
     
     def _get_fallback_employee_data(self):
         """Fallback employee data if Excel file can't be loaded"""
@@ -233,23 +218,14 @@ class RealDataLoader:
     
     def _extract_skills_from_resume(self, content):
         """Extract skills from resume content"""
-        # Common skills to look for
-        all_skills = [
-            'Python', 'Java', 'JavaScript', 'C++', 'C#', 'Ruby', 'PHP', 'Go',
-            'HTML', 'CSS', 'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask',
-            'SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis',
-            'AWS', 'Azure', 'Docker', 'Kubernetes',
-            'Leadership', 'Communication', 'Project Management', 'Agile', 'Scrum',
-            'Excel', 'Tableau', 'Power BI', 'Analytics'
+        taxonomy = get_skill_taxonomy()
+        found = set(taxonomy.extract(content))
+        # Canonical skills in taxonomy order, so the same resume always yields the same top 10
+        found_skills = [
+            taxonomy.display_name(skill)
+            for skills in taxonomy.categories.values() for skill in skills if skill in found
         ]
         
-        content_lower = content.lower()
-        found_skills = []
-        
-        for skill in all_skills:
-            if skill.lower() in content_lower:
-                found_skills.append(skill)
-        
         return found_skills[:10]  # Limit to top 10 skills
     
     def cleanup_temp_files(self):
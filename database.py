@@ -0,0 +1,4 @@
+from flask_sqlalchemy import SQLAlchemy
+
+# Shared extension instance, bound to the Flask app by app.py (or a script's own app) via init_app
+db = SQLAlchemy()
@@ -1,4 +1,4 @@
-from app import db
+from database import db
 from datetime import datetime
 from sqlalchemy import Text, JSON
 
@@ -20,7 +20,7 @@ class Employee(db.Model):
     last_hike_date = db.Column(db.Date)
     last_promotion_date = db.Column(db.Date)
     skill_gaps = db.Column(db.String(500))
-    status = db.Column(db.String(20), default='active')  # active, inactive, terminated
+    status = db.Column(db.String(20), default='active', index=True)  # active, inactive, terminated
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def __init__(self, **kwargs):
@@ -35,9 +35,45 @@ class Resume(db.Model):
     job_description = db.Column(Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class ParsedResume(db.Model):
+    """Parsed resume text and extracted features cached by the SHA-256 of the uploaded file"""
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), unique=True, nullable=False)
+    content = db.Column(Text, nullable=False)
+    skills_extracted = db.Column(Text)  # JSON string
+    experience_years = db.Column(db.Integer)
+    taxonomy_fingerprint = db.Column(db.String(64))  # skill taxonomy the skills were extracted with
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ScreeningJob(db.Model):
+    """Background resume screening job queued from the upload form"""
+    id = db.Column(db.Integer, primary_key=True)
+    job_description = db.Column(Text)
+    status = db.Column(db.String(20), default='queued')  # queued, running, completed, failed
+    total_files = db.Column(db.Integer, default=0)
+    processed_files = db.Column(db.Integer, default=0)
+    error = db.Column(Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)  # touched while the owning worker is alive
+
+class ScreeningJobFile(db.Model):
+    """Per-file progress and result for a screening job"""
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('screening_job.id'), nullable=False, index=True)
+    filename = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String(20), default='pending')  # pending, completed, failed
+    score = db.Column(db.Float)
+    skills_extracted = db.Column(Text)  # JSON string
+    reasoning = db.Column(Text)
+    error = db.Column(Text)
+    completed_at = db.Column(db.DateTime)
+    job = db.relationship('ScreeningJob', backref=db.backref('files', lazy=True))
+
 class LearningProgress(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False, index=True)
     module_name = db.Column(db.String(100), nullable=False)
     score = db.Column(db.Integer, default=0)
     completed = db.Column(db.Boolean, default=False)
@@ -55,10 +91,17 @@ class WellnessCheck(db.Model):
     check_date = db.Column(db.DateTime, default=datetime.utcnow)
     employee = db.relationship('Employee', backref=db.backref('wellness_checks', lazy=True))
 
+    __table_args__ = (
+        # Profile pages list an employee's latest checks
+        db.Index('ix_wellness_check_employee_check_date', 'employee_id', 'check_date'),
+        # Recent-check summaries filter by date and count by status without touching the table
+        db.Index('ix_wellness_check_check_date_overall_wellness', 'check_date', 'overall_wellness'),
+    )
+
 class HealthMetrics(db.Model):
     """Comprehensive health metrics for employees"""
     id = db.Column(db.Integer, primary_key=True)
-    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False, index=True)
     bmi = db.Column(db.Float)
     bmi_status = db.Column(db.String(20))  # Normal, Overweight, Obese, Underweight
     blood_pressure = db.Column(db.String(20))  # e.g., "120/80"
@@ -82,10 +125,18 @@ class PerformanceReview(db.Model):
     review_period = db.Column(db.String(50), nullable=False)
     feedback = db.Column(Text, nullable=False)
     sentiment_score = db.Column(db.Float, default=0.0)
+    sentiment_scored_at = db.Column(db.DateTime, index=True)  # Null until the sentiment scorer has run
     overall_rating = db.Column(db.Float, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Own index as well as the composite below: the appraisal dashboard lists every review newest
+    # first and company analytics filter the last year, neither by employee
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     employee = db.relationship('Employee', backref=db.backref('performance_reviews', lazy=True))
 
+    __table_args__ = (
+        # Profile pages and the leaderboard read each employee's reviews newest first
+        db.Index('ix_performance_review_employee_created_at', 'employee_id', 'created_at'),
+    )
+
 class HRTransaction(db.Model):
     """Track all HR transactions like increments, promotions, joinings, exits"""
     id = db.Column(db.Integer, primary_key=True)
@@ -101,8 +152,15 @@ class HRTransaction(db.Model):
     reason = db.Column(Text)  # reason for increment/promotion/exit
     effective_date = db.Column(db.Date, nullable=False)
     created_by = db.Column(db.String(100))  # HR person who made the entry
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     employee = db.relationship('Employee', backref=db.backref('hr_transactions', lazy=True))
+
+    __table_args__ = (
+        # Company analytics filter by type and a half-open effective_date range
+        db.Index('ix_hr_transaction_type_effective_date', 'transaction_type', 'effective_date'),
+        # Per-employee history and increment counts
+        db.Index('ix_hr_transaction_employee_type_effective_date', 'employee_id', 'transaction_type', 'effective_date'),
+    )
     
     def __init__(self, **kwargs):
         super(HRTransaction, self).__init__(**kwargs)
@@ -119,6 +177,10 @@ class EmployeeHistory(db.Model):
     notes = db.Column(Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     employee = db.relationship('Employee', backref=db.backref('history_records', lazy=True))
+
+    __table_args__ = (
+        db.Index('ix_employee_history_employee_change_date', 'employee_id', 'change_date'),
+    )
     
     def __init__(self, **kwargs):
         super(EmployeeHistory, self).__init__(**kwargs)
@@ -136,6 +198,11 @@ class CompanyMetrics(db.Model):
     notes = db.Column(Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Snapshot reads load one period year; rebuilds delete by year and month
+        db.Index('ix_company_metrics_period', 'period_type', 'period_year', 'period_month'),
+    )
+
 class Challenge(db.Model):
     """HR Training Challenges for gamification"""
     id = db.Column(db.Integer, primary_key=True)
@@ -170,8 +237,8 @@ class Badge(db.Model):
 class EmployeeXP(db.Model):
     """Track employee XP and level"""
     id = db.Column(db.Integer, primary_key=True)
-    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
-    total_xp = db.Column(db.Integer, default=0)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False, index=True)
+    total_xp = db.Column(db.Integer, default=0, index=True)
     current_level = db.Column(db.Integer, default=1)
     xp_to_next_level = db.Column(db.Integer, default=100)
     last_activity = db.Column(db.DateTime, default=datetime.utcnow)
@@ -197,17 +264,21 @@ class EmployeeBadge(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
     badge_id = db.Column(db.Integer, db.ForeignKey('badge.id'), nullable=False)
-    earned_date = db.Column(db.DateTime, default=datetime.utcnow)
+    earned_date = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     earned_for = db.Column(db.String(200))  # What they earned it for
     employee = db.relationship('Employee', backref=db.backref('earned_badges', lazy=True))
     badge = db.relationship('Badge', backref=db.backref('earned_by', lazy=True))
 
+    __table_args__ = (
+        db.Index('ix_employee_badge_employee_badge', 'employee_id', 'badge_id'),
+    )
+
 class ChallengeParticipation(db.Model):
     """Track employee participation in challenges"""
     id = db.Column(db.Integer, primary_key=True)
     employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
     challenge_id = db.Column(db.Integer, db.ForeignKey('challenge.id'), nullable=False)
-    status = db.Column(db.String(20), default='active')  # active, completed, failed
+    status = db.Column(db.String(20), default='active', index=True)  # active, completed, failed
     progress = db.Column(db.Integer, default=0)  # Progress percentage
     started_date = db.Column(db.DateTime, default=datetime.utcnow)
     completed_date = db.Column(db.DateTime)
@@ -215,6 +286,11 @@ class ChallengeParticipation(db.Model):
     employee = db.relationship('Employee', backref=db.backref('challenge_participations', lazy=True))
     challenge = db.relationship('Challenge', backref=db.backref('participants', lazy=True))
 
+    __table_args__ = (
+        db.Index('ix_challenge_participation_employee_challenge', 'employee_id', 'challenge_id'),
+        db.Index('ix_challenge_participation_challenge', 'challenge_id'),
+    )
+
 class Quiz(db.Model):
     """Quiz questions for HR modules"""
     id = db.Column(db.Integer, primary_key=True)
@@ -239,3 +315,7 @@ class QuizAttempt(db.Model):
     attempt_date = db.Column(db.DateTime, default=datetime.utcnow)
     employee = db.relationship('Employee', backref=db.backref('quiz_attempts', lazy=True))
     quiz = db.relationship('Quiz', backref=db.backref('attempts', lazy=True))
+
+    __table_args__ = (
+        db.Index('ix_quiz_attempt_employee_quiz', 'employee_id', 'quiz_id'),
+    )
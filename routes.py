@@ -1,26 +1,50 @@
-from flask import render_template, request, jsonify, flash, redirect, url_for
+from flask import render_template, request, jsonify, flash, redirect, url_for, abort
 from app import app, db
 from models import Employee, Resume, LearningProgress, WellnessCheck, PerformanceReview, HRTransaction, EmployeeHistory, CompanyMetrics, HealthMetrics, Challenge, Badge, EmployeeXP, EmployeeBadge, ChallengeParticipation, Quiz, QuizAttempt
-from utils.nlp_processor import NLPProcessor
+from utils.nlp_processor import get_nlp_processor
 from utils.hr_analytics import HRAnalytics
+from utils import hr_aggregates
+from utils.company_metrics import company_metrics
 from utils.document_parser import DocumentParser
+from utils.screening_pipeline import ScreeningPipeline, TopCandidates
+from utils.screening_jobs import ScreeningJobQueue
+from utils.parsed_resume_cache import ParsedResumeCache
+from utils.resume_index import ResumeIndex
+from utils.sentiment_scorer import SentimentBatchScorer
+from utils.skill_taxonomy import get_skill_taxonomy, reload_skill_taxonomy
 from data.mock_data import MockDataGenerator
 try:
     from data.real_data_loader import RealDataLoader
 except ImportError as e:
     print(f"Warning: Could not import RealDataLoader: {e}")
     RealDataLoader = None
+import hmac
 import json
 import os
 from werkzeug.utils import secure_filename
 from datetime import datetime
 import data.mock_data as mock_data
 
-nlp_processor = NLPProcessor()
+nlp_processor = get_nlp_processor()
 hr_analytics = HRAnalytics()
 document_parser = DocumentParser()
 mock_data_gen = MockDataGenerator()
 real_data_loader = RealDataLoader() if RealDataLoader else None
+resume_index = ResumeIndex(nlp_processor)
+screening_jobs = ScreeningJobQueue(app, nlp_processor, resume_index)
+sentiment_scorer = SentimentBatchScorer(app, nlp_processor)
+
+# Jobs left queued or running by a worker that has since stopped will never finish
+with app.app_context():
+    orphaned_jobs = screening_jobs.fail_orphaned(app.config['SCREENING_JOB_TIMEOUT'])
+    if orphaned_jobs:
+        print(f"Marked {orphaned_jobs} orphaned screening jobs as failed")
+
+# Candidates shown after a synchronous screening, rows per bulk insert, and
+# stored resumes per page of the ranked view
+TOP_CANDIDATES = 3
+RESUME_INSERT_CHUNK = 500
+RANKED_PAGE_SIZE = 10
 
 @app.route('/')
 def index():
@@ -40,46 +64,41 @@ def hr_command_center():
 @app.route('/dashboard')
 def dashboard():
     """HR Management Dashboard showing overview of all employee data"""
-    # Get comprehensive HR stats for dashboard
-    total_employees = Employee.query.count()
-    active_employees = Employee.query.filter_by(status='active').count()
-    
-    # Calculate average performance and wellness scores
-    avg_performance = db.session.query(db.func.avg(Employee.performance_score)).scalar() or 0
-    
-    # Calculate wellness scores from health metrics or wellness checks
-    wellness_scores = db.session.query(HealthMetrics.mood_score).all()
-    if wellness_scores:
-        avg_wellness = sum([score[0] for score in wellness_scores if score[0]]) / len([score[0] for score in wellness_scores if score[0]])
-    else:
-        avg_wellness = 0
-
-    # Department statistics with performance and wellness data
-    department_stats = {}
-    departments = db.session.query(Employee.department).distinct().all()
-    
-    for dept in departments:
-        dept_name = dept[0]
-        dept_employees = Employee.query.filter_by(department=dept_name).all()
-        
-        if dept_employees:
-            dept_count = len(dept_employees)
-            dept_performance = sum([emp.performance_score for emp in dept_employees if emp.performance_score]) / dept_count
-            
-            # Get wellness scores for department employees
-            dept_wellness_scores = []
-            for emp in dept_employees:
-                health_metrics = HealthMetrics.query.filter_by(employee_id=emp.id).first()
-                if health_metrics and health_metrics.mood_score:
-                    dept_wellness_scores.append(health_metrics.mood_score)
-            
-            dept_wellness = sum(dept_wellness_scores) / len(dept_wellness_scores) if dept_wellness_scores else 0
-            
-            department_stats[dept_name] = {
-                'count': dept_count,
-                'avg_performance': dept_performance,
-                'avg_wellness': dept_wellness
-            }
+    # Get comprehensive HR stats for dashboard, with average performance, in one pass
+    total_employees, active_employees, avg_performance = db.session.query(
+        db.func.count(Employee.id),
+        db.func.coalesce(db.func.sum(db.case((Employee.status == 'active', 1), else_=0)), 0),
+        db.func.avg(Employee.performance_score)
+    ).one()
+    avg_performance = avg_performance or 0
+
+    # Average wellness over all health metrics with a mood score (zero counts as missing)
+    avg_wellness = db.session.query(db.func.avg(db.func.nullif(HealthMetrics.mood_score, 0))).scalar() or 0
+
+    # Department statistics in one grouped query; wellness uses each employee's first health record
+    first_health = db.session.query(
+        HealthMetrics.employee_id, db.func.min(HealthMetrics.id).label('health_id')
+    ).group_by(HealthMetrics.employee_id).subquery()
+
+    department_rows = db.session.query(
+        Employee.department,
+        db.func.count(Employee.id),
+        db.func.sum(db.func.coalesce(Employee.performance_score, 0)),
+        db.func.avg(db.func.nullif(HealthMetrics.mood_score, 0))
+    ).outerjoin(
+        first_health, first_health.c.employee_id == Employee.id
+    ).outerjoin(
+        HealthMetrics, HealthMetrics.id == first_health.c.health_id
+    ).group_by(Employee.department).all()
+
+    department_stats = {
+        dept_name: {
+            'count': dept_count,
+            'avg_performance': performance_total / dept_count,
+            'avg_wellness': dept_wellness or 0
+        }
+        for dept_name, dept_count, performance_total, dept_wellness in department_rows
+    }
 
     return render_template('index.html', 
                          total_employees=total_employees,
@@ -149,10 +168,13 @@ def resume_screening():
     """HR Resume Screening Management - AI-powered candidate evaluation"""
     if request.method == 'POST':
         job_description = request.form.get('job_description', '')
+        top_k = max(1, min(request.form.get('top_k', TOP_CANDIDATES, type=int), 100))
 
-        # Handle file uploads
+        # Handle file uploads; werkzeug spools large parts to disk, so files are
+        # only read when the pipeline reaches them
         uploaded_files = request.files.getlist('resumes')
-        results = []
+        uploads = []
+        max_file_bytes = app.config['SCREENING_MAX_FILE_BYTES']
 
         for file in uploaded_files:
             if file and file.filename:
@@ -163,46 +185,203 @@ def resume_screening():
                     flash(f'Unsupported file format for {filename}. Please upload PDF, DOCX, DOC, or TXT files.', 'warning')
                     continue
 
-                # Extract text content using proper document parser
-                content = document_parser.extract_text_from_file(file, filename)
-
-                # Skip if content extraction failed
-                if not content or (isinstance(content, str) and content.startswith('Error:')):
-                    flash(f'Could not parse {filename}. Please ensure the file is not corrupted.', 'error')
+                file.stream.seek(0, os.SEEK_END)
+                file_size = file.stream.tell()
+                file.stream.seek(0)
+                if file_size > max_file_bytes:
+                    flash(f'{filename} is larger than the {max_file_bytes // (1024 * 1024)} MB limit and was skipped.', 'warning')
                     continue
 
-                # Process resume with NLP
-                skills = nlp_processor.extract_skills(content)
-                score = nlp_processor.calculate_match_score(content, job_description)
-
-                # Save to database
-                resume = Resume()
-                resume.filename = filename
-                resume.content = content
-                resume.skills_extracted = json.dumps(skills)
-                resume.score = score
-                resume.job_description = job_description
-                db.session.add(resume)
-
-                results.append({
-                    'filename': filename,
-                    'skills': skills,
-                    'score': score,
-                    'reasoning': nlp_processor.generate_reasoning(content, skills, score, job_description)
-                })
+                uploads.append((filename, file))
+
+        # Large batches (or an explicit request) run as a background job the page polls
+        run_async = request.form.get('mode') == 'async' or len(uploads) > app.config['SCREENING_ASYNC_THRESHOLD']
+        if run_async and uploads:
+            # The request's spooled files are gone once it returns, so the job copies them to its own
+            job_id = screening_jobs.enqueue(uploads, job_description)
+            if request.accept_mimetypes.best == 'application/json':
+                return jsonify({
+                    'job_id': job_id,
+                    'status_url': url_for('screening_job_status', job_id=job_id)
+                }), 202
+            return render_template('resume_screening.html',
+                                 job_id=job_id,
+                                 job_description=job_description)
+
+        # Weight keywords by how rare they are across stored resumes. Resumes stored by
+        # other workers are indexed in the background; until the first sync has finished
+        # the IDF would depend on how far it got, so scores use plain term frequency
+        resume_index.start()
+        idf = resume_index.inverse_document_frequencies() if resume_index.ready else None
+
+        # Parse and score resumes in parallel. Rows are stored and indexed in chunks
+        # and only the best candidates are kept, so memory doesn't grow with the batch
+        pipeline = ScreeningPipeline.from_config(app.config, feature_cache=ParsedResumeCache())
+        top_candidates = TopCandidates(top_k)
+        resume_rows = []
+
+        def store_resumes(rows):
+            resume_ids = db.session.scalars(db.insert(Resume).returning(Resume.id, sort_by_parameter_order=True), rows).all()
+            db.session.commit()
+            resume_index.add_rows([{**row, 'id': resume_id} for row, resume_id in zip(rows, resume_ids)])
+
+        for result in pipeline.run(uploads, job_description, idf=idf, with_reasoning=False):
+            if result.get('error'):
+                flash(result['error'], 'error')
+                continue
+
+            resume_rows.append({
+                'filename': result['filename'],
+                'content': result['content'],
+                'skills_extracted': json.dumps(result['skills']),
+                'score': result['score'],
+                'job_description': job_description
+            })
+            if len(resume_rows) >= RESUME_INSERT_CHUNK:
+                store_resumes(resume_rows)
+                resume_rows = []
 
-        db.session.commit()
+            top_candidates.add(result['score'], result)
 
-        # Sort by score and get top 3
-        results.sort(key=lambda x: x['score'], reverse=True)
-        top_candidates = results[:3]
+        if resume_rows:
+            store_resumes(resume_rows)
+
+        # Reasoning is only generated for the candidates actually shown
+        results = [
+            {
+                'filename': result['filename'],
+                'skills': result['skills'],
+                'score': result['score'],
+                'reasoning': nlp_processor.generate_reasoning(
+                    result['content'], result['skills'], result['score'], job_description, candidate_profile=result['profile']
+                )
+            }
+            for result in top_candidates.ranked()
+        ]
 
         return render_template('resume_screening.html', 
-                             results=top_candidates, 
-                             job_description=job_description)
+                             results=results, 
+                             job_description=job_description,
+                             top_k=top_k)
 
     return render_template('resume_screening.html')
 
+@app.route('/resume-screening/ranked')
+def resume_ranking():
+    """Paginated ranking of stored resumes, optionally for one job description"""
+    job_description = request.args.get('job_description', '')
+    page = request.args.get('page', 1, type=int)
+
+    query = Resume.query
+    if job_description:
+        query = query.filter(Resume.job_description == job_description)
+
+    ranking = query.order_by(Resume.score.desc(), Resume.id).paginate(
+        page=page, per_page=RANKED_PAGE_SIZE, error_out=False
+    )
+
+    # Reasoning is generated only for the page being shown
+    results = []
+    for resume in ranking.items:
+        skills = json.loads(resume.skills_extracted) if resume.skills_extracted else []
+        score = resume.score or 0
+        results.append({
+            'filename': resume.filename,
+            'skills': skills,
+            'score': score,
+            'reasoning': nlp_processor.generate_reasoning(
+                resume.content or '', skills, score, job_description or resume.job_description or ''
+            )
+        })
+
+    return render_template('resume_screening.html',
+                         results=results,
+                         ranking=ranking,
+                         rank_offset=(ranking.page - 1) * ranking.per_page,
+                         ranked_job_description=job_description,
+                         job_description=job_description)
+
+@app.errorhandler(413)
+def upload_too_large(error):
+    """Reject requests over MAX_CONTENT_LENGTH before any file is parsed"""
+    message = f"Upload exceeds the {app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)} MB request limit. Please screen fewer or smaller files at a time."
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify({'error': message}), 413
+    flash(message, 'error')
+    return redirect(url_for('resume_screening'))
+
+@app.route('/resume-screening/search', methods=['GET', 'POST'])
+def resume_search():
+    """Rank the stored resume pool against a new job description without re-uploading"""
+    if request.method == 'POST':
+        job_description = request.form.get('job_description', '')
+        top_k = max(1, min(request.form.get('top_k', 10, type=int), 100))
+
+        # Rank from the postings; resumes stored by other workers are indexed in the background
+        resume_index.start()
+        if not resume_index.ready:
+            flash('The stored resume pool is still being indexed, so some resumes may be missing from these results.', 'info')
+        matches = resume_index.search(job_description, top_k=top_k)
+
+        # Only the top-k candidates need their full text for reasoning
+        contents = dict(Resume.query.with_entities(Resume.id, Resume.content).filter(
+            Resume.id.in_([match['resume_id'] for match in matches])
+        ).all()) if matches else {}
+
+        results = []
+        for match in matches:
+            results.append({
+                'filename': match['filename'],
+                'skills': match['skills'],
+                'score': match['score'],
+                'reasoning': nlp_processor.generate_reasoning(
+                    contents.get(match['resume_id'], ''), match['skills'], match['score'], job_description
+                )
+            })
+
+        if not results:
+            flash('No stored resumes matched this job description.', 'info')
+
+        return render_template('resume_screening.html',
+                             results=results,
+                             job_description=job_description,
+                             search_mode=True,
+                             top_k=top_k)
+
+    return render_template('resume_screening.html', search_mode=True)
+
+@app.route('/api/screening-jobs/<int:job_id>')
+def screening_job_status(job_id):
+    """API endpoint reporting per-file progress and partial ranked results for a screening job"""
+    limit = request.args.get('limit', 10, type=int)
+    status = screening_jobs.get_status(job_id, limit=limit)
+
+    if not status:
+        return jsonify({'error': 'Screening job not found'}), 404
+
+    return jsonify(status)
+
+@app.route('/api/admin/skill-taxonomy')
+def skill_taxonomy_status():
+    """API endpoint describing the skill taxonomy this worker is using"""
+    return jsonify(get_skill_taxonomy().summary())
+
+@app.route('/api/admin/skill-taxonomy/reload', methods=['POST'])
+def skill_taxonomy_reload():
+    """Reload the skill taxonomy file; other workers pick the change up from its modification time"""
+    admin_token = app.config['ADMIN_API_TOKEN']
+    if not admin_token:
+        return jsonify({'error': 'Admin API is disabled; set ADMIN_API_TOKEN to enable it'}), 403
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), admin_token):
+        return jsonify({'error': 'Invalid or missing X-Admin-Token header'}), 403
+
+    try:
+        taxonomy = reload_skill_taxonomy()
+    except (OSError, ValueError) as e:
+        return jsonify({'error': str(e), 'current': get_skill_taxonomy().summary()}), 400
+
+    return jsonify(taxonomy.summary())
+
 @app.route('/talent-sourcing', methods=['GET', 'POST'])
 def talent_sourcing():
     """Smart talent sourcing module"""
@@ -268,11 +447,9 @@ def appraisal_dashboard():
     # Get performance reviews with sentiment analysis
     reviews = PerformanceReview.query.order_by(PerformanceReview.created_at.desc()).all()
 
-    # Analyze sentiment for each review
-    for review in reviews:
-        if review.sentiment_score == 0.0:  # Not analyzed yet
-            review.sentiment_score = nlp_processor.analyze_sentiment(review.feedback)
-            db.session.commit()
+    # Unscored reviews are picked up by the background scorer rather than this request
+    if any(review.sentiment_scored_at is None for review in reviews):
+        sentiment_scorer.start()
 
     # Generate dashboard data
     dashboard_data = hr_analytics.generate_appraisal_insights(reviews)
@@ -370,10 +547,11 @@ def wellness_tracker():
     recent_checks = WellnessCheck.query.order_by(WellnessCheck.check_date.desc()).limit(20).all()
 
     # Wellness statistics
-    total_checks = WellnessCheck.query.count()
-    green_status = WellnessCheck.query.filter_by(overall_wellness='green').count()
-    yellow_status = WellnessCheck.query.filter_by(overall_wellness='yellow').count()
-    red_status = WellnessCheck.query.filter_by(overall_wellness='red').count()
+    wellness_stats = hr_aggregates.wellness_check_aggregates()
+    total_checks = wellness_stats['total_checks']
+    green_status = wellness_stats['green']
+    yellow_status = wellness_stats['yellow']
+    red_status = wellness_stats['red']
 
     # Get employees with wellness concerns (red status in last 30 days)
     from datetime import datetime, timedelta
@@ -401,57 +579,53 @@ def hr_insights():
 
     # Get all employees for individual insights tab
     employees = Employee.query.filter_by(status='active').all()
+
+    # Counters come from one conditional-aggregation query per table
+    employee_stats = hr_aggregates.employee_aggregates()
+    wellness_stats = hr_aggregates.wellness_check_aggregates()
+
+    # Increment, joining/leaving and trend figures are read from the CompanyMetrics snapshots
+    snapshot = company_metrics.year_summary(datetime.now().year)
     
     # Department distribution
-    dept_stats_raw = db.session.query(Employee.department, db.func.count(Employee.id)).group_by(Employee.department).all()
-    dept_stats = [{'department': dept, 'count': count} for dept, count in dept_stats_raw]
+    dept_stats = [{'department': dept, 'count': count} for dept, count in hr_aggregates.department_headcounts()]
     
-    # Performance data
-    avg_performance = db.session.query(db.func.avg(Employee.performance_score)).scalar() or 0
-    top_performers = Employee.query.filter(Employee.performance_score >= 8.5).all()
+    # Performance data; the page only shows how many top performers there are
+    avg_performance = employee_stats['avg_performance']
+    top_performer_count = employee_stats['top_performer_count']
     
     # Monthly trends (simplified)
-    total_employees = Employee.query.count()
-    monthly_trends = {
-        'headcount': [total_employees] * 12,
-        'performance': [avg_performance] * 12,
-        'satisfaction': [7.5] * 12
-    }
+    total_employees = employee_stats['total_employees']
+    monthly_trends = dict(
+        snapshot['monthly_trends'],
+        headcount=[snapshot['headcount'].get(month, employee_stats['active_employees']) for month in range(1, 13)],
+        performance=[avg_performance] * 12,
+        satisfaction=[7.5] * 12
+    )
     
     # Wellness summary
     wellness_summary = {
-        'total_checks': WellnessCheck.query.count(),
-        'green_status': WellnessCheck.query.filter_by(overall_wellness='green').count(),
-        'yellow_status': WellnessCheck.query.filter_by(overall_wellness='yellow').count(),
-        'red_status': WellnessCheck.query.filter_by(overall_wellness='red').count(),
+        'total_checks': wellness_stats['total_checks'],
+        'green_status': wellness_stats['green'],
+        'yellow_status': wellness_stats['yellow'],
+        'red_status': wellness_stats['red'],
         'distribution': {
-            'green': WellnessCheck.query.filter_by(overall_wellness='green').count(),
-            'yellow': WellnessCheck.query.filter_by(overall_wellness='yellow').count(),
-            'red': WellnessCheck.query.filter_by(overall_wellness='red').count()
+            'green': wellness_stats['green'],
+            'yellow': wellness_stats['yellow'],
+            'red': wellness_stats['red']
         }
     }
 
     # Add missing increment data
-    increment_data = {
-        'total_increments': HRTransaction.query.filter_by(transaction_type='increment').count(),
-        'avg_increment': db.session.query(db.func.avg(HRTransaction.percentage)).filter_by(transaction_type='increment').scalar() or 0
-    }
+    increment_data = dict(snapshot['increment_data'], avg_increment=snapshot['increment_data']['average_percentage'])
     
     # Add missing joining/leaving data
-    joining_leaving_data = {
-        'joined_this_year': HRTransaction.query.filter_by(transaction_type='joining').count(),
-        'left_this_year': HRTransaction.query.filter_by(transaction_type='exit').count()
-    }
+    joining_leaving_data = snapshot['joining_leaving_data']
     
     # Generate performance data for charts
     performance_data = {
         'average': round(avg_performance, 2),
-        'distribution': {
-            'excellent': Employee.query.filter(Employee.performance_score >= 9).count(),
-            'good': Employee.query.filter(Employee.performance_score >= 7, Employee.performance_score < 9).count(),
-            'average': Employee.query.filter(Employee.performance_score >= 5, Employee.performance_score < 7).count(),
-            'needs_improvement': Employee.query.filter(Employee.performance_score < 5).count()
-        }
+        'distribution': dict(employee_stats['performance_distribution'])
     }
     
     return render_template('hr_insights.html',
@@ -459,7 +633,7 @@ def hr_insights():
                          dept_stats=dept_stats,
                          performance_data=performance_data,
                          avg_performance=avg_performance,
-                         top_performers=top_performers,
+                         top_performer_count=top_performer_count,
                          monthly_trends=monthly_trends,
                          wellness_summary=wellness_summary,
                          insights_data=insights_data,
@@ -530,6 +704,7 @@ def hr_data_management():
                 db.session.add(history)
 
                 db.session.commit()
+                company_metrics.record_transaction(increment_date)
                 flash(f'Increment of {increment_percentage}% recorded for {employee.name}', 'success')
             else:
                 flash('Employee not found', 'error')
@@ -628,6 +803,7 @@ def hr_data_management():
                 db.session.add(history)
 
                 db.session.commit()
+                company_metrics.record_transaction(exit_date)
                 flash(f'Exit recorded for {employee.name}', 'success')
             else:
                 flash('Employee not found', 'error')
@@ -675,6 +851,7 @@ def hr_data_management():
             db.session.add(transaction)
 
             db.session.commit()
+            company_metrics.record_transaction(hire_date)
             flash(f'Employee {name} added successfully', 'success')
 
         return redirect(url_for('hr_data_management'))
@@ -1030,26 +1207,13 @@ def _award_badge_if_not_earned(employee_id, badge_name, icon):
 @app.route('/employee-insights/<int:employee_id>')
 def employee_insights(employee_id):
     """Individual employee detailed insights"""
-    employee = Employee.query.get_or_404(employee_id)
-    
-    # Get all related data for this employee
-    performance_reviews = PerformanceReview.query.filter_by(employee_id=employee_id).order_by(PerformanceReview.created_at.desc()).all()
-    learning_progress = LearningProgress.query.filter_by(employee_id=employee_id).all()
-    wellness_checks = WellnessCheck.query.filter_by(employee_id=employee_id).order_by(WellnessCheck.check_date.desc()).all()
-    hr_transactions = HRTransaction.query.filter_by(employee_id=employee_id).order_by(HRTransaction.created_at.desc()).all()
-    
-    # Calculate additional metrics
-    leadership_score = hr_analytics.calculate_leadership_potential(employee)
-    recent_wellness = wellness_checks[0] if wellness_checks else None
-    
-    return render_template('employee_insights.html', 
-                         employee=employee,
-                         performance_reviews=performance_reviews,
-                         learning_progress=learning_progress,
-                         wellness_checks=wellness_checks,
-                         hr_transactions=hr_transactions,
-                         leadership_score=leadership_score,
-                         recent_wellness=recent_wellness)
+    from utils.real_hr_analytics import RealHRAnalytics
+
+    details = RealHRAnalytics().get_employee_detailed_insights(employee_id)
+    if details is None:
+        abort(404)
+
+    return render_template('employee_insights.html', **details)
 
 @app.route('/api/quiz/<module_name>')
 def get_quiz(module_name):
@@ -1070,6 +1234,9 @@ def reset_data():
         HRTransaction.query.delete()
         EmployeeHistory.query.delete()
         db.session.commit()
+        resume_index.clear()
+        # Drop the monthly snapshots of the deleted transactions and mark the (empty) build fresh
+        company_metrics.rebuild()
 
         flash('Data reset successfully! The system will reload real data automatically.', 'success')
 
@@ -0,0 +1,48 @@
+"""
+Shared fixtures - the app runs against a throwaway SQLite database
+
+Importing app creates and upgrades the database it is configured with, so
+test modules import app and models inside tests or fixtures, never at module
+level, and the app fixture points it at a temporary file first.
+"""
+import os
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    os.environ['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path_factory.mktemp('database') / 'hr_platform.db'}"
+    os.environ['AUTOLOAD_REAL_DATA'] = '0'
+    os.environ['SCREENING_WORKERS'] = '1'
+
+    from app import app
+    return app
+
+
+@pytest.fixture
+def db(app):
+    """An app context over an empty database; every row is deleted afterwards"""
+    from app import db
+
+    with app.app_context():
+        yield db
+        db.session.rollback()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+
+
+@pytest.fixture
+def captured_sql(db):
+    """List that collects (sql, parameters) for every statement executed while the test runs"""
+    from sqlalchemy import event
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', capture)
@@ -0,0 +1,89 @@
+"""
+Legacy analytics - the original per-row RealHRAnalytics queries, kept as reference implementations
+
+Parity tests compare the snapshot-based figures against these.
+"""
+from collections import defaultdict
+
+from sqlalchemy import extract, func
+
+DEPARTMENTS = ('Engineering', 'Sales', 'Marketing', 'HR', 'Finance', 'Operations', None)
+
+
+def legacy_analyze_increments(year):
+    """Original RealHRAnalytics._analyze_increments"""
+    from models import HRTransaction
+
+    increments = HRTransaction.query.filter(
+        HRTransaction.transaction_type == 'increment',
+        extract('year', HRTransaction.effective_date) == year
+    ).all()
+
+    if not increments:
+        return {'total_increments': 0, 'total_amount': 0, 'average_percentage': 0, 'by_department': {}, 'by_month': {}}
+
+    total_increments = len(increments)
+    total_amount = sum(inc.amount or 0 for inc in increments)
+    avg_percentage = sum(inc.percentage or 0 for inc in increments) / total_increments
+
+    dept_increments = defaultdict(lambda: {'count': 0, 'total_amount': 0})
+    for inc in increments:
+        if inc.department:
+            dept_increments[inc.department]['count'] += 1
+            dept_increments[inc.department]['total_amount'] += inc.amount or 0
+
+    monthly_increments = defaultdict(lambda: {'count': 0, 'total_amount': 0})
+    for inc in increments:
+        month = inc.effective_date.month
+        monthly_increments[month]['count'] += 1
+        monthly_increments[month]['total_amount'] += inc.amount or 0
+
+    return {
+        'total_increments': total_increments,
+        'total_amount': total_amount,
+        'average_percentage': round(avg_percentage, 2),
+        'by_department': dict(dept_increments),
+        'by_month': dict(monthly_increments)
+    }
+
+
+def legacy_analyze_workforce_changes(year):
+    """Original RealHRAnalytics._analyze_workforce_changes"""
+    from models import Employee, HRTransaction
+
+    def count(transaction_type):
+        return HRTransaction.query.filter(
+            HRTransaction.transaction_type == transaction_type,
+            extract('year', HRTransaction.effective_date) == year
+        ).count()
+
+    joinings = count('joining')
+    exits = count('exit')
+    avg_headcount = Employee.query.count()
+    attrition_rate = (exits / avg_headcount * 100) if avg_headcount > 0 else 0
+
+    return {
+        'joined_this_year': joinings,
+        'left_this_year': exits,
+        'net_growth': joinings - exits,
+        'attrition_rate': round(attrition_rate, 2)
+    }
+
+
+def legacy_monthly_trends(year):
+    """Original RealHRAnalytics._get_monthly_trends: one GROUP BY month query per transaction type"""
+    from database import db
+    from models import HRTransaction
+
+    trends = {}
+    for transaction_type, trend in (('increment', 'increments'), ('joining', 'joinings'), ('exit', 'exits')):
+        monthly = db.session.query(
+            extract('month', HRTransaction.effective_date).label('month'),
+            func.count(HRTransaction.id).label('count')
+        ).filter(
+            HRTransaction.transaction_type == transaction_type,
+            extract('year', HRTransaction.effective_date) == year
+        ).group_by(extract('month', HRTransaction.effective_date)).all()
+
+        trends[trend] = {int(month): count for month, count in monthly}
+    return trends
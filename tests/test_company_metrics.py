@@ -0,0 +1,202 @@
+"""
+Company metrics tests - snapshot rebuilds, background refreshes and concurrency
+"""
+import random
+import threading
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func
+
+from tests.legacy_analytics import (
+    DEPARTMENTS, legacy_analyze_increments, legacy_analyze_workforce_changes, legacy_monthly_trends
+)
+
+
+def add_increment(db, effective_date, amount=1000.0, department='Engineering'):
+    from models import HRTransaction
+
+    db.session.add(HRTransaction(employee_id=1, transaction_type='increment', amount=amount, percentage=5.0,
+                                 department=department, effective_date=effective_date))
+    db.session.commit()
+
+
+def snapshot_value(metric_type, year, month, department=None):
+    from models import CompanyMetrics
+
+    return CompanyMetrics.query.with_entities(CompanyMetrics.metric_value).filter_by(
+        period_type='monthly', metric_type=metric_type, period_year=year, period_month=month, department=department
+    ).scalar()
+
+
+def wait_for_background(snapshots):
+    thread = snapshots._thread
+    if thread is not None:
+        thread.join(timeout=30)
+
+
+def test_record_transaction_rebuilds_its_month_in_the_background(app, db):
+    from utils.company_metrics import CompanyMetricsSnapshots
+
+    snapshots = CompanyMetricsSnapshots()
+    add_increment(db, date(2024, 3, 15))
+
+    snapshots.record_transaction(date(2024, 3, 15))
+    wait_for_background(snapshots)
+
+    db.session.expire_all()
+    assert snapshot_value('increments', 2024, 3) == 1
+    assert snapshot_value('increment_amount', 2024, 3, 'Engineering') == 1000.0
+    assert snapshots._thread is None
+
+
+def test_recent_refresh_leaves_older_months_alone(db):
+    from utils.company_metrics import CompanyMetricsSnapshots
+
+    snapshots = CompanyMetricsSnapshots()
+    this_month = date.today().replace(day=1)
+    old_month = this_month - timedelta(days=400)
+    add_increment(db, this_month)
+    add_increment(db, old_month)
+    snapshots.rebuild()
+
+    # Written around the app, so nothing queued a rebuild for either month
+    add_increment(db, this_month)
+    add_increment(db, old_month)
+    snapshots.refresh_recent()
+
+    assert snapshot_value('increments', this_month.year, this_month.month) == 2
+    assert snapshot_value('increments', old_month.year, old_month.month) == 1
+
+
+def test_concurrent_rebuilds_never_duplicate_snapshot_rows(app, db):
+    from models import CompanyMetrics
+    from utils.company_metrics import CompanyMetricsSnapshots
+
+    snapshots = CompanyMetricsSnapshots()
+    for day in range(0, 720, 3):
+        add_increment(db, date(2024, 1, 1) + timedelta(days=day), department=('Sales', 'HR', None)[day % 3])
+    errors = []
+
+    def rebuild(*period):
+        with app.app_context():
+            try:
+                for _ in range(5):
+                    snapshots.rebuild(*period)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=rebuild, args=period) for period in ((), (2024, 6), (2025, 2), ())]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    key = (CompanyMetrics.period_type, CompanyMetrics.metric_type, CompanyMetrics.period_year,
+           CompanyMetrics.period_month, CompanyMetrics.department)
+    duplicates = db.session.query(*key).group_by(*key).having(func.count(CompanyMetrics.id) > 1).all()
+    assert duplicates == []
+    assert snapshot_value('increments', 2024, 6) == 10
+
+
+def test_freshness_follows_the_refresh_marker_not_month_rebuilds(app, db):
+    from models import CompanyMetrics
+    from utils.company_metrics import CompanyMetricsSnapshots
+
+    snapshots = CompanyMetricsSnapshots()
+    add_increment(db, date(2024, 3, 15))
+    snapshots.rebuild()
+    assert not snapshots.is_stale()
+
+    # An old refresh stays stale however recently a month was rebuilt
+    CompanyMetrics.query.filter_by(period_type='build').update({'created_at': datetime.utcnow() - timedelta(hours=1)})
+    db.session.commit()
+    snapshots.rebuild(2024, 3)
+    assert snapshots.is_stale()
+
+    started = []
+    snapshots.start = lambda refresh=False: started.append(refresh)
+    assert snapshots.year_metrics(2024)[('increments', 3, None)] == 1
+    assert started == [True]
+
+    snapshots.refresh_recent()
+    assert not snapshots.is_stale()
+
+
+def test_year_summary_increments_match_the_per_row_analysis(db):
+    from models import HRTransaction
+    from utils.company_metrics import CompanyMetricsSnapshots
+
+    rng = random.Random(7)
+    db.session.execute(db.insert(HRTransaction), [
+        {'employee_id': rng.randint(1, 50), 'transaction_type': 'increment',
+         'amount': round(rng.uniform(100, 5000), 2) if rng.random() < 0.9 else None,
+         'percentage': round(rng.uniform(1, 15), 3), 'department': rng.choice(DEPARTMENTS),
+         'effective_date': date(2023, 1, 1) + timedelta(days=rng.randint(0, 729))}
+        for _ in range(500)
+    ])
+    db.session.commit()
+
+    snapshots = CompanyMetricsSnapshots()
+    snapshots.rebuild()
+    expected = legacy_analyze_increments(2024)
+    increment_data = snapshots.year_summary(2024)['increment_data']
+
+    assert increment_data['total_increments'] == expected['total_increments']
+    assert increment_data['total_amount'] == pytest.approx(expected['total_amount'])
+    assert increment_data['average_percentage'] == pytest.approx(expected['average_percentage'], abs=0.01)
+    for group in ('by_department', 'by_month'):
+        assert increment_data[group].keys() == expected[group].keys()
+        for key, figures in expected[group].items():
+            assert increment_data[group][key] == pytest.approx(figures), (group, key)
+
+
+def test_reset_data_drops_snapshots_of_deleted_transactions(app, db):
+    from utils.company_metrics import company_metrics
+
+    add_increment(db, date(2023, 5, 10))
+    company_metrics.rebuild()
+    assert company_metrics.year_summary(2023)['increment_data']['total_increments'] == 1
+
+    app.test_client().get('/reset-data')
+
+    db.session.expire_all()
+    assert snapshot_value('increments', 2023, 5) is None
+    assert company_metrics.year_summary(2023)['increment_data']['total_increments'] == 0
+
+
+def test_trend_cube_figures_match_the_per_type_queries(db):
+    from models import Employee, HRTransaction
+    from utils.company_metrics import TRANSACTION_METRICS, CompanyMetricsSnapshots
+
+    rng = random.Random(11)
+    db.session.execute(db.insert(Employee), [
+        {'name': f'Employee {index}', 'email': f'employee{index}@example.com', 'department': 'Sales',
+         'position': 'Associate', 'hire_date': date(2022, 1, 1), 'status': rng.choice(('active', 'inactive'))}
+        for index in range(40)
+    ])
+    db.session.execute(db.insert(HRTransaction), [
+        {'employee_id': rng.randint(1, 40),
+         'transaction_type': rng.choice(('increment', 'joining', 'exit', 'promotion', 'bonus')),
+         'amount': round(rng.uniform(100, 5000), 2), 'percentage': round(rng.uniform(1, 15), 3),
+         'department': rng.choice(DEPARTMENTS),
+         'effective_date': date(2023, 1, 1) + timedelta(days=rng.randint(0, 1095))}
+        for _ in range(600)
+    ])
+    db.session.commit()
+
+    snapshots = CompanyMetricsSnapshots()
+    cube_trends = {'increments': {}, 'joinings': {}, 'exits': {}}
+    for (transaction_type, _, month, _), (count, _, _) in snapshots.trend_cube(*snapshots._period_bounds(2024, None)).items():
+        trend = cube_trends[TRANSACTION_METRICS[transaction_type][0]]
+        trend[month] = trend.get(month, 0) + count
+    assert cube_trends == legacy_monthly_trends(2024)
+
+    snapshots.rebuild()
+    for year in (2023, 2024, 2025):
+        summary = snapshots.year_summary(year)
+        assert summary['joining_leaving_data'] == legacy_analyze_workforce_changes(year), year
+        assert summary['monthly_trends'] == legacy_monthly_trends(year), year
@@ -0,0 +1,41 @@
+"""
+Dashboard tests - the overview costs a fixed number of queries
+"""
+from datetime import date
+
+import pytest
+
+DEPARTMENTS = ('Engineering', 'Sales', 'Marketing', 'HR')
+
+
+def seed_employees(db, count):
+    from models import Employee, HealthMetrics
+
+    db.session.execute(db.insert(Employee), [
+        {
+            'name': f'Employee {index}',
+            'email': f'employee{index}@example.com',
+            'department': DEPARTMENTS[index % len(DEPARTMENTS)],
+            'position': 'Engineer',
+            'hire_date': date(2021, 1, 1),
+            'performance_score': 5 + index % 5,
+            'status': 'active' if index % 10 else 'inactive'
+        }
+        for index in range(count)
+    ])
+    db.session.execute(db.insert(HealthMetrics), [
+        {'employee_id': employee_id, 'mood_score': employee_id % 10}
+        for employee_id in range(1, count + 1)
+    ])
+    db.session.commit()
+
+
+@pytest.mark.parametrize('employee_count', [10, 1000])
+def test_dashboard_query_count_does_not_grow_with_employees(app, db, captured_sql, employee_count):
+    seed_employees(db, employee_count)
+    captured_sql.clear()
+
+    response = app.test_client().get('/dashboard')
+
+    assert response.status_code == 200
+    assert len(captured_sql) == 3, captured_sql
@@ -0,0 +1,84 @@
+"""
+Document parser tests - uploads are parsed from memory without temp files
+"""
+import io
+import tempfile
+
+import fitz
+import pytest
+from docx import Document
+from werkzeug.datastructures import FileStorage
+
+from utils.document_parser import DocumentParser
+
+
+def docx_bytes():
+    document = Document()
+    document.add_paragraph('Senior Python developer')
+    document.add_table(rows=1, cols=1).cell(0, 0).text = 'AWS and SQL'
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def pdf_bytes():
+    with fitz.open() as document:
+        document.new_page().insert_text((72, 72), 'Senior Python developer with AWS and SQL experience')
+        return document.tobytes()
+
+
+class NonSeekableStream(io.RawIOBase):
+    """A pipe-like upload stream that can only be read forwards"""
+
+    def __init__(self, data):
+        self._buffer = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, view):
+        return self._buffer.readinto(view)
+
+
+@pytest.fixture
+def temp_files(monkeypatch, tmp_path):
+    """Point tempfile at an empty directory and record every temp file request"""
+    created = []
+
+    def recording(factory):
+        def wrapper(*args, **kwargs):
+            created.append(factory.__name__)
+            return factory(*args, **kwargs)
+        return wrapper
+
+    for name in ('NamedTemporaryFile', 'TemporaryFile', 'mkstemp', 'mkdtemp'):
+        monkeypatch.setattr(tempfile, name, recording(getattr(tempfile, name)))
+    monkeypatch.setattr(tempfile.SpooledTemporaryFile, 'rollover',
+                        recording(tempfile.SpooledTemporaryFile.rollover))
+
+    temp_dir = tmp_path / 'tmp'
+    temp_dir.mkdir()
+    monkeypatch.setattr(tempfile, 'tempdir', str(temp_dir))
+
+    yield created
+    assert not list(temp_dir.iterdir())
+
+
+@pytest.mark.parametrize('filename, build, expected', [
+    ('resume.docx', docx_bytes, 'AWS and SQL'),
+    ('resume.pdf', pdf_bytes, 'Senior Python developer'),
+])
+def test_file_storage_upload_is_parsed_without_temp_files(temp_files, filename, build, expected):
+    upload = FileStorage(stream=io.BytesIO(build()), filename=filename)
+
+    text = DocumentParser().extract_text_from_file(upload, filename)
+
+    assert expected in text
+    assert temp_files == []
+
+
+def test_small_non_seekable_upload_is_buffered_in_memory(temp_files):
+    text = DocumentParser().extract_text_from_file(NonSeekableStream(docx_bytes()), 'resume.docx')
+
+    assert 'Senior Python developer' in text
+    assert temp_files == []
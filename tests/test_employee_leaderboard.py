@@ -0,0 +1,56 @@
+"""
+Employee leaderboard tests - the cache never serves or stores a ranking older than a write
+"""
+from datetime import date
+
+import pytest
+
+
+@pytest.fixture
+def cached_leaderboard(app, monkeypatch):
+    from utils.employee_leaderboard import EmployeeLeaderboard
+
+    monkeypatch.setitem(app.config, 'LEADERBOARD_CACHE_SECONDS', 300)
+    return EmployeeLeaderboard()
+
+
+def add_employee(db, name, score):
+    from models import Employee
+
+    db.session.add(Employee(name=name, email=f'{name.lower()}@example.com', department='Sales', position='Lead',
+                            hire_date=date(2022, 1, 1), performance_score=score, status='active'))
+    db.session.commit()
+
+
+def test_committed_employee_shows_up_despite_the_cache(db, cached_leaderboard, monkeypatch):
+    from utils import employee_leaderboard
+
+    # The session listeners invalidate the shared instance; point them at this one
+    monkeypatch.setattr(employee_leaderboard, 'employee_leaderboard', cached_leaderboard)
+    add_employee(db, 'Ravi', 8.0)
+    assert [row['name'] for row in cached_leaderboard.top(5)] == ['Ravi']
+
+    add_employee(db, 'Meera', 9.5)
+
+    assert [row['name'] for row in cached_leaderboard.top(5)] == ['Meera', 'Ravi']
+
+
+def test_ranking_computed_across_an_invalidation_is_not_cached(db, cached_leaderboard, monkeypatch):
+    add_employee(db, 'Ravi', 8.0)
+    compute = cached_leaderboard.compute
+    calls = []
+
+    def compute_while_a_write_lands(limit):
+        calls.append(limit)
+        rows = compute(limit)
+        if len(calls) == 1:
+            cached_leaderboard.invalidate()
+        return rows
+
+    monkeypatch.setattr(cached_leaderboard, 'compute', compute_while_a_write_lands)
+
+    cached_leaderboard.top(5)
+    cached_leaderboard.top(5)
+    cached_leaderboard.top(5)
+
+    assert len(calls) == 2
@@ -0,0 +1,73 @@
+"""
+HR insights tests - counters come from a fixed set of aggregate queries
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+
+def seed(db, count):
+    from models import Employee, WellnessCheck
+
+    db.session.execute(db.insert(Employee), [
+        {
+            'name': f'Employee {index}',
+            'email': f'employee{index}@example.com',
+            'department': ('Engineering', 'Sales', 'HR')[index % 3],
+            'position': 'Engineer',
+            'hire_date': date(2021, 1, 1),
+            'performance_score': 5 + index % 5,
+            'status': 'active'
+        }
+        for index in range(count)
+    ])
+    db.session.execute(db.insert(WellnessCheck), [
+        {
+            'employee_id': employee_id,
+            'stress_level': 5, 'sleep_quality': 5, 'focus_level': 5,
+            'overall_wellness': ('green', 'yellow', 'red')[employee_id % 3],
+            'check_date': datetime(2026, 1, 1) + timedelta(days=employee_id)
+        }
+        for employee_id in range(1, count + 1)
+    ])
+    db.session.commit()
+
+
+@pytest.mark.parametrize('employee_count', [10, 500])
+def test_hr_insights_query_count_does_not_grow_with_employees(app, db, captured_sql, employee_count):
+    from utils.company_metrics import company_metrics
+
+    seed(db, employee_count)
+    company_metrics.rebuild()
+    captured_sql.clear()
+
+    response = app.test_client().get('/hr-insights')
+
+    assert response.status_code == 200
+    assert len(captured_sql) == 6, captured_sql
+
+
+def test_recent_wellness_distribution_counts_the_latest_checks(db):
+    from utils import hr_aggregates
+
+    seed(db, 60)
+
+    wellness = hr_aggregates.wellness_check_aggregates()
+
+    assert wellness['total_checks'] == 60
+    assert wellness['recent_distribution'] == {'green': 10, 'yellow': 10, 'red': 10}
+
+
+def test_aggregates_are_recomputed_after_a_commit(app, db):
+    from models import Employee
+    from utils import hr_aggregates
+
+    seed(db, 3)
+    with app.test_request_context():
+        assert hr_aggregates.employee_aggregates()['total_employees'] == 3
+
+        db.session.add(Employee(name='New Hire', email='new@example.com', department='HR',
+                                position='Recruiter', hire_date=date(2026, 10, 1)))
+        db.session.commit()
+
+        assert hr_aggregates.employee_aggregates()['total_employees'] == 4
@@ -0,0 +1,45 @@
+"""
+Keyword scorer tests - batch scores are the TF-IDF cosine of both sides
+"""
+import math
+import pickle
+from collections import Counter
+
+import pytest
+
+from utils.keyword_scorer import InverseDocumentFrequencies, KeywordScorer
+
+QUERY = Counter({'python': 3, 'flask': 2, 'sql': 1, 'leadership': 1})
+DOCUMENTS = [
+    Counter({'python': 5, 'django': 4, 'sql': 2, 'team': 3}),
+    Counter({'flask': 1, 'leadership': 2, 'sales': 6}),
+    Counter({'marketing': 3, 'design': 2}),
+    Counter(),
+]
+IDF = InverseDocumentFrequencies(20, {'python': 12, 'flask': 3, 'sql': 9, 'django': 2, 'team': 15, 'sales': 4})
+
+
+def cosine(query, document, weight):
+    query_vector = {term: count * weight(term) for term, count in query.items()}
+    document_vector = {term: count * weight(term) for term, count in document.items()}
+    dot = sum(value * document_vector.get(term, 0) for term, value in query_vector.items())
+    norms = math.sqrt(sum(v * v for v in query_vector.values())) * math.sqrt(sum(v * v for v in document_vector.values()))
+    return dot / norms if norms else 0.0
+
+
+def test_scores_weight_resume_terms_by_idf_as_well():
+    scores = KeywordScorer(QUERY, IDF).score(DOCUMENTS)
+
+    assert list(scores) == pytest.approx([cosine(QUERY, document, IDF.weight) for document in DOCUMENTS])
+
+
+def test_scores_without_idf_are_term_frequency_cosine():
+    scores = KeywordScorer(QUERY).score(DOCUMENTS)
+
+    assert list(scores) == pytest.approx([cosine(QUERY, document, lambda term: 1.0) for document in DOCUMENTS])
+
+
+def test_idf_snapshot_survives_pickling_for_pool_workers():
+    restored = pickle.loads(pickle.dumps(IDF))
+
+    assert [restored.weight(term) for term in ('python', 'unseen')] == [IDF.weight('python'), math.log(21) + 1]
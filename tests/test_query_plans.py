@@ -0,0 +1,203 @@
+"""
+Query plan tests - date-range and per-employee reads of child tables use indexes
+"""
+import re
+from datetime import date, datetime, timedelta
+
+import pytest
+
+RESUME = b'Senior Python developer, 6 years of AWS and SQL, led a team of five'
+
+
+def route(method, url, form=None, action=None):
+    return pytest.param(method, url, dict(form or {}, **({'action': action} if action else {})),
+                        id=f"{method} {url}{' ' + action if action else ''}")
+
+
+# Every handler in routes.py, with employee pages pointed at a seeded employee and
+# forms filled in so each POST takes its write path. The admin taxonomy reload is
+# left out: it reads no tables and has its own tests.
+ROUTES = [
+    *(route('GET', url) for url in (
+        '/', '/login', '/dashboard', '/hr_command_center', '/employee-management', '/employee/7',
+        '/employee-insights/7', '/export-employee-data/7', '/export-company-data', '/appraisal-dashboard',
+        '/hr-insights', '/wellness-tracker', '/learning-module', '/leadership-potential', '/skill-gap-analysis',
+        '/gamification', '/gamification/quiz/1', '/hr-data-management', '/resume-screening',
+        '/resume-screening/ranked', '/resume-screening/ranked?job_description=Python+developer',
+        '/resume-screening/search', '/api/screening-jobs/1', '/api/admin/skill-taxonomy', '/api/quiz/Ethics',
+        '/talent-sourcing', '/reset-data',
+    )),
+    route('POST', '/hr-data-management', {'employee_id': '7', 'increment_amount': '1500', 'increment_percentage': '5',
+                                          'increment_date': '2024-03-01'}, action='add_increment'),
+    route('POST', '/hr-data-management', {'employee_id': '7', 'new_position': 'Lead Engineer',
+                                          'promotion_date': '2024-04-01'}, action='add_promotion'),
+    route('POST', '/hr-data-management', {'employee_id': '8', 'exit_date': '2024-05-01'}, action='add_exit'),
+    route('POST', '/hr-data-management', {'name': 'New Hire', 'email': 'new.hire@example.com',
+                                          'department': 'Engineering', 'position': 'Engineer',
+                                          'hire_date': '2024-06-01', 'salary': '60000'}, action='add_joining'),
+    route('POST', '/wellness-tracker', {'employee_id': '7', 'stress_level': '8', 'sleep_quality': '3',
+                                        'focus_level': '4'}, action='add_wellness_check'),
+    route('POST', '/wellness-tracker', action='generate_health_data'),
+    route('POST', '/gamification', {'title': 'Ship it', 'description': 'Finish the module', 'xp_reward': '40',
+                                    'deadline': '2026-12-31'}, action='create_challenge'),
+    route('POST', '/gamification', {'name': 'Mentor', 'description': 'Helped a colleague'}, action='create_badge'),
+    route('POST', '/gamification', {'employee_id': '7', 'challenge_id': '1'}, action='join_challenge'),
+    route('POST', '/gamification/submit-quiz', {'employee_id': '7', 'challenge_id': '1',
+                                                'question_1': 'B', 'question_2': 'B', 'question_3': 'C'}),
+    route('POST', '/skill-gap-analysis', {'employee_name': 'Employee 6'}),
+    route('POST', '/talent-sourcing', {'job_title': 'Data Engineer', 'job_description': 'Python and SQL'}),
+    route('POST', '/resume-screening', {'job_description': 'Python developer with AWS and SQL', 'top_k': '5'}),
+    route('POST', '/resume-screening/search', {'job_description': 'Python developer with AWS and SQL'}),
+]
+
+
+def seed(db):
+    from models import Employee, HRTransaction
+
+    db.session.execute(db.insert(Employee), [
+        {'name': f'Employee {index}', 'email': f'employee{index}@example.com', 'department': 'Engineering',
+         'position': 'Engineer', 'hire_date': date(2021, 1, 1), 'status': 'active'}
+        for index in range(50)
+    ])
+    db.session.execute(db.insert(HRTransaction), [
+        {'employee_id': 1 + index % 50, 'transaction_type': ('increment', 'joining', 'exit', 'promotion')[index % 4],
+         'percentage': 5.0, 'amount': 1000.0, 'department': 'Engineering',
+         'effective_date': date(2023, 1, 1) + timedelta(days=index % 1000)}
+        for index in range(2000)
+    ])
+    db.session.commit()
+
+
+def query_plan(db, captured_sql, table):
+    """EXPLAIN QUERY PLAN details of every captured statement that reads `table`"""
+    plans = []
+    for statement, parameters in list(captured_sql):
+        if statement.lstrip().upper().startswith('SELECT') and f'FROM {table}' in statement:
+            rows = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+            plans.append(' | '.join(row[-1] for row in rows))
+    assert plans, f'no query read {table}'
+    return plans
+
+
+def test_month_rebuild_reads_transactions_by_type_and_date_range(db, captured_sql):
+    from utils.company_metrics import CompanyMetricsSnapshots
+
+    seed(db)
+    captured_sql.clear()
+    CompanyMetricsSnapshots().rebuild(2024, 3)
+
+    [plan] = query_plan(db, captured_sql, 'hr_transaction')
+    assert 'SEARCH hr_transaction USING INDEX ix_hr_transaction_type_effective_date' in plan, plan
+
+
+def test_leaderboard_increment_subquery_reads_recent_increments_by_type_and_date(db, captured_sql):
+    from utils.employee_leaderboard import EmployeeLeaderboard
+
+    seed(db)
+    captured_sql.clear()
+    EmployeeLeaderboard().compute(10)
+
+    [plan] = query_plan(db, captured_sql, 'hr_transaction')
+    assert 'SEARCH hr_transaction USING INDEX ix_hr_transaction_type_effective_date' in plan, plan
+
+
+def test_employee_transaction_listing_uses_the_employee_type_date_index(db, captured_sql):
+    from utils.real_hr_analytics import RealHRAnalytics
+
+    seed(db)
+    captured_sql.clear()
+    RealHRAnalytics().get_employee_detailed_insights(7)
+
+    [plan] = query_plan(db, captured_sql, 'hr_transaction')
+    assert 'SEARCH hr_transaction USING INDEX ix_hr_transaction_employee_type_effective_date' in plan, plan
+
+
+def seed_employee_records(db):
+    """Give every seeded employee reviews, wellness checks, health metrics and learning progress"""
+    from models import HealthMetrics, LearningProgress, PerformanceReview, WellnessCheck
+
+    seed(db)
+    employee_ids = range(1, 51)
+    db.session.execute(db.insert(PerformanceReview), [
+        {'employee_id': employee_id, 'review_period': period, 'feedback': 'Solid work', 'overall_rating': 7.5,
+         'sentiment_score': 0.5, 'sentiment_scored_at': datetime(2025, 1, 1), 'created_at': datetime(2024, month, 1)}
+        for employee_id in employee_ids for period, month in (('H1', 1), ('H2', 7))
+    ])
+    db.session.execute(db.insert(WellnessCheck), [
+        {'employee_id': employee_id, 'stress_level': 5, 'sleep_quality': 5, 'focus_level': 5,
+         'overall_wellness': 'green', 'check_date': datetime(2026, 1, 1) + timedelta(days=employee_id)}
+        for employee_id in employee_ids
+    ])
+    db.session.execute(db.insert(HealthMetrics), [
+        {'employee_id': employee_id, 'mood_score': 7, 'stress_level': 4, 'bmi_status': 'Normal'}
+        for employee_id in employee_ids
+    ])
+    db.session.execute(db.insert(LearningProgress), [
+        {'employee_id': employee_id, 'module_name': 'Leadership', 'completed': employee_id % 2 == 0}
+        for employee_id in employee_ids
+    ])
+    db.session.commit()
+
+
+def seed_route_fixtures(db):
+    """Challenge, quiz questions, a badge, a screening job and a stored resume with fixed ids for the routes"""
+    from models import Badge, Challenge, Quiz, Resume, ScreeningJob
+
+    # The gamification seed from app start-up is still there when this runs first
+    for model in (Badge, Challenge, Quiz):
+        db.session.execute(db.delete(model))
+    db.session.execute(db.insert(Challenge), [
+        {'id': 1, 'title': 'Ethics refresher', 'description': 'Pass the ethics quiz', 'xp_reward': 50, 'is_active': True}
+    ])
+    db.session.execute(db.insert(Quiz), [
+        {'id': number, 'module_name': 'Ethics', 'question': f'Question {number}', 'option_a': 'A', 'option_b': 'B',
+         'option_c': 'C', 'option_d': 'D', 'correct_answer': answer, 'explanation': 'Because'}
+        for number, answer in ((1, 'B'), (2, 'B'), (3, 'C'))
+    ])
+    db.session.execute(db.insert(Badge), [{'id': 1, 'name': 'Quiz Master', 'description': 'Aced a quiz', 'is_active': True}])
+    db.session.execute(db.insert(ScreeningJob), [{'id': 1, 'job_description': 'Python developer', 'status': 'completed',
+                                                  'total_files': 0, 'processed_files': 0}])
+    db.session.execute(db.insert(Resume), [{'filename': 'stored.txt', 'content': RESUME.decode(), 'score': 70.0,
+                                            'skills_extracted': '["python"]', 'job_description': 'Python developer'}])
+    db.session.commit()
+
+
+def wait_for_background_work():
+    """Join the threads a request may have started, so their queries are captured too"""
+    import routes
+    from utils.company_metrics import company_metrics
+
+    for worker in (company_metrics, routes.resume_index, routes.sentiment_scorer):
+        thread = worker._thread
+        if thread is not None:
+            thread.join(timeout=30)
+
+
+@pytest.mark.parametrize('method, url, form', ROUTES)
+def test_route_filters_child_tables_through_an_index(app, db, captured_sql, method, url, form):
+    import io
+
+    from utils.company_metrics import company_metrics
+
+    seed_employee_records(db)
+    seed_route_fixtures(db)
+    company_metrics.rebuild()
+    if url == '/resume-screening' and method == 'POST':
+        form = dict(form, resumes=(io.BytesIO(RESUME), 'upload.txt'))
+    captured_sql.clear()
+
+    # Templates render for real, so queries issued while rendering are checked as well
+    client = app.test_client()
+    response = client.get(url) if method == 'GET' else client.post(url, data=form)
+    wait_for_background_work()
+    assert response.status_code in (200, 302), response.status_code
+
+    # Tables hanging off employee; whole-table aggregates may scan them, filtered reads may not
+    child_tables = {table.name for table in db.metadata.sorted_tables
+                    if any(key.column.table.name == 'employee' for key in table.foreign_keys)}
+    for statement, parameters in list(captured_sql):
+        if not statement.lstrip().upper().startswith('SELECT') or not re.search(r'\bWHERE\b', statement):
+            continue
+        for row in db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters):
+            scan = re.fullmatch(r'SCAN (\w+)', row[-1])
+            assert not (scan and scan.group(1) in child_tables), (method, url, row[-1], statement)
@@ -0,0 +1,60 @@
+"""
+Schema migration tests - missing indexes are added without failing when they already exist
+"""
+from datetime import date, datetime
+
+from sqlalchemy import inspect
+
+
+def index_names(db, table_name):
+    return {index['name'] for index in inspect(db.engine).get_indexes(table_name)}
+
+
+def test_upgrade_schema_recreates_a_missing_index_once(db):
+    from utils.schema_migrations import upgrade_schema
+
+    db.session.execute(db.text('DROP INDEX ix_hr_transaction_type_effective_date'))
+    db.session.commit()
+
+    assert upgrade_schema(db) == ['ix_hr_transaction_type_effective_date']
+    assert 'ix_hr_transaction_type_effective_date' in index_names(db, 'hr_transaction')
+    assert upgrade_schema(db) == []
+
+
+def test_creating_an_index_another_worker_already_created_is_harmless(db):
+    from models import HRTransaction
+    from utils.schema_migrations import create_indexes
+
+    indexes = sorted(HRTransaction.__table__.indexes, key=lambda index: index.name)
+
+    assert create_indexes(db.engine, indexes) == [index.name for index in indexes]
+
+
+def test_adding_a_column_another_worker_already_added_is_harmless(db):
+    from models import PerformanceReview
+    from utils.schema_migrations import add_column
+
+    table = PerformanceReview.__table__
+
+    assert add_column(db.engine, table, table.c.sentiment_scored_at) is False
+
+
+def test_upgrade_schema_adds_and_backfills_a_missing_column(db):
+    from models import Employee, PerformanceReview
+    from utils.schema_migrations import upgrade_schema
+
+    employee = Employee(name='Asha', email='asha@example.com', department='HR', position='Manager',
+                        hire_date=date(2020, 1, 1))
+    db.session.add(employee)
+    db.session.flush()
+    db.session.execute(db.insert(PerformanceReview), [
+        {'employee_id': employee.id, 'review_period': 'H1', 'feedback': 'Good', 'overall_rating': 8.0,
+         'sentiment_score': 0.4, 'sentiment_scored_at': datetime(2025, 1, 1), 'created_at': datetime(2024, 6, 1)}
+    ])
+    db.session.commit()
+    db.session.execute(db.text('DROP INDEX ix_performance_review_sentiment_scored_at'))
+    db.session.execute(db.text('ALTER TABLE performance_review DROP COLUMN sentiment_scored_at'))
+    db.session.commit()
+
+    assert upgrade_schema(db) == ['performance_review.sentiment_scored_at', 'ix_performance_review_sentiment_scored_at']
+    assert db.session.scalar(db.select(PerformanceReview.sentiment_scored_at)) == datetime(2024, 6, 1)
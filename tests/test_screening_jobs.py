@@ -0,0 +1,57 @@
+"""
+Screening job tests - resumes are stored in chunks while a job runs
+"""
+RESUMES = [(f'resume{number}.txt', f'Python developer {number} with AWS and SQL'.encode()) for number in range(5)]
+
+
+def make_queue(app, resume_index=None):
+    from utils.nlp_processor import get_nlp_processor
+    from utils.screening_jobs import ScreeningJobQueue
+
+    queue = ScreeningJobQueue(app, get_nlp_processor(), resume_index)
+    queue.resume_insert_chunk = 2
+    return queue
+
+
+def run_job(queue, uploads):
+    job_id = queue.enqueue(uploads, 'Python developer')
+    queue._executor.shutdown(wait=True)
+    return job_id
+
+
+def test_resumes_are_stored_and_indexed_a_chunk_at_a_time(app, db, monkeypatch):
+    from models import Resume, ScreeningJob
+    from utils.nlp_processor import get_nlp_processor
+    from utils.resume_index import ResumeIndex
+
+    resume_index = ResumeIndex(get_nlp_processor())
+    queue = make_queue(app, resume_index)
+    chunks = []
+    store_resumes = queue._store_resumes
+    monkeypatch.setattr(queue, '_store_resumes', lambda rows: chunks.append(len(rows)) or store_resumes(rows))
+
+    job_id = run_job(queue, RESUMES)
+
+    assert db.session.get(ScreeningJob, job_id).status == 'completed'
+    assert chunks == [2, 2, 1]
+    assert sorted(filename for (filename,) in db.session.query(Resume.filename)) == [name for name, _ in RESUMES]
+    assert len(resume_index.documents) == 5
+
+
+def test_failed_job_keeps_the_resumes_it_screened(app, db, monkeypatch):
+    from models import Resume, ScreeningJob, ScreeningJobFile
+    from utils import screening_jobs
+
+    def fail_after_three(self, uploads, job_description, **options):
+        for filename, _ in uploads[:3]:
+            yield {'filename': filename, 'content': f'{filename} text', 'skills': ['Python'], 'score': 50.0}
+        raise RuntimeError('worker crashed')
+
+    monkeypatch.setattr(screening_jobs.ScreeningPipeline, 'run', fail_after_three)
+
+    job_id = run_job(make_queue(app), RESUMES)
+
+    assert db.session.get(ScreeningJob, job_id).status == 'failed'
+    completed = ScreeningJobFile.query.filter_by(job_id=job_id, status='completed').count()
+    assert completed == 3
+    assert db.session.query(Resume.id).count() == completed
@@ -0,0 +1,102 @@
+"""
+Screening pipeline tests - upload sources and spooled files
+"""
+import hashlib
+
+from utils.screening_pipeline import ScreeningPipeline
+from utils.skill_taxonomy import get_skill_taxonomy
+
+JOB_DESCRIPTION = 'Python developer with AWS and SQL experience'
+
+
+def test_spooled_files_are_removed_once_read(tmp_path):
+    paths = []
+    for number, text in enumerate((b'Senior Python developer, AWS and SQL', b'Java developer')):
+        path = tmp_path / str(number)
+        path.write_bytes(text)
+        paths.append(path)
+
+    results = list(ScreeningPipeline(workers=1).run(
+        [('python.txt', str(paths[0])), ('java.txt', paths[1])], JOB_DESCRIPTION, remove_files=True
+    ))
+
+    assert sorted(result['filename'] for result in results) == ['java.txt', 'python.txt']
+    assert not any(result.get('error') for result in results)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_path_sources_are_kept_by_default(tmp_path):
+    path = tmp_path / 'resume.txt'
+    path.write_bytes(b'Senior Python developer')
+
+    [result] = ScreeningPipeline(workers=1).run([('resume.txt', str(path))], JOB_DESCRIPTION)
+
+    assert 'python' in [skill.lower() for skill in result['skills']]
+    assert path.exists()
+
+
+class MemoryFeatureCache:
+    """ParsedResumeCache stand-in that keeps entries in a dict"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.refreshed = {}
+
+    def lookup(self, content_hashes):
+        return {content_hash: dict(self.entries[content_hash]) for content_hash in content_hashes if content_hash in self.entries}
+
+    def store(self, features_by_hash):
+        self.entries.update(features_by_hash)
+
+    def refresh_skills(self, features_by_hash):
+        self.refreshed.update(features_by_hash)
+
+
+def cached_entry(data, fingerprint):
+    return {hashlib.sha256(data).hexdigest(): {
+        'content': data.decode(), 'skills': ['cobol'], 'experience_years': 0, 'taxonomy_fingerprint': fingerprint
+    }}
+
+
+def test_cached_skills_are_kept_under_the_same_taxonomy():
+    data = b'Senior Python developer'
+    fingerprint = get_skill_taxonomy().fingerprint
+    cache = MemoryFeatureCache(cached_entry(data, fingerprint))
+
+    [result] = ScreeningPipeline(workers=1, feature_cache=cache).run([('resume.txt', data)], JOB_DESCRIPTION)
+
+    assert result['cached'] and result['skills'] == ['cobol']
+    assert cache.refreshed == {}
+
+
+def test_cached_skills_are_rematched_after_a_taxonomy_change():
+    data = b'Senior Python developer'
+    cache = MemoryFeatureCache(cached_entry(data, 'previous-taxonomy'))
+
+    [result] = ScreeningPipeline(workers=1, feature_cache=cache).run([('resume.txt', data)], JOB_DESCRIPTION)
+
+    assert result['cached'] and 'python' in [skill.lower() for skill in result['skills']]
+    [refreshed] = cache.refreshed.values()
+    assert refreshed['taxonomy_fingerprint'] == get_skill_taxonomy().fingerprint
+
+
+def test_results_carry_the_profile_reasoning_needs(monkeypatch):
+    from utils.nlp_processor import get_nlp_processor
+
+    nlp_processor = get_nlp_processor()
+    [result] = ScreeningPipeline(workers=1).run(
+        [('python.txt', b'Senior Python developer with 6 years of AWS and SQL, led a team of five')],
+        JOB_DESCRIPTION, with_reasoning=False
+    )
+    expected = nlp_processor.generate_reasoning(result['content'], result['skills'], result['score'], JOB_DESCRIPTION)
+
+    def analyse_again(*args, **kwargs):
+        raise AssertionError('resume analysed a second time')
+
+    monkeypatch.setattr(nlp_processor, 'analyze_candidate', analyse_again)
+    reasoning = nlp_processor.generate_reasoning(
+        result['content'], result['skills'], result['score'], JOB_DESCRIPTION, candidate_profile=result['profile']
+    )
+
+    assert result['reasoning'] is None
+    assert reasoning == expected
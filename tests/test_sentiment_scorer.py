@@ -0,0 +1,45 @@
+"""
+Sentiment scorer tests - reviews are scored when they are written
+"""
+from datetime import date
+
+
+def add_employee(db):
+    from models import Employee
+
+    employee = Employee(name='Asha Rao', email='asha@example.com', department='Engineering',
+                        position='Engineer', hire_date=date(2022, 1, 10))
+    db.session.add(employee)
+    db.session.commit()
+    return employee
+
+
+def test_reviews_added_through_the_session_are_scored_on_flush(db):
+    from models import PerformanceReview
+
+    employee = add_employee(db)
+    praise = PerformanceReview(employee_id=employee.id, review_period='Q1', overall_rating=9,
+                               feedback='Excellent work, great collaboration and outstanding delivery')
+    criticism = PerformanceReview(employee_id=employee.id, review_period='Q1', overall_rating=4,
+                                  feedback='Poor communication and missed deadlines')
+    db.session.add_all([praise, criticism])
+    db.session.commit()
+
+    assert praise.sentiment_scored_at is not None and criticism.sentiment_scored_at is not None
+    assert praise.sentiment_score > 5 > criticism.sentiment_score
+
+
+def test_bulk_inserted_reviews_are_left_for_the_batch_scorer(db, app):
+    from models import PerformanceReview
+    from utils.nlp_processor import get_nlp_processor
+    from utils.sentiment_scorer import SentimentBatchScorer
+
+    employee = add_employee(db)
+    db.session.execute(db.insert(PerformanceReview), [
+        {'employee_id': employee.id, 'review_period': 'Q1', 'overall_rating': 8, 'feedback': 'Great work'}
+    ])
+    db.session.commit()
+    assert PerformanceReview.query.one().sentiment_scored_at is None
+
+    assert SentimentBatchScorer(app, get_nlp_processor()).score_pending() == 1
+    assert PerformanceReview.query.one().sentiment_scored_at is not None
@@ -0,0 +1,94 @@
+"""
+Skill taxonomy tests - hot reloads swap in a new taxonomy or keep the current one
+"""
+import json
+import os
+import time
+
+import pytest
+
+from utils import skill_taxonomy
+from utils.skill_taxonomy import TAXONOMY_PATH, TaxonomyStore
+
+
+@pytest.fixture
+def taxonomy_file(tmp_path):
+    path = tmp_path / 'skill_taxonomy.json'
+    with open(TAXONOMY_PATH) as bundled:
+        path.write_text(bundled.read())
+    return path
+
+
+def write_version(path, version, skill):
+    """Rewrite the taxonomy file with a new version and one extra skill, bumping its mtime"""
+    data = json.loads(path.read_text())
+    data['version'] = version
+    data['categories'].setdefault('testing', []).append(skill)
+    path.write_text(json.dumps(data))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_swaps_in_the_new_taxonomy(taxonomy_file):
+    store = TaxonomyStore(str(taxonomy_file))
+    before = store.current()
+
+    write_version(taxonomy_file, 2, 'quantum annealing')
+    reloaded = store.reload()
+
+    assert store.current() is reloaded
+    assert reloaded.version == 2
+    assert reloaded.fingerprint != before.fingerprint
+    assert 'quantum annealing' in reloaded.extract('Built quantum annealing schedulers')
+    assert 'quantum annealing' not in before.extract('Built quantum annealing schedulers')
+
+
+def test_malformed_file_keeps_the_current_taxonomy(taxonomy_file):
+    store = TaxonomyStore(str(taxonomy_file))
+    before = store.current()
+
+    taxonomy_file.write_text('{"version": 3, "categories": ')
+    with pytest.raises(ValueError):
+        store.reload()
+
+    assert store.current() is before
+
+
+def test_file_changes_are_picked_up_in_the_background(monkeypatch, taxonomy_file):
+    monkeypatch.setattr(TaxonomyStore, 'check_interval', 0)
+    store = TaxonomyStore(str(taxonomy_file))
+
+    write_version(taxonomy_file, 4, 'quantum annealing')
+    deadline = time.monotonic() + 10
+    while store.current().version != 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert store.current().version == 4
+
+
+@pytest.mark.parametrize('configured, sent', [(None, 'secret'), ('secret', None), ('secret', 'wrong')])
+def test_reload_endpoint_rejects_missing_or_wrong_tokens(app, monkeypatch, taxonomy_file, configured, sent):
+    store = TaxonomyStore(str(taxonomy_file))
+    monkeypatch.setattr(skill_taxonomy, '_store', store)
+    monkeypatch.setitem(app.config, 'ADMIN_API_TOKEN', configured)
+    before = store.current()
+    write_version(taxonomy_file, 5, 'quantum annealing')
+
+    response = app.test_client().post('/api/admin/skill-taxonomy/reload',
+                                      headers={'X-Admin-Token': sent} if sent else {})
+
+    assert response.status_code == 403
+    assert store.current() is before
+
+
+def test_reload_endpoint_reloads_with_the_admin_token(app, monkeypatch, taxonomy_file):
+    store = TaxonomyStore(str(taxonomy_file))
+    monkeypatch.setattr(skill_taxonomy, '_store', store)
+    monkeypatch.setitem(app.config, 'ADMIN_API_TOKEN', 'secret')
+    write_version(taxonomy_file, 6, 'quantum annealing')
+
+    response = app.test_client().post('/api/admin/skill-taxonomy/reload', headers={'X-Admin-Token': 'secret'})
+
+    assert response.status_code == 200
+    assert response.get_json()['version'] == 6
+    assert store.current().fingerprint == response.get_json()['fingerprint']
@@ -0,0 +1,340 @@
+"""
+Company Metrics - Materialised monthly HR metrics in the CompanyMetrics table
+"""
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import extract, func, insert, text
+
+from utils import hr_aggregates
+
+# Snapshot metric types derived from HRTransaction rows, keyed by transaction type
+TRANSACTION_METRICS = {
+    'increment': ('increments', 'increment_amount', 'increment_percentage'),
+    'joining': ('joinings',),
+    'exit': ('exits',)
+}
+SNAPSHOT_METRIC_TYPES = tuple(metric for metrics in TRANSACTION_METRICS.values() for metric in metrics)
+
+
+class CompanyMetricsSnapshots:
+    """Monthly per-department and company-wide HR metrics stored in CompanyMetrics
+
+    Each (metric_type, year, month, department) gets one row; company-wide rows
+    have no department. Transaction metrics (increment count, amount and
+    percentage totals, joinings, exits) come from one grouped query over
+    HRTransaction, and the current month's active headcount is recorded on
+    every build. Readers load one year of snapshot rows, so dashboard cost
+    depends on departments and months rather than transaction history.
+
+    Recording a transaction queues a rebuild of its month on a background
+    thread, and the current and previous month are refreshed there once the
+    newest snapshot is older than max_age; the whole history is only rebuilt
+    for an empty table or by the build-company-metrics command. Full builds and
+    recent refreshes record their time in a separate marker row, so month
+    rebuilds and headcount updates never make the snapshots look fresh. Rebuilds
+    replace rows by delete-then-insert and hold the database write lock from
+    the delete to the commit, so concurrent rebuilds never interleave.
+    """
+
+    period_type = 'monthly'
+    # Marker row holding the time of the last full build or recent refresh
+    refresh_period_type = 'build'
+    refresh_metric_type = 'refreshed'
+    max_age = timedelta(minutes=15)
+    # Arbitrary application-wide key for the PostgreSQL advisory lock that serialises rebuilds
+    advisory_lock_key = 7_310_421
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pending_months = set()
+        self._refresh_requested = False
+
+    def trend_cube(self, start=None, end=None):
+        """Transaction counts and sums grouped by (type, year, month, department) in one query
+
+        Returns {(transaction_type, year, month, department): (count, amount, percentage)}
+        for transactions with start <= effective_date < end (all history by default).
+        """
+        from database import db
+        from models import HRTransaction
+
+        kind = HRTransaction.transaction_type
+        tx_year = extract('year', HRTransaction.effective_date)
+        tx_month = extract('month', HRTransaction.effective_date)
+
+        query = db.session.query(
+            kind, tx_year, tx_month, HRTransaction.department,
+            func.count(HRTransaction.id),
+            func.sum(func.coalesce(HRTransaction.amount, 0)),
+            func.sum(func.coalesce(HRTransaction.percentage, 0))
+        ).filter(kind.in_(TRANSACTION_METRICS))
+        if start is not None:
+            query = query.filter(HRTransaction.effective_date >= start, HRTransaction.effective_date < end)
+
+        return {
+            (transaction_type, int(row_year), int(row_month), department): (count, amount or 0, percentage or 0)
+            for transaction_type, row_year, row_month, department, count, amount, percentage in query.group_by(
+                kind, tx_year, tx_month, HRTransaction.department
+            )
+        }
+
+    def rebuild(self, year=None, month=None):
+        """Recompute snapshot rows for one month, one year or (by default) all history"""
+        from database import db
+        from models import CompanyMetrics, Employee
+
+        # Take the write lock before reading, so a concurrent rebuild of an
+        # overlapping period waits for this one to commit instead of inserting
+        # its own copy of the rows deleted here
+        self._lock_snapshots()
+
+        stale = CompanyMetrics.query.filter(
+            CompanyMetrics.period_type == self.period_type,
+            CompanyMetrics.metric_type.in_(SNAPSHOT_METRIC_TYPES)
+        )
+        if year is not None:
+            stale = stale.filter(CompanyMetrics.period_year == year)
+        if month is not None:
+            stale = stale.filter(CompanyMetrics.period_month == month)
+        stale.delete(synchronize_session=False)
+
+        # Headcount can only be observed now, so it is kept per month as of the latest build
+        today = date.today()
+        CompanyMetrics.query.filter_by(
+            period_type=self.period_type, metric_type='headcount', period_year=today.year, period_month=today.month
+        ).delete(synchronize_session=False)
+
+        values = defaultdict(float)
+        for (transaction_type, row_year, row_month, department), totals in self.trend_cube(
+            *self._period_bounds(year, month)
+        ).items():
+            metric_values = dict(zip(TRANSACTION_METRICS[transaction_type], totals))
+            # Departmentless rows count toward company totals only
+            for scope in ((None, department) if department else (None,)):
+                for metric_type, value in metric_values.items():
+                    values[(metric_type, row_year, row_month, scope)] += value
+
+        headcounts = db.session.query(Employee.department, func.count(Employee.id)).filter(
+            Employee.status == 'active'
+        ).group_by(Employee.department).all()
+        values[('headcount', today.year, today.month, None)] = sum(count for _, count in headcounts)
+        for department, count in headcounts:
+            values[('headcount', today.year, today.month, department)] = count
+
+        built_at = datetime.utcnow()
+        if year is None:
+            self._mark_refreshed(built_at, len(values))
+        if not values:
+            db.session.commit()
+            return 0
+
+        db.session.execute(insert(CompanyMetrics), [
+            {
+                'metric_type': metric_type,
+                'metric_value': value,
+                'period_type': self.period_type,
+                'period_year': period_year,
+                'period_month': period_month,
+                'period_quarter': (period_month - 1) // 3 + 1,
+                'department': department,
+                'created_at': built_at
+            }
+            # Company-wide rows first: the ORM batches consecutive rows with the same null columns
+            for (metric_type, period_year, period_month, department), value in sorted(
+                values.items(), key=lambda item: item[0][3] is not None
+            )
+        ])
+        db.session.commit()
+        return len(values)
+
+    def record_transaction(self, effective_date):
+        """Queue a background rebuild of the month a new HR transaction falls in"""
+        with self._lock:
+            self._pending_months.add((effective_date.year, effective_date.month))
+        self.start()
+
+    def refresh_recent(self):
+        """Rebuild the current and previous month, the only ones new transactions usually touch"""
+        from database import db
+
+        today = date.today()
+        previous = today.replace(day=1) - timedelta(days=1)
+        rows = self.rebuild(previous.year, previous.month) + self.rebuild(today.year, today.month)
+
+        self._lock_snapshots()
+        self._mark_refreshed(datetime.utcnow(), rows)
+        db.session.commit()
+        return rows
+
+    def _mark_refreshed(self, built_at, rows):
+        """Replace the refresh marker row; the caller commits"""
+        from database import db
+        from models import CompanyMetrics
+
+        CompanyMetrics.query.filter_by(
+            period_type=self.refresh_period_type, metric_type=self.refresh_metric_type
+        ).delete(synchronize_session=False)
+        db.session.execute(insert(CompanyMetrics), [{
+            'metric_type': self.refresh_metric_type,
+            'metric_value': rows,
+            'period_type': self.refresh_period_type,
+            'period_year': built_at.year,
+            'notes': 'Snapshot rows written by the last full build or recent refresh',
+            'created_at': built_at
+        }])
+
+    def _lock_snapshots(self):
+        """Hold the snapshot write lock until the current transaction ends
+
+        On SQLite the delete that starts every rebuild already takes the
+        database write lock; PostgreSQL needs an explicit advisory lock.
+        """
+        from database import db
+
+        if db.engine.dialect.name == 'postgresql':
+            db.session.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': self.advisory_lock_key})
+
+    def last_refreshed(self):
+        """Time of the last full build or recent refresh, or None if there has been none"""
+        from database import db
+        from models import CompanyMetrics
+
+        return db.session.query(func.max(CompanyMetrics.created_at)).filter_by(
+            period_type=self.refresh_period_type, metric_type=self.refresh_metric_type
+        ).scalar()
+
+    def is_stale(self):
+        """True if the snapshots were never refreshed or the last refresh is older than max_age"""
+        return self._expired(self.last_refreshed())
+
+    def _expired(self, last_refreshed):
+        return last_refreshed is None or datetime.utcnow() - last_refreshed > self.max_age
+
+    def year_metrics(self, year):
+        """Return {(metric_type, month, department): value} for a year, building snapshots if there are none"""
+        from database import db
+        from models import CompanyMetrics
+
+        def load():
+            # The year's snapshots and the refresh marker in one query
+            rows = db.session.query(
+                CompanyMetrics.period_type, CompanyMetrics.metric_type, CompanyMetrics.period_month,
+                CompanyMetrics.department, CompanyMetrics.metric_value, CompanyMetrics.created_at
+            ).filter(
+                ((CompanyMetrics.period_type == self.period_type) & (CompanyMetrics.period_year == year)) |
+                ((CompanyMetrics.period_type == self.refresh_period_type) &
+                 (CompanyMetrics.metric_type == self.refresh_metric_type))
+            ).all()
+            refreshed = max((row.created_at for row in rows if row.period_type == self.refresh_period_type), default=None)
+            return [row for row in rows if row.period_type == self.period_type], refreshed
+
+        rows, last_refreshed = load()
+        if self._expired(last_refreshed):
+            if not rows and not CompanyMetrics.query.filter_by(period_type=self.period_type).limit(1).count():
+                self.rebuild()
+                rows, _ = load()
+            else:
+                self.start(refresh=True)
+
+        return {(row.metric_type, row.period_month, row.department): row.metric_value for row in rows}
+
+    def year_summary(self, year):
+        """Increment, joining/exit and monthly trend figures for a year, read from snapshots"""
+        metrics = self.year_metrics(year)
+
+        def company_total(metric_type):
+            return sum(value for (metric, _, department), value in metrics.items()
+                       if metric == metric_type and department is None)
+
+        def by_month(metric_type):
+            months = {month: int(value) for (metric, month, department), value in metrics.items()
+                      if metric == metric_type and department is None}
+            return dict(sorted(months.items()))
+
+        total_increments = int(company_total('increments'))
+        joinings = int(company_total('joinings'))
+        exits = int(company_total('exits'))
+        headcount = hr_aggregates.employee_aggregates()['total_employees']
+
+        by_department = defaultdict(lambda: {'count': 0, 'total_amount': 0})
+        monthly_increments = defaultdict(lambda: {'count': 0, 'total_amount': 0})
+        for (metric_type, month, department), value in metrics.items():
+            field = {'increments': 'count', 'increment_amount': 'total_amount'}.get(metric_type)
+            if field is None:
+                continue
+            target = monthly_increments[month] if department is None else by_department[department]
+            target[field] += int(value) if field == 'count' else value
+
+        return {
+            'increment_data': {
+                'total_increments': total_increments,
+                'total_amount': company_total('increment_amount'),
+                'average_percentage': round(company_total('increment_percentage') / total_increments, 2) if total_increments else 0,
+                'by_department': dict(by_department),
+                'by_month': dict(sorted(monthly_increments.items()))
+            },
+            'joining_leaving_data': {
+                'joined_this_year': joinings,
+                'left_this_year': exits,
+                'net_growth': joinings - exits,
+                # Attrition rate (exits / average headcount)
+                'attrition_rate': round(exits / headcount * 100, 2) if headcount > 0 else 0
+            },
+            'monthly_trends': {
+                'increments': by_month('increments'),
+                'joinings': by_month('joinings'),
+                'exits': by_month('exits')
+            },
+            'headcount': by_month('headcount')
+        }
+
+    def start(self, refresh=False):
+        """Run queued month rebuilds (and a recent refresh) on a background thread
+
+        Returns False if the thread is already running; it picks up the new work
+        before it exits.
+        """
+        app = current_app._get_current_object()
+        with self._lock:
+            self._refresh_requested = self._refresh_requested or refresh
+            if self._thread is not None:
+                return False
+            self._thread = threading.Thread(target=self._run, args=(app,), name='company-metrics', daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self, app):
+        from database import db
+
+        with app.app_context():
+            while True:
+                with self._lock:
+                    months, self._pending_months = self._pending_months, set()
+                    refresh, self._refresh_requested = self._refresh_requested, False
+                    if not months and not refresh:
+                        self._thread = None
+                        return
+
+                try:
+                    if refresh:
+                        self.refresh_recent()
+                    for year, month in sorted(months):
+                        self.rebuild(year, month)
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Error building company metrics snapshots: {e}")
+
+    def _period_bounds(self, year, month):
+        """Half-open date range covering a month, a year, or everything"""
+        if year is None:
+            return None, None
+        if month is None:
+            return date(year, 1, 1), date(year + 1, 1, 1)
+        return date(year, month, 1), date(year + (month == 12), month % 12 + 1, 1)
+
+
+company_metrics = CompanyMetricsSnapshots()
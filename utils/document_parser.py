@@ -1,27 +1,50 @@
 import io
 import os
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from PyPDF2 import PdfReader
 from docx import Document
 import pdfplumber
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
 try:
     import pytesseract
     from PIL import Image
-    import fitz  # PyMuPDF
-    OCR_AVAILABLE = True
+    OCR_AVAILABLE = PYMUPDF_AVAILABLE
 except ImportError:
     OCR_AVAILABLE = False
+if not OCR_AVAILABLE:
     print("Warning: OCR dependencies not available. Install pytesseract, Pillow, and PyMuPDF for OCR support.")
 
 class DocumentParser:
     """Parse different document formats to extract text content"""
 
-    def __init__(self):
+    def __init__(self, ocr_dpi=144, ocr_workers=None, ocr_time_budget=60):
         self.supported_formats = ['.pdf', '.docx', '.doc', '.txt']
 
+        # OCR render resolution, concurrent tesseract processes, and the seconds
+        # one document may spend in OCR before its remaining pages are skipped
+        self.ocr_dpi = ocr_dpi
+        self.ocr_workers = max(1, ocr_workers or min(4, os.cpu_count() or 1))
+        self.ocr_time_budget = ocr_time_budget
+
+        # A page needs a heavier engine when its text layer is shorter than this
+        # or mostly unmappable glyphs
+        self.min_page_chars = 20
+        self.max_garbled_ratio = 0.1
+
+        # Non-seekable upload streams are buffered in memory up to this many
+        # bytes and spill to an anonymous temp file only beyond it
+        self.spool_threshold = 10 * 1024 * 1024
+
     def extract_text_from_file(self, file_obj, filename):
         """Extract text content from uploaded file object"""
         try:
+            file_obj = self._seekable(file_obj)
             file_extension = os.path.splitext(filename)[1].lower()
 
             if file_extension == '.pdf':
@@ -50,127 +73,205 @@ class DocumentParser:
             except:
                 return f"Error: Could not parse {filename}. Please ensure the file is not corrupted."
 
-    def _extract_from_pdf(self, file_obj):
-        """Extract text from PDF file with OCR fallback"""
-        text_content = []
-
-        try:
-            # Try with pdfplumber first (better for complex PDFs)
-            file_obj.seek(0)
-            with pdfplumber.open(file_obj) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text and page_text.strip():
-                        text_content.append(page_text)
-
-            # If we got substantial text, return it
-            combined_text = "\n".join(text_content)
-            if len(combined_text.strip()) > 50:  # Minimum text threshold
-                return combined_text
-        except Exception as e:
-            print(f"pdfplumber failed: {e}")
-
-        try:
-            # Fallback to PyPDF2
-            file_obj.seek(0)
-            pdf_reader = PdfReader(file_obj)
-            text_content = []
-
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text and page_text.strip():
-                    text_content.append(page_text)
+    def _seekable(self, file_obj):
+        """Return file_obj itself when it can seek, else a spooled copy of it
+
+        BytesIO buffers and werkzeug FileStorage streams are parsed in place;
+        only other streams are copied, in memory unless they exceed spool_threshold.
+        """
+        seekable = getattr(file_obj, 'seekable', None)
+        if seekable is not None and seekable():
+            return file_obj
+
+        spooled = tempfile.SpooledTemporaryFile(max_size=self.spool_threshold)
+        while True:
+            chunk = file_obj.read(1024 * 1024)
+            if not chunk:
+                break
+            spooled.write(chunk)
+        spooled.seek(0)
+        return spooled
 
-            combined_text = "\n".join(text_content)
-            if len(combined_text.strip()) > 50:
-                return combined_text
-        except Exception as e:
-            print(f"PyPDF2 failed: {e}")
-
-        # If text extraction failed or returned minimal text, try OCR
-        if OCR_AVAILABLE:
-            try:
-                return self._extract_with_ocr(file_obj)
-            except Exception as e:
-                print(f"OCR failed: {e}")
+    def _extract_from_pdf(self, file_obj):
+        """Extract text from PDF file with per-page engine and OCR fallback"""
+        pages = self.extract_pdf_pages(file_obj)
+        combined_text = "\n".join(page['text'] for page in pages if page['text'].strip())
 
+        if combined_text.strip():
+            return combined_text
         return "Unable to extract text from PDF. The file may be image-based or corrupted."
 
-    def _extract_with_ocr(self, file_obj):
-        """Extract text using OCR for image-based PDFs"""
-        if not OCR_AVAILABLE:
-            return "OCR not available"
+    def extract_pdf_pages(self, file_obj):
+        """Extract each PDF page with the cheapest engine that yields usable text
 
-        text_content = []
+        PyMuPDF's text layer is tried first. Only pages whose text is missing or
+        garbled are re-processed with pdfplumber, then PyPDF2, then OCR (for pages
+        that contain images). Returns a list of {'page', 'engine', 'text'} dicts,
+        where engine is None for pages no engine could read.
+        """
         file_obj.seek(0)
+        data = file_obj.read()
 
-        # Save to temporary file for PyMuPDF
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            temp_file.write(file_obj.read())
-            temp_file_path = temp_file.name
-
-        try:
-            # Open PDF with PyMuPDF
-            pdf_document = fitz.open(temp_file_path)
+        page_count = None
+        texts = {}
+        engines = {}
+        image_pages = set()
 
-            for page_num in range(len(pdf_document)):
-                page = pdf_document.load_page(page_num)
+        def pending():
+            return [number for number in range(page_count) if number not in engines]
 
-                # Convert page to image
-                pix = page.get_pixmap(matrix=fitz.Matrix(2.0, 2.0))  # Higher resolution
-                img_data = pix.tobytes("png")
+        if PYMUPDF_AVAILABLE:
+            try:
+                with fitz.open(stream=data, filetype='pdf') as pdf_document:
+                    page_count = pdf_document.page_count
+                    for number in range(page_count):
+                        try:
+                            page = pdf_document.load_page(number)
+                            page_text = page.get_text()
+                            texts[number] = page_text
+                            if self._is_usable_text(page_text):
+                                engines[number] = 'pymupdf'
+                            elif page.get_images():
+                                image_pages.add(number)
+                        except Exception as e:
+                            print(f"PyMuPDF failed on page {number + 1}: {e}")
+            except Exception as e:
+                print(f"PyMuPDF failed: {e}")
 
-                # Convert to PIL Image
-                image = Image.open(io.BytesIO(img_data))
+        # A page that breaks one engine is left for the next; the rest of the document still counts
+        if page_count is None or pending():
+            try:
+                with pdfplumber.open(io.BytesIO(data)) as pdf:
+                    if page_count is None:
+                        page_count = len(pdf.pages)
+                    for number in pending():
+                        try:
+                            page_text = pdf.pages[number].extract_text() or ''
+                        except Exception as e:
+                            print(f"pdfplumber failed on page {number + 1}: {e}")
+                            continue
+                        if self._is_usable_text(page_text):
+                            texts[number] = page_text
+                            engines[number] = 'pdfplumber'
+            except Exception as e:
+                print(f"pdfplumber failed: {e}")
 
-                # Perform OCR
-                page_text = pytesseract.image_to_string(image, config='--psm 6')
-                if page_text.strip():
-                    text_content.append(page_text)
+        if page_count is None or pending():
+            try:
+                pdf_reader = PdfReader(io.BytesIO(data))
+                if page_count is None:
+                    page_count = len(pdf_reader.pages)
+                for number in pending():
+                    try:
+                        page_text = pdf_reader.pages[number].extract_text() or ''
+                    except Exception as e:
+                        print(f"PyPDF2 failed on page {number + 1}: {e}")
+                        continue
+                    if self._is_usable_text(page_text):
+                        texts[number] = page_text
+                        engines[number] = 'pypdf2'
+            except Exception as e:
+                print(f"PyPDF2 failed: {e}")
 
-            pdf_document.close()
-            return "\n".join(text_content) if text_content else "No text found via OCR"
+        if page_count is None:
+            return []
 
-        finally:
-            # Clean up temporary file
+        # Text-free pages without images are blank, so only scanned pages go to OCR
+        ocr_pages = [number for number in pending() if number in image_pages or number not in texts]
+        if OCR_AVAILABLE and ocr_pages:
             try:
-                os.unlink(temp_file_path)
-            except:
-                pass
+                for number, page_text in self._ocr_pages(data, ocr_pages).items():
+                    if page_text.strip():
+                        texts[number] = page_text
+                        engines[number] = 'ocr'
+            except Exception as e:
+                print(f"OCR failed: {e}")
+
+        return [
+            {'page': number + 1, 'engine': engines.get(number), 'text': texts.get(number, '')}
+            for number in range(page_count)
+        ]
+
+    def _is_usable_text(self, text):
+        """Check whether a page's extracted text is long enough and not mostly garbled"""
+        stripped = text.strip() if text else ''
+        if len(stripped) < self.min_page_chars:
+            return False
+        return stripped.count('\ufffd') / len(stripped) <= self.max_garbled_ratio
+
+    def _ocr_pages(self, data, page_numbers):
+        """OCR the given zero-based pages of an in-memory PDF concurrently, returning {page: text}
+
+        Pages are rendered on this thread (PyMuPDF documents are not thread-safe)
+        while earlier pages are already in tesseract. Each tesseract call is its
+        own process, so a small thread pool is enough to keep several busy. Pages
+        not yet rendered when the time budget runs out are skipped, and running
+        calls are cut off at the deadline.
+        """
+        deadline = time.monotonic() + self.ocr_time_budget if self.ocr_time_budget else None
+        zoom = self.ocr_dpi / 72
+        results = {}
+        in_flight = {}
+
+        def collect(futures):
+            for future in futures:
+                page_num = in_flight.pop(future)
+                try:
+                    results[page_num] = future.result()
+                except Exception as e:
+                    print(f"OCR failed on page {page_num + 1}: {e}")
+
+        with fitz.open(stream=data, filetype='pdf') as pdf_document, \
+                ThreadPoolExecutor(max_workers=self.ocr_workers, thread_name_prefix='ocr') as executor:
+            for index, page_num in enumerate(page_numbers):
+                if deadline and time.monotonic() >= deadline:
+                    print(f"OCR time budget exhausted, skipping {len(page_numbers) - index} pages")
+                    break
+
+                # Bound rendered-but-unrecognised pages held in memory
+                if len(in_flight) >= self.ocr_workers * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+                pix = pdf_document.load_page(page_num).get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+                image = Image.frombytes('RGB', (pix.width, pix.height), pix.samples)
+                in_flight[executor.submit(self._ocr_image, image, deadline)] = page_num
+
+            collect(list(in_flight))
+
+        return results
+
+    def _ocr_image(self, image, deadline=None):
+        """Run tesseract on one rendered page, limited to the time left before deadline"""
+        timeout = 0
+        if deadline:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError("OCR time budget exhausted")
+            timeout = max(1, remaining)
+        return pytesseract.image_to_string(image, config='--psm 6', timeout=timeout)
 
     def _extract_from_docx(self, file_obj):
         """Extract text from DOCX file"""
         try:
-            # Save to temporary file since python-docx needs file path
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
-                file_obj.seek(0)
-                temp_file.write(file_obj.read())
-                temp_file_path = temp_file.name
-
-            try:
-                doc = Document(temp_file_path)
-                text_content = []
-
-                # Extract text from paragraphs
-                for paragraph in doc.paragraphs:
-                    if paragraph.text.strip():
-                        text_content.append(paragraph.text)
+            # python-docx reads the zip package straight from a seekable stream
+            file_obj.seek(0)
+            doc = Document(file_obj)
+            text_content = []
 
-                # Extract text from tables
-                for table in doc.tables:
-                    for row in table.rows:
-                        for cell in row.cells:
-                            if cell.text.strip():
-                                text_content.append(cell.text)
+            # Extract text from paragraphs
+            for paragraph in doc.paragraphs:
+                if paragraph.text.strip():
+                    text_content.append(paragraph.text)
 
-                return "\n".join(text_content) if text_content else "No text found in document"
+            # Extract text from tables
+            for table in doc.tables:
+                for row in table.rows:
+                    for cell in row.cells:
+                        if cell.text.strip():
+                            text_content.append(cell.text)
 
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(temp_file_path)
-                except:
-                    pass
+            return "\n".join(text_content) if text_content else "No text found in document"
 
         except Exception as e:
             return f"Error reading DOCX file: {str(e)}"
@@ -0,0 +1,128 @@
+"""
+Employee Leaderboard - Top performers ranked in one SQL statement
+"""
+import threading
+import time
+from datetime import date, timedelta
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+
+class EmployeeLeaderboard:
+    """Rank active employees by latest review rating, then by increments in the last year
+
+    The latest review per employee comes from a ROW_NUMBER() window and the
+    increment counts from one grouped subquery, both outer-joined to the active
+    employees and ordered and limited in the database, so the ranking costs
+    one query however many employees there are. Employees without a review
+    fall back to their performance score, or 7.0 if they have none.
+
+    Results are cached per limit for LEADERBOARD_CACHE_SECONDS (0 disables
+    the cache) and dropped when a review, increment or employee is flushed and
+    again when it is committed through the ORM session. Each drop bumps a
+    generation counter, and a ranking computed across a drop is returned but
+    not cached, so a stale result is never written back.
+
+    The cache and its generation are per process: other gunicorn workers keep
+    serving their cached leaderboard, so LEADERBOARD_CACHE_SECONDS is how long
+    a write can take to show up on every worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._generation = 0
+
+    def top(self, limit=10):
+        """Return the top `limit` leaderboard rows, from the cache when it is fresh"""
+        ttl = current_app.config.get('LEADERBOARD_CACHE_SECONDS', 0) if has_app_context() else 0
+        if ttl <= 0:
+            return self.compute(limit)
+
+        key = (limit, date.today())
+        with self._lock:
+            cached = self._cache.get(key)
+            generation = self._generation
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+
+        rows = self.compute(limit)
+        with self._lock:
+            if self._generation == generation:
+                self._cache = {key: (time.monotonic(), rows)}
+        return rows
+
+    def compute(self, limit=10):
+        """Run the leaderboard query and return a list of row dicts"""
+        from database import db
+        from models import Employee, HRTransaction, PerformanceReview
+
+        latest_review = db.session.query(
+            PerformanceReview.employee_id,
+            PerformanceReview.overall_rating,
+            func.row_number().over(
+                partition_by=PerformanceReview.employee_id,
+                order_by=(PerformanceReview.created_at.desc(), PerformanceReview.id.desc())
+            ).label('position')
+        ).subquery()
+
+        recent_increments = db.session.query(
+            HRTransaction.employee_id,
+            func.count(HRTransaction.id).label('increments')
+        ).filter(
+            HRTransaction.transaction_type == 'increment',
+            HRTransaction.effective_date >= date.today() - timedelta(days=365)
+        ).group_by(HRTransaction.employee_id).subquery()
+
+        rating = func.coalesce(latest_review.c.overall_rating, func.nullif(Employee.performance_score, 0), 7.0)
+        increments = func.coalesce(recent_increments.c.increments, 0)
+
+        rows = db.session.query(
+            Employee.id, Employee.name, Employee.department, Employee.position,
+            rating.label('rating'), increments.label('increments_this_year')
+        ).outerjoin(
+            latest_review, (latest_review.c.employee_id == Employee.id) & (latest_review.c.position == 1)
+        ).outerjoin(
+            recent_increments, recent_increments.c.employee_id == Employee.id
+        ).filter(
+            Employee.status == 'active'
+        ).order_by(rating.desc(), increments.desc(), Employee.id).limit(limit).all()
+
+        return [dict(row._mapping) for row in rows]
+
+    def invalidate(self):
+        """Drop every cached leaderboard and keep computations already running from caching theirs"""
+        with self._lock:
+            self._generation += 1
+            self._cache = {}
+
+
+employee_leaderboard = EmployeeLeaderboard()
+
+
+@event.listens_for(Session, 'after_flush')
+def _invalidate_on_write(session, flush_context):
+    """Drop cached leaderboards when a flush touches reviews, increments or employees"""
+    from models import Employee, HRTransaction, PerformanceReview
+
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, (Employee, PerformanceReview)) or (
+            isinstance(instance, HRTransaction) and instance.transaction_type == 'increment'
+        ):
+            session.info['leaderboard_written'] = True
+            employee_leaderboard.invalidate()
+            return
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    """Drop leaderboards cached between the flush and the commit, which could not see the write"""
+    if session.info.pop('leaderboard_written', False):
+        employee_leaderboard.invalidate()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_rolled_back_write(session):
+    session.info.pop('leaderboard_written', None)
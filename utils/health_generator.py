@@ -2,7 +2,8 @@ import random
 import json
 from datetime import datetime, timedelta
 from models import Employee, HealthMetrics
-from app import db
+from database import db
+from utils import hr_aggregates
 
 class HealthDataGenerator:
     """Generate comprehensive health data for employees based on their profiles"""
@@ -146,34 +147,12 @@ class HealthDataGenerator:
     
     def get_health_overview(self):
         """Get overall health statistics for all employees"""
-        total_employees = Employee.query.count()
-        employees_with_health = db.session.query(HealthMetrics.employee_id).distinct().count()
-        
-        # BMI distribution
-        bmi_stats = {
-            'normal': HealthMetrics.query.filter_by(bmi_status='Normal').count(),
-            'overweight': HealthMetrics.query.filter_by(bmi_status='Overweight').count(),
-            'obese': HealthMetrics.query.filter_by(bmi_status='Obese').count(),
-            'underweight': HealthMetrics.query.filter_by(bmi_status='Underweight').count()
-        }
-        
-        # Stress distribution
-        stress_stats = {
-            'low': HealthMetrics.query.filter_by(stress_status='Low').count(),
-            'moderate': HealthMetrics.query.filter_by(stress_status='Moderate').count(),
-            'high': HealthMetrics.query.filter_by(stress_status='High').count()
-        }
-        
-        # Blood pressure distribution
-        bp_stats = {
-            'normal': HealthMetrics.query.filter_by(bp_status='Normal').count(),
-            'elevated': HealthMetrics.query.filter_by(bp_status='Elevated').count()
-        }
-        
+        health_stats = hr_aggregates.health_metrics_aggregates()
+
         return {
-            'total_employees': total_employees,
-            'employees_with_health_data': employees_with_health,
-            'bmi_distribution': bmi_stats,
-            'stress_distribution': stress_stats,
-            'bp_distribution': bp_stats
+            'total_employees': hr_aggregates.employee_aggregates()['total_employees'],
+            'employees_with_health_data': health_stats['employees_with_health_data'],
+            'bmi_distribution': health_stats['bmi_distribution'],
+            'stress_distribution': health_stats['stress_distribution'],
+            'bp_distribution': health_stats['bp_distribution']
         }
\ No newline at end of file
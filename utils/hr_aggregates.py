@@ -0,0 +1,164 @@
+"""
+HR Aggregates - Dashboard counters computed with one conditional-aggregation query per table
+"""
+from flask import g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Checks counted in the recent wellness distribution
+RECENT_WELLNESS_CHECKS = 30
+
+
+def _count_where(condition):
+    """SUM(CASE WHEN condition THEN 1 ELSE 0 END), zero on an empty table"""
+    from database import db
+    return db.func.coalesce(db.func.sum(db.case((condition, 1), else_=0)), 0)
+
+
+def _shared(name, compute):
+    """Compute an aggregate once per app context so every view in a request reuses it
+
+    The cache is dropped whenever the session flushes or commits, so a view
+    that writes and then reads again sees its own changes.
+    """
+    if not has_app_context():
+        return compute()
+
+    cache = g.setdefault('hr_aggregates', {})
+    if name not in cache:
+        cache[name] = compute()
+    return cache[name]
+
+
+def employee_aggregates():
+    """Headcount, active headcount, performance averages and performance buckets for Employee"""
+    def compute():
+        from database import db
+        from models import Employee
+
+        score = Employee.performance_score
+        row = db.session.query(
+            db.func.count(Employee.id),
+            _count_where(Employee.status == 'active'),
+            db.func.avg(score),
+            db.func.coalesce(db.func.sum(score), 0),
+            _count_where(score >= 9),
+            _count_where((score >= 7) & (score < 9)),
+            _count_where((score >= 5) & (score < 7)),
+            _count_where(score < 5),
+            _count_where(score >= 8.5)
+        ).one()
+
+        return {
+            'total_employees': row[0],
+            'active_employees': row[1],
+            'avg_performance': row[2] or 0,
+            'performance_total': row[3],
+            'performance_distribution': {
+                'excellent': row[4],
+                'good': row[5],
+                'average': row[6],
+                'needs_improvement': row[7]
+            },
+            'top_performer_count': row[8]
+        }
+
+    return _shared('employees', compute)
+
+
+def department_headcounts():
+    """List of (department, headcount) pairs ordered by department"""
+    def compute():
+        from database import db
+        from models import Employee
+
+        return db.session.query(
+            Employee.department, db.func.count(Employee.id)
+        ).group_by(Employee.department).order_by(Employee.department).all()
+
+    return _shared('departments', compute)
+
+
+def wellness_check_aggregates():
+    """Total WellnessCheck rows, the green/yellow/red split, and the split over the most recent checks"""
+    def compute():
+        from database import db
+        from models import WellnessCheck
+
+        status = WellnessCheck.overall_wellness
+        recent = db.session.query(status).order_by(
+            WellnessCheck.check_date.desc()
+        ).limit(RECENT_WELLNESS_CHECKS).subquery()
+
+        def recent_count(value):
+            return db.select(_count_where(recent.c.overall_wellness == value)).scalar_subquery()
+
+        row = db.session.query(
+            db.func.count(WellnessCheck.id),
+            _count_where(status == 'green'),
+            _count_where(status == 'yellow'),
+            _count_where(status == 'red'),
+            recent_count('green'),
+            recent_count('yellow'),
+            recent_count('red')
+        ).one()
+
+        return {
+            'total_checks': row[0], 'green': row[1], 'yellow': row[2], 'red': row[3],
+            'recent_distribution': {'green': row[4], 'yellow': row[5], 'red': row[6]}
+        }
+
+    return _shared('wellness_checks', compute)
+
+
+def health_metrics_aggregates():
+    """Employees with health data and the BMI, stress and blood pressure distributions"""
+    def compute():
+        from database import db
+        from models import HealthMetrics
+
+        row = db.session.query(
+            db.func.count(db.distinct(HealthMetrics.employee_id)),
+            _count_where(HealthMetrics.bmi_status == 'Normal'),
+            _count_where(HealthMetrics.bmi_status == 'Overweight'),
+            _count_where(HealthMetrics.bmi_status == 'Obese'),
+            _count_where(HealthMetrics.bmi_status == 'Underweight'),
+            _count_where(HealthMetrics.stress_status == 'Low'),
+            _count_where(HealthMetrics.stress_status == 'Moderate'),
+            _count_where(HealthMetrics.stress_status == 'High'),
+            _count_where(HealthMetrics.bp_status == 'Normal'),
+            _count_where(HealthMetrics.bp_status == 'Elevated')
+        ).one()
+
+        return {
+            'employees_with_health_data': row[0],
+            'bmi_distribution': {'normal': row[1], 'overweight': row[2], 'obese': row[3], 'underweight': row[4]},
+            'stress_distribution': {'low': row[5], 'moderate': row[6], 'high': row[7]},
+            'bp_distribution': {'normal': row[8], 'elevated': row[9]}
+        }
+
+    return _shared('health_metrics', compute)
+
+
+def learning_aggregates():
+    """Total and completed LearningProgress rows"""
+    def compute():
+        from database import db
+        from models import LearningProgress
+
+        row = db.session.query(
+            db.func.count(LearningProgress.id),
+            _count_where(LearningProgress.completed.is_(True))
+        ).one()
+
+        return {'total': row[0], 'completed': row[1]}
+
+    return _shared('learning', compute)
+
+
+@event.listens_for(Session, 'after_flush')
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_write(session, *args):
+    """Drop this app context's aggregates once the session has written anything"""
+    if has_app_context():
+        g.pop('hr_aggregates', None)
@@ -1,7 +1,5 @@
-import json
 import random
 from datetime import datetime, timedelta
-from collections import defaultdict
 from models import Employee, LearningProgress, WellnessCheck, PerformanceReview, HRTransaction, HealthMetrics
 
 class HRAnalytics:
@@ -150,6 +148,7 @@ class HRAnalytics:
     def analyze_employee_skill_gaps(self, employee):
         """Analyze skill gaps for an employee"""
         return {
+            'employee': employee,
             'employee_name': employee.name,
             'current_skills': employee.skills or "General skills",
             'skill_gaps': employee.skill_gaps or "No specific gaps identified",
@@ -162,25 +161,23 @@ class HRAnalytics:
     
     def generate_hr_insights(self):
         """Generate comprehensive HR insights"""
-        from app import db
+        from utils import hr_aggregates
         
         # Basic statistics
-        total_employees = Employee.query.count()
-        departments = db.session.query(Employee.department, db.func.count(Employee.id)).group_by(Employee.department).all()
+        employee_stats = hr_aggregates.employee_aggregates()
+        total_employees = employee_stats['total_employees']
+        departments = hr_aggregates.department_headcounts()
         
-        # Performance distribution
-        performance_data = db.session.query(Employee.performance_score).all()
-        avg_performance = sum(score[0] for score in performance_data if score[0]) / len(performance_data) if performance_data else 0
+        # Performance distribution (missing scores count as zero)
+        avg_performance = employee_stats['performance_total'] / total_employees if total_employees else 0
         
-        # Wellness trends
-        wellness_checks = WellnessCheck.query.order_by(WellnessCheck.check_date.desc()).limit(30).all()
-        wellness_distribution = {'green': 0, 'yellow': 0, 'red': 0}
-        for check in wellness_checks:
-            wellness_distribution[check.overall_wellness] += 1
+        # Wellness trends over the most recent checks
+        wellness_distribution = dict(hr_aggregates.wellness_check_aggregates()['recent_distribution'])
         
         # Learning engagement
-        total_learning = LearningProgress.query.count()
-        completed_learning = LearningProgress.query.filter_by(completed=True).count()
+        learning_stats = hr_aggregates.learning_aggregates()
+        total_learning = learning_stats['total']
+        completed_learning = learning_stats['completed']
         completion_rate = (completed_learning / total_learning * 100) if total_learning else 0
         
         return {
@@ -203,6 +200,7 @@ class HRAnalytics:
             return {
                 'avg_rating': 0,
                 'sentiment_distribution': {'positive': 0, 'neutral': 0, 'negative': 0},
+                'pending_sentiment': 0,
                 'trends': [],
                 'top_performers': [],
                 'improvement_needed': []
@@ -213,8 +211,11 @@ class HRAnalytics:
         
         # Sentiment distribution
         sentiment_dist = {'positive': 0, 'neutral': 0, 'negative': 0}
+        pending_sentiment = 0
         for review in reviews:
-            if review.sentiment_score >= 7:
+            if review.sentiment_scored_at is None:
+                pending_sentiment += 1
+            elif review.sentiment_score >= 7:
                 sentiment_dist['positive'] += 1
             elif review.sentiment_score >= 4:
                 sentiment_dist['neutral'] += 1
@@ -236,6 +237,7 @@ class HRAnalytics:
         return {
             'avg_rating': round(avg_rating, 2),
             'sentiment_distribution': sentiment_dist,
+            'pending_sentiment': pending_sentiment,
             'total_reviews': len(reviews),
             'top_performers': top_performers,
             'improvement_needed': improvement_needed
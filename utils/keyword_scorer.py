@@ -0,0 +1,86 @@
+"""
+Keyword Scorer - Vectorized TF-IDF cosine similarity of resumes against a job description
+"""
+import math
+
+import numpy as np
+
+
+class InverseDocumentFrequencies:
+    """Smoothed IDF, log((1 + N) / (1 + df)) + 1, over a snapshot of a resume corpus
+
+    Holds plain counts so it can be shipped to screening pool workers. Terms the
+    corpus has never seen get the highest weight.
+    """
+
+    def __init__(self, doc_count, document_frequencies):
+        self.doc_count = doc_count
+        self.document_frequencies = document_frequencies
+        self.unseen_weight = math.log(1 + doc_count) + 1
+
+    def weight(self, term):
+        """Return the IDF weight of one term"""
+        frequency = self.document_frequencies.get(term)
+        if not frequency:
+            return self.unseen_weight
+        return math.log((1 + self.doc_count) / (1 + frequency)) + 1
+
+
+class KeywordScorer:
+    """Score a batch of term-frequency Counters against one job description
+
+    Both the job description and each resume are weighted TF x IDF and
+    normalised, so the score is the TF-IDF cosine. The job description vector
+    is built once. Each batch becomes a sparse document-term matrix over the
+    query vocabulary, held as coordinate arrays, and its product with the query
+    vector is one weighted bincount. Resume norms use every term in the resume.
+    Without IDF the result equals plain term-frequency cosine.
+    """
+
+    def __init__(self, query_frequencies, idf=None):
+        self.idf = idf
+        self.terms = list(query_frequencies)
+        self.term_index = {term: column for column, term in enumerate(self.terms)}
+
+        weights = np.array(
+            [count * self._weight(term) for term, count in query_frequencies.items()],
+            dtype=np.float64
+        )
+        norm = np.linalg.norm(weights)
+        self.query_vector = weights / norm if norm else weights
+
+    def _weight(self, term):
+        return self.idf.weight(term) if self.idf else 1.0
+
+    def score(self, document_frequencies):
+        """Return an array of 0-1 cosine similarities, one per term-frequency Counter"""
+        doc_count = len(document_frequencies)
+        if not doc_count or not self.terms:
+            return np.zeros(doc_count)
+
+        rows, columns, values = [], [], []
+        norms = np.empty(doc_count)
+        term_index = self.term_index
+        weight = self._weight
+
+        for row, frequencies in enumerate(document_frequencies):
+            if self.idf:
+                norms[row] = math.sqrt(sum((count * weight(term)) ** 2 for term, count in frequencies.items()))
+            else:
+                norms[row] = math.sqrt(sum(count * count for count in frequencies.values()))
+            # Walk whichever side is smaller; short job descriptions are the common case
+            if len(frequencies) < len(term_index):
+                matches = ((term, term_index[term], count) for term, count in frequencies.items() if term in term_index)
+            else:
+                matches = ((term, column, frequencies[term]) for term, column in term_index.items() if term in frequencies)
+            for term, column, count in matches:
+                rows.append(row)
+                columns.append(column)
+                values.append(count * weight(term))
+
+        if not rows:
+            return np.zeros(doc_count)
+
+        columns = np.array(columns)
+        dots = np.bincount(rows, weights=np.array(values) * self.query_vector[columns], minlength=doc_count)
+        return np.divide(dots, norms, out=np.zeros(doc_count), where=norms > 0)
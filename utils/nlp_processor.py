@@ -1,97 +1,200 @@
 import re
 import json
-from collections import Counter
-import math
+import hashlib
+import os
+import threading
+from collections import Counter, OrderedDict
+from utils.term_matcher import TermMatcher
+from utils.keyword_scorer import KeywordScorer
+from utils.skill_taxonomy import get_skill_taxonomy
+from utils.sentiment_lexicon import SENTIMENT_LEXICON
+
+class JobProfile:
+    """Job description analysis shared by every resume scored against it"""
+
+    def __init__(self, skills, term_frequencies, required_years, education_level, role_terms, industries):
+        self.skills = skills
+        self.term_frequencies = term_frequencies
+        self.keyword_scorer = KeywordScorer(term_frequencies)
+        self.required_years = required_years
+        self.education_level = education_level
+        self.role_terms = role_terms
+        self.industries = industries
+
+class CandidateProfile:
+    """Single-pass analysis of a resume's text shared by scoring and reasoning"""
+
+    def __init__(self, term_hits, term_frequencies, experience_years, education_level, leadership_count,
+                 tech_count, collaboration_count, impact_count, advanced_education, certified, industries):
+        self.term_hits = term_hits
+        self.term_frequencies = term_frequencies
+        self.experience_years = experience_years
+        self.education_level = education_level
+        self.leadership_count = leadership_count
+        self.tech_count = tech_count
+        self.collaboration_count = collaboration_count
+        self.impact_count = impact_count
+        self.advanced_education = advanced_education
+        self.certified = certified
+        self.industries = industries
 
 class NLPProcessor:
     """Basic NLP processor for HR platform"""
 
     def __init__(self):
-        # Comprehensive skills database with synonyms and variations
-        self.skills_db = {
-            'programming': ['python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'go', 'rust', 'kotlin', 'swift', 'scala', 'perl', 'matlab', 'typescript'],
-            'web_development': ['html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'laravel', 'spring boot', 'asp.net', 'ruby on rails'],
-            'database': ['sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'cassandra', 'dynamodb', 'elasticsearch', 'neo4j'],
-            'cloud': ['aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible', 'jenkins', 'ci/cd', 'devops', 'microservices'],
-            'data_science': ['pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'jupyter', 'r', 'tableau', 'power bi', 'matplotlib', 'seaborn', 'spark'],
-            'soft_skills': ['leadership', 'communication', 'teamwork', 'problem solving', 'creativity', 'adaptability', 'analytical thinking', 'project management'],
-            'project_management': ['agile', 'scrum', 'kanban', 'jira', 'confluence', 'project planning', 'waterfall', 'lean', 'six sigma', 'pmp'],
-            'design': ['photoshop', 'illustrator', 'figma', 'sketch', 'ui/ux', 'graphic design', 'adobe creative suite', 'wireframing', 'prototyping'],
-            'business': ['product management', 'business analysis', 'market research', 'strategic planning', 'stakeholder management', 'roadmap planning'],
-            'mobile': ['ios', 'android', 'react native', 'flutter', 'xamarin', 'mobile development', 'app store', 'google play'],
-            'security': ['cybersecurity', 'penetration testing', 'vulnerability assessment', 'security auditing', 'compliance', 'risk management'],
-            'testing': ['selenium', 'test automation', 'unit testing', 'integration testing', 'performance testing', 'qa', 'quality assurance']
+        # Education levels recognised in resumes and job descriptions
+        self.education_levels = {
+            'phd': 4, 'doctorate': 4, 'doctoral': 4,
+            'master': 3, 'mba': 3, 'ms': 3, 'ma': 3,
+            'bachelor': 2, 'bs': 2, 'ba': 2, 'degree': 2,
+            'diploma': 1, 'certificate': 1
         }
 
-        # Enhanced skill variations and synonyms
-        self.skill_variations = {
-            'javascript': ['js', 'node.js', 'nodejs', 'ecmascript'],
-            'python': ['py', 'python3', 'python2'],
-            'artificial intelligence': ['ai', 'machine learning', 'ml', 'deep learning', 'neural networks'],
-            'user interface': ['ui', 'user experience', 'ux', 'frontend'],
-            'application programming interface': ['api', 'rest api', 'restful', 'graphql'],
-            'database': ['db', 'databases', 'data management'],
-            'software development': ['dev', 'development', 'programming', 'coding'],
-            'amazon web services': ['aws', 'amazon cloud'],
-            'microsoft azure': ['azure', 'azure cloud'],
-            'google cloud platform': ['gcp', 'google cloud'],
-            'continuous integration': ['ci', 'ci/cd', 'continuous deployment'],
-            'object oriented programming': ['oop', 'object oriented'],
-            'version control': ['git', 'github', 'gitlab', 'bitbucket', 'svn'],
-            'product management': ['product manager', 'product owner', 'roadmap planning'],
-            'business intelligence': ['bi', 'power bi', 'tableau', 'qlik']
+        # Role-specific indicators: industry, company size and work style terms
+        # ('startup' and 'enterprise' appear in two groups and count twice)
+        self.role_terms = [
+            'healthcare', 'finance', 'fintech', 'banking', 'insurance',
+            'retail', 'e-commerce', 'manufacturing', 'automotive',
+            'technology', 'software', 'startup', 'enterprise',
+            'government', 'non-profit', 'education', 'media',
+            'startup', 'small business', 'mid-size', 'enterprise',
+            'fortune 500', 'multinational', 'global company',
+            'remote', 'hybrid', 'agile', 'waterfall', 'collaborative',
+            'cross-functional', 'fast-paced', 'deadline-driven'
+        ]
+
+        # Profile indicators used in match reasoning
+        self.leadership_terms = ['senior', 'lead', 'manager', 'director', 'head', 'principal', 'architect', 'chief', 'vp']
+        self.tech_indicators = ['architecture', 'design patterns', 'scalability', 'performance optimization', 'system design']
+        self.advanced_education = ['phd', 'doctorate', 'master', 'mba']
+        self.certification_terms = ['certified', 'certification', 'aws certified', 'microsoft certified', 'google certified']
+        self.collaboration_terms = ['collaborative', 'cross-functional', 'stakeholder', 'communication', 'presentation']
+        self.impact_terms = ['innovative', 'optimization', 'improvement', 'award', 'recognition', 'patent']
+        self.industries = {
+            'fintech': ['fintech', 'financial technology', 'payments', 'banking', 'trading'],
+            'healthcare': ['healthcare', 'medical', 'clinical', 'hospital', 'pharmaceutical'],
+            'e-commerce': ['e-commerce', 'retail', 'marketplace', 'shopping', 'consumer'],
+            'enterprise': ['enterprise', 'b2b', 'saas', 'corporate', 'business software'],
+            'startup': ['startup', 'early stage', 'seed', 'series a', 'venture']
         }
 
-        # Flatten skills for searching
-        self.all_skills = []
-        for category in self.skills_db.values():
-            self.all_skills.extend(category)
+        # Every term above is matched as a plain substring, so one scan finds them all
+        self.profile_matcher = TermMatcher(
+            list(self.education_levels) + self.role_terms + self.leadership_terms + self.tech_indicators +
+            self.advanced_education + self.certification_terms + self.collaboration_terms + self.impact_terms +
+            [term for terms in self.industries.values() for term in terms],
+            whole_words=False
+        )
 
-        # Add variations to all skills
-        for main_skill, variations in self.skill_variations.items():
-            if main_skill not in self.all_skills:
-                self.all_skills.append(main_skill)
-            self.all_skills.extend(variations)
+        # Compiled job descriptions, most recently used last
+        self.job_profile_cache_size = 64
+        self._job_profiles = OrderedDict()
+        self._job_profile_lock = threading.Lock()
 
-    def extract_skills(self, text):
-        """Extract skills from text using keyword matching"""
-        text_lower = text.lower()
-        found_skills = []
+    @property
+    def taxonomy(self):
+        """The current shared skill taxonomy; reloads replace it without touching this processor"""
+        return get_skill_taxonomy()
 
-        # Add word boundary checking for better accuracy
-        import re
+    @property
+    def skills_db(self):
+        return self.taxonomy.categories
 
-        for skill in self.all_skills:
-            # Create pattern with word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.append(skill)
-
-        # Also look for common skill variations and abbreviations
-        skill_variations = {
-            'javascript': ['js', 'node.js', 'nodejs'],
-            'python': ['py'],
-            'artificial intelligence': ['ai', 'machine learning', 'ml'],
-            'user interface': ['ui'],
-            'user experience': ['ux'],
-            'application programming interface': ['api'],
-            'database': ['db'],
-            'software development': ['dev', 'development']
-        }
+    @property
+    def skill_variations(self):
+        return self.taxonomy.variations
+
+    @property
+    def skill_aliases(self):
+        return self.taxonomy.aliases
+
+    @property
+    def all_skills(self):
+        return self.taxonomy.all_skills
 
-        for main_skill, variations in skill_variations.items():
-            for variation in variations:
-                pattern = r'\b' + re.escape(variation) + r'\b'
-                if re.search(pattern, text_lower) and main_skill not in [s.lower() for s in found_skills]:
-                    found_skills.append(main_skill)
+    def extract_skills(self, text):
+        """Extract skills from text using keyword matching"""
+        return self.taxonomy.extract(text)
 
-        # Remove duplicates and return
-        return list(set(found_skills))
+    def extract_resume_features(self, resume_text):
+        """Extract the job-independent features of a resume that are worth caching"""
+        experience_years = self._extract_experience_years(resume_text.lower())
+        return {
+            'skills': self.extract_skills(resume_text),
+            'experience_years': experience_years,
+            'profile': self.analyze_candidate(resume_text, experience_years)
+        }
 
-    def calculate_match_score(self, resume_text, job_description):
+    def analyze_candidate(self, resume_text, experience_years=None):
+        """Build a resume's CandidateProfile from one term scan and one tokenization"""
+        term_hits = frozenset(self.profile_matcher.find(resume_text))
+        if experience_years is None:
+            experience_years = self._extract_experience_years(resume_text.lower())
+
+        def count(terms):
+            return sum(1 for term in terms if term in term_hits)
+
+        return CandidateProfile(
+            term_hits=term_hits,
+            term_frequencies=self.term_frequencies(resume_text),
+            experience_years=experience_years,
+            education_level=max((level for edu, level in self.education_levels.items() if edu in term_hits), default=0),
+            leadership_count=count(self.leadership_terms),
+            tech_count=count(self.tech_indicators),
+            collaboration_count=count(self.collaboration_terms),
+            impact_count=count(self.impact_terms),
+            advanced_education=count(self.advanced_education) > 0,
+            certified=count(self.certification_terms) > 0,
+            industries=tuple(industry for industry, terms in self.industries.items() if count(terms))
+        )
+
+    def _candidate_profile(self, resume_text, resume_features):
+        """Return the CandidateProfile in resume_features, analyzing and storing it if missing
+
+        Features loaded from the parse cache carry no profile, so it is built on
+        first use and then shared by scoring and reasoning.
+        """
+        profile = resume_features.get('profile')
+        if profile is None:
+            profile = self.analyze_candidate(resume_text, resume_features.get('experience_years'))
+            resume_features['profile'] = profile
+        return profile
+
+    def calculate_match_score(self, resume_text, job_description, resume_features=None):
         """Calculate intelligent match score between resume and job description"""
-        resume_skills = set(self.extract_skills(resume_text))
-        job_skills = set(self.extract_skills(job_description))
+        if resume_features is None:
+            resume_features = self.extract_resume_features(resume_text)
+
+        return self._score_against_profile(resume_text, resume_features, self.get_job_profile(job_description))
+
+    def calculate_match_scores(self, resume_texts, job_description, resume_features=None, idf=None):
+        """Score a batch of resumes against one job description
+
+        Keyword similarity for the whole batch is a single sparse TF-IDF
+        matrix-vector product. idf is an InverseDocumentFrequencies snapshot of
+        the stored resume corpus and weights the job description and resume
+        terms alike; without it every term weighs the same and each score
+        equals calculate_match_score.
+        """
+        if resume_features is None:
+            resume_features = [self.extract_resume_features(text) for text in resume_texts]
+
+        job_profile = self.get_job_profile(job_description)
+        keyword_scorer = KeywordScorer(job_profile.term_frequencies, idf) if idf else job_profile.keyword_scorer
+        keyword_scores = keyword_scorer.score([
+            self._candidate_profile(text, features).term_frequencies
+            for text, features in zip(resume_texts, resume_features)
+        ])
+
+        return [
+            self._score_against_profile(text, features, job_profile, float(keyword_score))
+            for text, features, keyword_score in zip(resume_texts, resume_features, keyword_scores)
+        ]
+
+    def _score_against_profile(self, resume_text, resume_features, job_profile, keyword_score=None):
+        """Combine the weighted score components for one resume and a compiled job description"""
+        resume_skills = set(resume_features['skills'])
+        job_skills = job_profile.skills
 
         if not job_skills:
             return 0.0
@@ -105,18 +208,18 @@ class NLPProcessor:
         skill_match_score = min(1.0, skill_match_score + max(0, skill_abundance_bonus))
 
         # 2. Contextual keyword matching (25% weight)
-        resume_words = self._preprocess_text(resume_text)
-        job_words = self._preprocess_text(job_description)
-        keyword_score = self._calculate_keyword_similarity(resume_words, job_words)
+        candidate_profile = self._candidate_profile(resume_text, resume_features)
+        if keyword_score is None:
+            keyword_score = float(job_profile.keyword_scorer.score([candidate_profile.term_frequencies])[0])
 
         # 3. Experience analysis (20% weight)
-        experience_score = self._calculate_experience_score(resume_text, job_description)
+        experience_score = self._calculate_experience_score(resume_features['experience_years'], job_profile)
 
         # 4. Education relevance (10% weight)
-        education_score = self._calculate_education_score(resume_text, job_description)
+        education_score = self._calculate_education_score(candidate_profile, job_profile)
 
         # 5. Role-specific indicators (5% weight)
-        role_score = self._calculate_role_specific_score(resume_text, job_description)
+        role_score = self._calculate_role_specific_score(candidate_profile, job_profile)
 
         # Combine all scores with weights
         final_score = (
@@ -130,19 +233,60 @@ class NLPProcessor:
         # Ensure score is between 0 and 100
         return round(max(0, min(final_score, 100)), 1)
 
-    def _calculate_experience_score(self, resume_text, job_description):
-        """Calculate experience relevance score"""
-        resume_lower = resume_text.lower()
-        job_lower = job_description.lower()
+    def get_job_profile(self, job_description):
+        """Return the compiled JobProfile for a job description, memoized by content hash
 
-        # Extract years from resume
-        resume_years = self._extract_experience_years(resume_lower)
+        Profiles compiled under an older skill taxonomy are not reused after a reload.
+        """
+        job_description = job_description or ''
+        taxonomy = self.taxonomy
+        key = (taxonomy.fingerprint, hashlib.sha256(job_description.encode('utf-8')).hexdigest())
 
-        # Try to find required experience in job description
-        import re
+        with self._job_profile_lock:
+            job_profile = self._job_profiles.get(key)
+            if job_profile is not None:
+                self._job_profiles.move_to_end(key)
+                return job_profile
+
+        job_profile = self._compile_job_profile(job_description, taxonomy)
+
+        with self._job_profile_lock:
+            self._job_profiles[key] = job_profile
+            while len(self._job_profiles) > self.job_profile_cache_size:
+                self._job_profiles.popitem(last=False)
+
+        return job_profile
+
+    def _compile_job_profile(self, job_description, taxonomy):
+        """Analyze a job description once for scoring against many resumes"""
+        job_lower = job_description.lower()
+
+        # Required experience, defaulting to 2 years when not stated
         job_years_match = re.findall(r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:experience|exp)', job_lower)
         required_years = max([int(y) for y in job_years_match]) if job_years_match else 2
 
+        job_terms = self.profile_matcher.find(job_description)
+
+        # Required education level
+        education_level = max((level for edu, level in self.education_levels.items() if edu in job_terms), default=0)
+
+        # Default to bachelor's if no specific requirement found but mentions "degree"
+        if education_level == 0 and 'degree' in job_terms:
+            education_level = 2
+
+        return JobProfile(
+            skills=frozenset(taxonomy.extract(job_description)),
+            term_frequencies=self.term_frequencies(job_description),
+            required_years=required_years,
+            education_level=education_level,
+            role_terms=tuple(term for term in self.role_terms if term in job_terms),
+            industries=tuple(industry for industry, terms in self.industries.items() if any(term in job_terms for term in terms))
+        )
+
+    def _calculate_experience_score(self, resume_years, job_profile):
+        """Calculate experience relevance score"""
+        required_years = job_profile.required_years
+
         # Score based on experience match
         if resume_years >= required_years * 1.5:  # Significantly more experience
             return 1.0
@@ -155,34 +299,10 @@ class NLPProcessor:
         else:  # Limited experience
             return 0.2
 
-    def _calculate_education_score(self, resume_text, job_description):
+    def _calculate_education_score(self, candidate_profile, job_profile):
         """Calculate education relevance score"""
-        resume_lower = resume_text.lower()
-        job_lower = job_description.lower()
-
-        # Education levels
-        education_levels = {
-            'phd': 4, 'doctorate': 4, 'doctoral': 4,
-            'master': 3, 'mba': 3, 'ms': 3, 'ma': 3,
-            'bachelor': 2, 'bs': 2, 'ba': 2, 'degree': 2,
-            'diploma': 1, 'certificate': 1
-        }
-
-        # Find highest education in resume
-        resume_edu_level = 0
-        for edu, level in education_levels.items():
-            if edu in resume_lower:
-                resume_edu_level = max(resume_edu_level, level)
-
-        # Find required education in job description
-        required_edu_level = 0
-        for edu, level in education_levels.items():
-            if edu in job_lower:
-                required_edu_level = max(required_edu_level, level)
-
-        # Default to bachelor's if no specific requirement found but mentions "degree"
-        if required_edu_level == 0 and 'degree' in job_lower:
-            required_edu_level = 2
+        resume_edu_level = candidate_profile.education_level
+        required_edu_level = job_profile.education_level
 
         # Score based on education match
         if resume_edu_level >= required_edu_level:
@@ -194,45 +314,18 @@ class NLPProcessor:
         else:
             return 0.1
 
-    def _calculate_role_specific_score(self, resume_text, job_description):
+    def _calculate_role_specific_score(self, candidate_profile, job_profile):
         """Calculate role-specific indicators score"""
-        resume_lower = resume_text.lower()
-        job_lower = job_description.lower()
-
-        # Industry-specific terms
-        industry_terms = [
-            'healthcare', 'finance', 'fintech', 'banking', 'insurance',
-            'retail', 'e-commerce', 'manufacturing', 'automotive',
-            'technology', 'software', 'startup', 'enterprise',
-            'government', 'non-profit', 'education', 'media'
-        ]
-
-        # Company size indicators
-        size_terms = [
-            'startup', 'small business', 'mid-size', 'enterprise',
-            'fortune 500', 'multinational', 'global company'
-        ]
-
-        # Work style indicators
-        work_terms = [
-            'remote', 'hybrid', 'agile', 'waterfall', 'collaborative',
-            'cross-functional', 'fast-paced', 'deadline-driven'
-        ]
-
-        all_terms = industry_terms + size_terms + work_terms
-
-        # Count matching terms
-        matching_terms = 0
-        total_terms = 0
-
-        for term in all_terms:
-            if term in job_lower:
-                total_terms += 1
-                if term in resume_lower:
-                    matching_terms += 1
+        # Count matching terms among those the job description mentions
+        total_terms = len(job_profile.role_terms)
+        matching_terms = sum(1 for term in job_profile.role_terms if term in candidate_profile.term_hits)
 
         return matching_terms / total_terms if total_terms > 0 else 0.5
 
+    def term_frequencies(self, text):
+        """Count the preprocessed terms of a text"""
+        return Counter(self._preprocess_text(text))
+
     def _preprocess_text(self, text):
         """Preprocess text for analysis"""
         # Convert to lowercase and remove special characters
@@ -245,39 +338,17 @@ class NLPProcessor:
 
         return words
 
-    def _calculate_keyword_similarity(self, words1, words2):
-        """Calculate cosine similarity between two word lists"""
-        # Count word frequencies
-        freq1 = Counter(words1)
-        freq2 = Counter(words2)
-
-        # Get all unique words
-        all_words = set(freq1.keys()) | set(freq2.keys())
-
-        if not all_words:
-            return 0.0
-
-        # Create vectors
-        vec1 = [freq1.get(word, 0) for word in all_words]
-        vec2 = [freq2.get(word, 0) for word in all_words]
+    def generate_reasoning(self, content, skills, score, job_description="", candidate_profile=None):
+        """Generate intelligent, personalized reasoning for the match score
 
-        # Calculate cosine similarity
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        magnitude1 = math.sqrt(sum(a * a for a in vec1))
-        magnitude2 = math.sqrt(sum(a * a for a in vec2))
-
-        if magnitude1 == 0 or magnitude2 == 0:
-            return 0.0
-
-        return dot_product / (magnitude1 * magnitude2)
-
-    def generate_reasoning(self, content, skills, score, job_description=""):
-        """Generate intelligent, personalized reasoning for the match score"""
-        content_lower = content.lower()
-        job_lower = job_description.lower() if job_description else ""
+        Pass the CandidateProfile already built for scoring to avoid re-analyzing content.
+        """
+        if candidate_profile is None:
+            candidate_profile = self.analyze_candidate(content)
+        job_profile = self.get_job_profile(job_description) if job_description else None
 
         # Analyze different aspects
-        analysis = self._analyze_candidate_profile(content_lower, job_lower)
+        analysis = self._analyze_candidate_profile(candidate_profile, job_profile)
 
         strengths = analysis['strengths']
         concerns = analysis['concerns']
@@ -306,7 +377,7 @@ class NLPProcessor:
                 reasoning_parts.append(f"**Strengths:** {', '.join(strengths)}.")
 
         # Skills-specific analysis
-        skills_analysis = self._analyze_skills_match(skills, job_description)
+        skills_analysis = self._analyze_skills_match(skills, job_profile)
         if skills_analysis:
             reasoning_parts.append(skills_analysis)
 
@@ -324,14 +395,14 @@ class NLPProcessor:
 
         return " ".join(reasoning_parts)
 
-    def _analyze_candidate_profile(self, content_lower, job_lower):
+    def _analyze_candidate_profile(self, candidate_profile, job_profile=None):
         """Comprehensive analysis of candidate profile"""
         strengths = []
         concerns = []
         unique_factors = []
 
         # Experience analysis
-        experience_years = self._extract_experience_years(content_lower)
+        experience_years = candidate_profile.experience_years
         if experience_years >= 10:
             strengths.append(f"Highly experienced ({experience_years}+ years)")
         elif experience_years >= 5:
@@ -342,8 +413,7 @@ class NLPProcessor:
             concerns.append("Limited professional experience")
 
         # Leadership and seniority
-        leadership_terms = ['senior', 'lead', 'manager', 'director', 'head', 'principal', 'architect', 'chief', 'vp']
-        leadership_count = sum(1 for term in leadership_terms if term in content_lower)
+        leadership_count = candidate_profile.leadership_count
         if leadership_count >= 3:
             strengths.append("Strong leadership background")
             unique_factors.append("Executive-level experience")
@@ -351,34 +421,28 @@ class NLPProcessor:
             strengths.append("Leadership experience")
 
         # Technical depth
-        tech_indicators = ['architecture', 'design patterns', 'scalability', 'performance optimization', 'system design']
-        tech_count = sum(1 for term in tech_indicators if term in content_lower)
-        if tech_count >= 2:
+        if candidate_profile.tech_count >= 2:
             unique_factors.append("Deep technical expertise")
 
         # Education and certifications
-        advanced_edu = ['phd', 'doctorate', 'master', 'mba']
-        if any(edu in content_lower for edu in advanced_edu):
+        if candidate_profile.advanced_education:
             strengths.append("Advanced education")
 
-        cert_terms = ['certified', 'certification', 'aws certified', 'microsoft certified', 'google certified']
-        if any(cert in content_lower for cert in cert_terms):
+        if candidate_profile.certified:
             strengths.append("Professional certifications")
 
         # Industry experience
-        if job_lower:
-            industry_match = self._check_industry_alignment(content_lower, job_lower)
+        if job_profile:
+            industry_match = self._check_industry_alignment(candidate_profile, job_profile)
             if industry_match:
                 strengths.append(f"Relevant {industry_match} experience")
 
         # Collaboration and soft skills
-        collab_terms = ['collaborative', 'cross-functional', 'stakeholder', 'communication', 'presentation']
-        if sum(1 for term in collab_terms if term in content_lower) >= 2:
+        if candidate_profile.collaboration_count >= 2:
             strengths.append("Strong collaboration skills")
 
         # Innovation and impact
-        impact_terms = ['innovative', 'optimization', 'improvement', 'award', 'recognition', 'patent']
-        if sum(1 for term in impact_terms if term in content_lower) >= 2:
+        if candidate_profile.impact_count >= 2:
             unique_factors.append("Proven track record of innovation")
 
         return {
@@ -387,16 +451,16 @@ class NLPProcessor:
             'unique_factors': unique_factors
         }
 
-    def _analyze_skills_match(self, skills, job_description):
+    def _analyze_skills_match(self, skills, job_profile=None):
         """Analyze specific skills alignment"""
         if not skills or len(skills) < 2:
             return "Limited relevant technical skills identified."
 
-        job_skills = self.extract_skills(job_description) if job_description else []
+        job_skills = job_profile.skills if job_profile else frozenset()
 
         if len(skills) >= 8:
             if job_skills:
-                overlap = len(set(skills).intersection(set(job_skills)))
+                overlap = len(set(skills).intersection(job_skills))
                 if overlap >= len(job_skills) * 0.7:
                     return f"Excellent skills alignment with {overlap}/{len(job_skills)} key requirements met."
                 else:
@@ -408,21 +472,10 @@ class NLPProcessor:
         else:
             return f"Basic skill coverage ({len(skills)} skills) - may need additional training."
 
-    def _check_industry_alignment(self, content_lower, job_lower):
+    def _check_industry_alignment(self, candidate_profile, job_profile):
         """Check for industry-specific alignment"""
-        industries = {
-            'fintech': ['fintech', 'financial technology', 'payments', 'banking', 'trading'],
-            'healthcare': ['healthcare', 'medical', 'clinical', 'hospital', 'pharmaceutical'],
-            'e-commerce': ['e-commerce', 'retail', 'marketplace', 'shopping', 'consumer'],
-            'enterprise': ['enterprise', 'b2b', 'saas', 'corporate', 'business software'],
-            'startup': ['startup', 'early stage', 'seed', 'series a', 'venture']
-        }
-
-        for industry, terms in industries.items():
-            job_has_industry = any(term in job_lower for term in terms)
-            candidate_has_industry = any(term in content_lower for term in terms)
-
-            if job_has_industry and candidate_has_industry:
+        for industry in job_profile.industries:
+            if industry in candidate_profile.industries:
                 return industry
 
         return None
@@ -478,32 +531,36 @@ class NLPProcessor:
         return min(max_years, 20)  # Cap at 20 years to be reasonable
 
     def analyze_sentiment(self, text):
-        """Basic sentiment analysis using keyword matching"""
-        positive_words = [
-            'excellent', 'outstanding', 'exceptional', 'great', 'good', 'positive', 'strong',
-            'impressed', 'exceeded', 'successful', 'effective', 'innovative', 'creative',
-            'dedicated', 'motivated', 'reliable', 'professional', 'skilled', 'talented'
-        ]
+        """Score the sentiment of a text on a 0-10 scale"""
+        return SENTIMENT_LEXICON.score(text)
 
-        negative_words = [
-            'poor', 'bad', 'weak', 'inadequate', 'disappointing', 'failed', 'struggling',
-            'needs improvement', 'below average', 'unsatisfactory', 'problematic',
-            'concerning', 'difficult', 'challenging', 'issues', 'problems'
-        ]
+    def analyze_sentiments(self, texts):
+        """Score the sentiment of many texts in one pass, returning a list of 0-10 scores"""
+        return SENTIMENT_LEXICON.score_many(texts).tolist()
 
-        text_lower = text.lower()
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
+# Process-wide processor; built while the app is imported so forked gunicorn
+# workers and pool children inherit it instead of constructing their own
+_shared_processor = None
+_shared_processor_lock = threading.Lock()
 
-        total_words = len(text.split())
 
-        if total_words == 0:
-            return 0.0
+def get_nlp_processor():
+    """Return the shared NLPProcessor, building it on first use"""
+    global _shared_processor
+    if _shared_processor is None:
+        with _shared_processor_lock:
+            if _shared_processor is None:
+                _shared_processor = NLPProcessor()
+    return _shared_processor
+
 
-        # Calculate sentiment score (-1 to 1)
-        sentiment_score = (positive_count - negative_count) / max(total_words / 10, 1)
+def _reset_locks_after_fork():
+    """Give a forked child fresh locks in case another thread held them at fork time"""
+    global _shared_processor_lock
+    _shared_processor_lock = threading.Lock()
+    if _shared_processor is not None:
+        _shared_processor._job_profile_lock = threading.Lock()
 
-        # Normalize to 0-10 scale
-        normalized_score = (sentiment_score + 1) * 5
 
-        return round(max(0, min(10, normalized_score)), 2)
\ No newline at end of file
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_locks_after_fork)
@@ -0,0 +1,91 @@
+"""
+Parsed Resume Cache - Skip re-parsing resumes that were uploaded before
+"""
+import json
+
+from sqlalchemy import bindparam, update
+
+
+class ParsedResumeCache:
+    """Persistent cache of parsed resume text and features keyed by file content hash
+
+    Each entry records the fingerprint of the skill taxonomy its skills were
+    extracted with, so cached skills are re-matched only after the taxonomy
+    changes, and refresh_skills() writes the re-matched skills back.
+    """
+
+    # Keep IN clauses well under SQLite's bound-parameter limit
+    lookup_chunk_size = 500
+
+    def lookup(self, content_hashes):
+        """Return {content_hash: features} for every hash already in the cache"""
+        from models import ParsedResume
+
+        content_hashes = list(content_hashes)
+        cached = {}
+
+        for start in range(0, len(content_hashes), self.lookup_chunk_size):
+            chunk = content_hashes[start:start + self.lookup_chunk_size]
+            rows = ParsedResume.query.filter(ParsedResume.content_hash.in_(chunk)).all()
+            for row in rows:
+                cached[row.content_hash] = {
+                    'content': row.content,
+                    'skills': json.loads(row.skills_extracted) if row.skills_extracted else [],
+                    'experience_years': row.experience_years,
+                    'taxonomy_fingerprint': row.taxonomy_fingerprint
+                }
+
+        return cached
+
+    def store(self, features_by_hash):
+        """Add newly parsed resumes to the session; the caller commits"""
+        from database import db
+        from models import ParsedResume
+        from sqlalchemy.exc import IntegrityError
+
+        if not features_by_hash:
+            return
+
+        rows = [
+            {
+                'content_hash': content_hash,
+                'content': features['content'],
+                'skills_extracted': json.dumps(features['skills']),
+                'experience_years': features['experience_years'],
+                'taxonomy_fingerprint': features['taxonomy_fingerprint']
+            }
+            for content_hash, features in features_by_hash.items()
+        ]
+
+        # Another request may cache the same file concurrently; losing that race is harmless
+        try:
+            with db.session.begin_nested():
+                db.session.execute(db.insert(ParsedResume), rows)
+        except IntegrityError:
+            existing = set(self.lookup(features_by_hash))
+            rows = [row for row in rows if row['content_hash'] not in existing]
+            if rows:
+                with db.session.begin_nested():
+                    db.session.execute(db.insert(ParsedResume), rows)
+
+    def refresh_skills(self, features_by_hash):
+        """Overwrite the skills of cached resumes that were re-matched against a newer taxonomy; the caller commits"""
+        from database import db
+        from models import ParsedResume
+
+        if not features_by_hash:
+            return
+
+        db.session.execute(
+            update(ParsedResume.__table__)
+            .where(ParsedResume.content_hash == bindparam('hash'))
+            .values(skills_extracted=bindparam('skills'), taxonomy_fingerprint=bindparam('fingerprint')),
+            [
+                {
+                    'hash': content_hash,
+                    'skills': json.dumps(features['skills']),
+                    'fingerprint': features['taxonomy_fingerprint']
+                }
+                for content_hash, features in features_by_hash.items()
+            ]
+        )
@@ -1,12 +1,12 @@
 """
 Real HR Analytics - Process actual HR data for insights dashboard
 """
-import json
 from datetime import datetime, timedelta
-from sqlalchemy import func, extract, and_, or_
-from collections import defaultdict
+from sqlalchemy import func, or_
 import pandas as pd
-from io import BytesIO
+
+from utils.company_metrics import company_metrics
+from utils.employee_leaderboard import employee_leaderboard
 
 class RealHRAnalytics:
     """Process real HR data for comprehensive insights"""
@@ -16,14 +16,11 @@ class RealHRAnalytics:
     
     def get_company_insights(self):
         """Generate comprehensive company-wide insights from real data"""
-        from app import db
+        from database import db
         from models import Employee, HRTransaction, EmployeeHistory, CompanyMetrics, PerformanceReview
         
         current_year = datetime.now().year
         
-        # Basic employee metrics
-        total_employees = Employee.query.filter_by(status='active').count()
-        
         # Department distribution
         dept_distribution = db.session.query(
             Employee.department,
@@ -32,20 +29,22 @@ class RealHRAnalytics:
         
         dept_data = {dept: count for dept, count in dept_distribution}
         
-        # Increment analysis
-        increment_data = self._analyze_increments(current_year)
+        # Basic employee metrics
+        total_employees = sum(dept_data.values())
         
-        # Joining/Leaving analysis
-        joining_leaving_data = self._analyze_workforce_changes(current_year)
+        # Increment, joining/leaving and monthly trend figures come from the CompanyMetrics snapshots
+        snapshot = company_metrics.year_summary(current_year)
+        increment_data = snapshot['increment_data']
+        joining_leaving_data = snapshot['joining_leaving_data']
         
         # Performance distribution
         performance_data = self._analyze_performance()
         
         # Employee leaderboard
-        leaderboard = self._get_employee_leaderboard()
+        leaderboard = employee_leaderboard.top(10)
         
         # Monthly trends
-        monthly_trends = self._get_monthly_trends(current_year)
+        monthly_trends = snapshot['monthly_trends']
         
         # Wellness summary
         wellness_summary = self._get_wellness_summary()
@@ -61,92 +60,9 @@ class RealHRAnalytics:
             'wellness_summary': wellness_summary
         }
     
-    def _analyze_increments(self, year):
-        """Analyze increment data for the year"""
-        from app import db
-        from models import HRTransaction
-        
-        # Get all increment transactions for the year
-        increments = HRTransaction.query.filter(
-            and_(
-                HRTransaction.transaction_type == 'increment',
-                extract('year', HRTransaction.effective_date) == year
-            )
-        ).all()
-        
-        if not increments:
-            return {
-                'total_increments': 0,
-                'total_amount': 0,
-                'average_percentage': 0,
-                'by_department': {},
-                'by_month': {}
-            }
-        
-        total_increments = len(increments)
-        total_amount = sum(inc.amount or 0 for inc in increments)
-        avg_percentage = sum(inc.percentage or 0 for inc in increments) / total_increments
-        
-        # By department
-        dept_increments = defaultdict(lambda: {'count': 0, 'total_amount': 0})
-        for inc in increments:
-            if inc.department:
-                dept_increments[inc.department]['count'] += 1
-                dept_increments[inc.department]['total_amount'] += inc.amount or 0
-        
-        # By month
-        monthly_increments = defaultdict(lambda: {'count': 0, 'total_amount': 0})
-        for inc in increments:
-            month = inc.effective_date.month
-            monthly_increments[month]['count'] += 1
-            monthly_increments[month]['total_amount'] += inc.amount or 0
-        
-        return {
-            'total_increments': total_increments,
-            'total_amount': total_amount,
-            'average_percentage': round(avg_percentage, 2),
-            'by_department': dict(dept_increments),
-            'by_month': dict(monthly_increments)
-        }
-    
-    def _analyze_workforce_changes(self, year):
-        """Analyze workforce joining and leaving patterns"""
-        from app import db
-        from models import HRTransaction, Employee
-        
-        # Joinings
-        joinings = HRTransaction.query.filter(
-            and_(
-                HRTransaction.transaction_type == 'joining',
-                extract('year', HRTransaction.effective_date) == year
-            )
-        ).count()
-        
-        # Exits
-        exits = HRTransaction.query.filter(
-            and_(
-                HRTransaction.transaction_type == 'exit',
-                extract('year', HRTransaction.effective_date) == year
-            )
-        ).count()
-        
-        # Net growth
-        net_growth = joinings - exits
-        
-        # Attrition rate (exits / average headcount)
-        avg_headcount = Employee.query.count()
-        attrition_rate = (exits / avg_headcount * 100) if avg_headcount > 0 else 0
-        
-        return {
-            'joined_this_year': joinings,
-            'left_this_year': exits,
-            'net_growth': net_growth,
-            'attrition_rate': round(attrition_rate, 2)
-        }
-    
     def _analyze_performance(self):
         """Analyze performance distribution"""
-        from app import db
+        from database import db
         from models import Employee, PerformanceReview
         
         # Get recent performance reviews
@@ -190,97 +106,9 @@ class RealHRAnalytics:
             'average_rating': round(avg_rating, 2)
         }
     
-    def _get_employee_leaderboard(self):
-        """Get top performing employees"""
-        from app import db
-        from models import Employee, PerformanceReview, HRTransaction
-        
-        # Get employees with recent performance data
-        employees = Employee.query.filter_by(status='active').all()
-        
-        leaderboard_data = []
-        for emp in employees:
-            # Get latest performance review
-            latest_review = PerformanceReview.query.filter_by(
-                employee_id=emp.id
-            ).order_by(PerformanceReview.created_at.desc()).first()
-            
-            rating = latest_review.overall_rating if latest_review else emp.performance_score or 7.0
-            
-            # Get recent increments
-            recent_increments = HRTransaction.query.filter(
-                and_(
-                    HRTransaction.employee_id == emp.id,
-                    HRTransaction.transaction_type == 'increment',
-                    HRTransaction.effective_date >= datetime.now().date() - timedelta(days=365)
-                )
-            ).count()
-            
-            leaderboard_data.append({
-                'id': emp.id,
-                'name': emp.name,
-                'department': emp.department,
-                'position': emp.position,
-                'rating': rating,
-                'increments_this_year': recent_increments
-            })
-        
-        # Sort by rating and recent increments
-        leaderboard_data.sort(key=lambda x: (x['rating'], x['increments_this_year']), reverse=True)
-        
-        return leaderboard_data[:10]  # Top 10
-    
-    def _get_monthly_trends(self, year):
-        """Get monthly trends for various HR metrics"""
-        from app import db
-        from models import HRTransaction, Employee
-        
-        trends = {}
-        
-        # Monthly increments
-        monthly_increments = db.session.query(
-            extract('month', HRTransaction.effective_date).label('month'),
-            func.count(HRTransaction.id).label('count')
-        ).filter(
-            and_(
-                HRTransaction.transaction_type == 'increment',
-                extract('year', HRTransaction.effective_date) == year
-            )
-        ).group_by(extract('month', HRTransaction.effective_date)).all()
-        
-        trends['increments'] = {int(month): count for month, count in monthly_increments}
-        
-        # Monthly joinings
-        monthly_joinings = db.session.query(
-            extract('month', HRTransaction.effective_date).label('month'),
-            func.count(HRTransaction.id).label('count')
-        ).filter(
-            and_(
-                HRTransaction.transaction_type == 'joining',
-                extract('year', HRTransaction.effective_date) == year
-            )
-        ).group_by(extract('month', HRTransaction.effective_date)).all()
-        
-        trends['joinings'] = {int(month): count for month, count in monthly_joinings}
-        
-        # Monthly exits
-        monthly_exits = db.session.query(
-            extract('month', HRTransaction.effective_date).label('month'),
-            func.count(HRTransaction.id).label('count')
-        ).filter(
-            and_(
-                HRTransaction.transaction_type == 'exit',
-                extract('year', HRTransaction.effective_date) == year
-            )
-        ).group_by(extract('month', HRTransaction.effective_date)).all()
-        
-        trends['exits'] = {int(month): count for month, count in monthly_exits}
-        
-        return trends
-    
     def _get_wellness_summary(self):
         """Get wellness metrics summary"""
-        from app import db
+        from database import db
         from models import WellnessCheck
         
         # Get recent wellness checks (last 30 days)
@@ -304,7 +132,7 @@ class RealHRAnalytics:
     
     def get_employee_detailed_insights(self, employee_id):
         """Get detailed insights for a specific employee"""
-        from app import db
+        from database import db
         from models import Employee, HRTransaction, EmployeeHistory, PerformanceReview, WellnessCheck
         
         employee = Employee.query.get(employee_id)
@@ -0,0 +1,219 @@
+"""
+Resume Index - Inverted index for ranking the stored resume pool against a new job description
+"""
+import heapq
+import json
+import math
+import threading
+from collections import defaultdict
+
+from flask import current_app
+
+from utils.keyword_scorer import InverseDocumentFrequencies
+
+
+class ResumeIndex:
+    """Incremental inverted index over stored Resume rows
+
+    Skill postings map each canonical skill to the resumes that list it. Term
+    postings hold length-normalised log-TF weights per resume; IDF is applied to
+    the job description side at query time (lnc.ltc cosine), so adding resumes
+    never requires re-weighting existing postings.
+
+    Code that inserts resumes passes the new rows to add_rows() once they are
+    committed. sync() picks up rows stored by other processes and drops rows
+    that were deleted, a chunk at a time. It runs on a background thread
+    started by start(), so requests rank against whatever is indexed so far.
+    """
+
+    # Share of the index score given to skill coverage; the rest is keyword cosine
+    skill_weight = 0.6
+    # Rows analysed per sync chunk; postings are locked only while a chunk is added
+    sync_chunk_size = 500
+
+    def __init__(self, nlp_processor):
+        self.nlp_processor = nlp_processor
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._thread = None
+        self.ready = False  # set once the first sync has finished
+        self._reset()
+
+    def _reset(self):
+        """Drop all postings"""
+        self.skill_postings = defaultdict(set)
+        self.term_postings = defaultdict(dict)
+        self.documents = {}  # resume id -> (filename, skills)
+        self.last_id = 0  # highest id sync() has scanned
+
+    def add_rows(self, rows):
+        """Index committed Resume rows given as dicts with id, filename, content and skills_extracted"""
+        analysed = [(row['id'], row['filename'], *self._analyse(row['content'], row['skills_extracted'])) for row in rows]
+        with self._lock:
+            for resume_id, filename, skills, weights in analysed:
+                self._post(resume_id, filename, skills, weights)
+
+    def clear(self):
+        """Drop every posting, after all Resume rows have been deleted"""
+        with self._lock:
+            self._reset()
+
+    def sync(self):
+        """Index Resume rows stored since the last sync and drop postings of deleted rows"""
+        from database import db
+        from models import Resume
+
+        with self._sync_lock:
+            rows = db.session.execute(
+                db.select(Resume.id, Resume.filename, Resume.content, Resume.skills_extracted)
+                .where(Resume.id > self.last_id).order_by(Resume.id)
+                .execution_options(yield_per=self.sync_chunk_size)
+            )
+
+            for chunk in rows.partitions():
+                analysed = [
+                    (row_id, filename, *self._analyse(content, skills_extracted))
+                    for row_id, filename, content, skills_extracted in chunk
+                    if row_id not in self.documents
+                ]
+                with self._lock:
+                    for resume_id, filename, skills, weights in analysed:
+                        self._post(resume_id, filename, skills, weights)
+                    self.last_id = max(self.last_id, chunk[-1][0])
+
+            # Rows are only ever indexed after they are committed, so an id indexed
+            # before this query that the query does not return has been deleted
+            with self._lock:
+                indexed = set(self.documents)
+            if db.session.query(db.func.count(Resume.id)).scalar() != len(indexed):
+                stored = {resume_id for (resume_id,) in db.session.query(Resume.id)}
+                with self._lock:
+                    self._remove(indexed - stored)
+                    # SQLite hands out ids again once the highest rows are gone
+                    self.last_id = min(self.last_id, max(stored, default=0))
+
+    def start(self):
+        """Sync on a background thread; returns False if a sync is already running"""
+        app = current_app._get_current_object()
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(target=self._run, args=(app,), name='resume-index', daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self, app):
+        from database import db
+
+        with app.app_context():
+            try:
+                self.sync()
+                self.ready = True
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error syncing resume index: {e}")
+
+    def _analyse(self, content, skills_extracted):
+        """Return a resume's skills and length-normalised term weights"""
+        try:
+            skills = json.loads(skills_extracted) if skills_extracted else []
+        except (json.JSONDecodeError, TypeError):
+            skills = []
+
+        weights = {term: 1 + math.log(count) for term, count in self.nlp_processor.term_frequencies(content or '').items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return skills, ({term: weight / norm for term, weight in weights.items()} if norm else {})
+
+    def _post(self, resume_id, filename, skills, weights):
+        """Add one analysed resume to the postings"""
+        if resume_id in self.documents:
+            return
+
+        # Older rows store display-cased skills; postings use the lowercase canonical form
+        for skill in skills:
+            self.skill_postings[skill.lower()].add(resume_id)
+        for term, weight in weights.items():
+            self.term_postings[term][resume_id] = weight
+
+        self.documents[resume_id] = (filename, skills)
+
+    def _remove(self, resume_ids):
+        """Drop deleted resumes from the postings in one pass"""
+        if not resume_ids:
+            return
+        for skill in list(self.skill_postings):
+            self.skill_postings[skill] -= resume_ids
+            if not self.skill_postings[skill]:
+                del self.skill_postings[skill]
+        for term in list(self.term_postings):
+            postings = self.term_postings[term]
+            for resume_id in resume_ids.intersection(postings):
+                del postings[resume_id]
+            if not postings:
+                del self.term_postings[term]
+        for resume_id in resume_ids:
+            del self.documents[resume_id]
+
+    def inverse_document_frequencies(self):
+        """Return a snapshot of the indexed corpus's IDF for scoring resumes outside the index"""
+        with self._lock:
+            return InverseDocumentFrequencies(
+                len(self.documents), {term: len(postings) for term, postings in self.term_postings.items()}
+            )
+
+    def _idf(self, terms):
+        """Return smoothed inverse document frequencies of terms, with the lock held"""
+        doc_count = len(self.documents)
+        return {term: math.log((1 + doc_count) / (1 + len(self.term_postings.get(term, ())))) + 1 for term in terms}
+
+    def search(self, job_description, top_k=10):
+        """Return the top_k stored resumes for a job description, best first"""
+        job_profile = self.nlp_processor.get_job_profile(job_description)
+
+        with self._lock:
+            doc_count = len(self.documents)
+            if not doc_count:
+                return []
+
+            # Skill coverage from skill postings
+            skill_hits = defaultdict(int)
+            for skill in job_profile.skills:
+                for resume_id in self.skill_postings.get(skill, ()):
+                    skill_hits[resume_id] += 1
+
+            # Keyword cosine from term postings, IDF-weighting the job description
+            idf = self._idf(job_profile.term_frequencies)
+            query_weights = {term: (1 + math.log(count)) * idf[term] for term, count in job_profile.term_frequencies.items()}
+            query_norm = math.sqrt(sum(weight * weight for weight in query_weights.values()))
+
+            keyword_scores = defaultdict(float)
+            if query_norm:
+                for term, weight in query_weights.items():
+                    postings = self.term_postings.get(term)
+                    if not postings:
+                        continue
+                    query_weight = weight / query_norm
+                    for resume_id, doc_weight in postings.items():
+                        keyword_scores[resume_id] += query_weight * doc_weight
+
+            job_skill_count = len(job_profile.skills)
+            skill_weight = self.skill_weight if job_skill_count else 0.0
+
+            def index_score(resume_id):
+                skill_score = skill_hits.get(resume_id, 0) / job_skill_count if job_skill_count else 0.0
+                return (skill_score * skill_weight + keyword_scores.get(resume_id, 0.0) * (1 - skill_weight)) * 100
+
+            candidates = set(skill_hits) | set(keyword_scores)
+            top = heapq.nlargest(top_k, candidates, key=lambda resume_id: (index_score(resume_id), -resume_id))
+
+            results = []
+            for resume_id in top:
+                filename, skills = self.documents[resume_id]
+                results.append({
+                    'resume_id': resume_id,
+                    'filename': filename,
+                    'skills': skills,
+                    'matched_skills': sorted(job_profile.skills.intersection(skill.lower() for skill in skills)),
+                    'score': round(min(index_score(resume_id), 100), 1)
+                })
+            return results
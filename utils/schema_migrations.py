@@ -0,0 +1,88 @@
+"""
+Schema Migrations - Bring databases created by older versions up to the current models
+"""
+import re
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateIndex
+
+
+# Statements run once, right after the column they backfill has been added
+COLUMN_BACKFILLS = {
+    # Reviews scored before the marker existed: a non-zero score can only have come from the analyser
+    ('performance_review', 'sentiment_scored_at'):
+        "UPDATE performance_review SET sentiment_scored_at = created_at WHERE sentiment_score != 0.0",
+}
+
+
+def upgrade_schema(db):
+    """Add columns and indexes that db.create_all() skips on tables that already exist
+
+    Only additive changes are made: new nullable columns are added with ALTER
+    TABLE and missing indexes are created. Returns a list of what was changed.
+
+    Every worker runs this at startup. Each column is added and backfilled in
+    its own transaction, and a worker that loses the race to add it moves on
+    once it sees the column exists. Indexes are created with IF NOT EXISTS
+    afterwards, and on PostgreSQL CONCURRENTLY so building one does not block
+    writes to its table.
+    """
+    engine = db.engine
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    changes = []
+    missing_indexes = []
+
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing_columns and add_column(engine, table, column):
+                changes.append(f'{table.name}.{column.name}')
+
+        existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        missing_indexes.extend(index for index in table.indexes if index.name not in existing_indexes)
+
+    changes.extend(create_indexes(engine, missing_indexes))
+    return changes
+
+
+def add_column(engine, table, column):
+    """Add a column and run its backfill in one transaction; returns False if another worker added it first"""
+    column_type = column.type.compile(dialect=engine.dialect)
+    try:
+        with engine.begin() as connection:
+            connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            backfill = COLUMN_BACKFILLS.get((table.name, column.name))
+            if backfill:
+                connection.execute(text(backfill))
+    except DBAPIError:
+        if column.name not in {existing['name'] for existing in inspect(engine).get_columns(table.name)}:
+            raise
+        return False
+    return True
+
+
+def create_indexes(engine, indexes):
+    """Create `indexes` one statement at a time in autocommit mode and return the names created
+
+    CONCURRENTLY cannot run inside a transaction block. When another worker
+    creates the same index first, the error is ignored once the index exists.
+    """
+    created = []
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        for index in indexes:
+            statement = str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect))
+            if engine.dialect.name == 'postgresql':
+                statement = re.sub(r'^CREATE (UNIQUE )?INDEX', r'CREATE \1INDEX CONCURRENTLY', statement)
+            try:
+                connection.exec_driver_sql(statement)
+            except DBAPIError:
+                if index.name not in {existing['name'] for existing in inspect(engine).get_indexes(index.table.name)}:
+                    raise
+                continue
+            created.append(index.name)
+    return created
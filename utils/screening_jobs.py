@@ -0,0 +1,271 @@
+"""
+Screening Jobs - Run large resume batches in the background and track progress
+"""
+import glob
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from utils.screening_pipeline import ScreeningPipeline, TopCandidates
+from utils.parsed_resume_cache import ParsedResumeCache
+
+
+class ScreeningJobQueue:
+    """In-process FIFO queue that runs screening jobs on a background thread
+
+    Job and per-file state lives in the ScreeningJob/ScreeningJobFile tables, so
+    any worker process can answer progress polls for a job queued elsewhere.
+    Reasoning is written only for the reasoning_top_k best files, once the job
+    has finished scoring.
+
+    Uploads are copied to a per-job spool directory when the job is queued, and
+    each spooled file is removed as soon as the pipeline has read it, so a job
+    holds only the batches in flight in memory and nothing on disk once it ends.
+    Resume rows are stored and indexed resume_insert_chunk at a time as files
+    finish, so a job that fails partway keeps the resumes it has screened.
+
+    Every job this process has queued or is running gets its heartbeat_at
+    touched as files finish, so jobs whose worker died can be told apart from
+    jobs still waiting their turn elsewhere and failed by fail_orphaned().
+    """
+
+    reasoning_top_k = 10
+    # Resume rows inserted, committed and indexed at a time while a job runs
+    resume_insert_chunk = 500
+
+    def __init__(self, app, nlp_processor, resume_index=None):
+        self.app = app
+        self.nlp_processor = nlp_processor
+        self.resume_index = resume_index
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='screening-job')
+        self._lock = threading.Lock()
+        self._active = set()
+
+    def enqueue(self, uploads, job_description):
+        """Record a job for the (filename, source) uploads, spool them to disk and return its id immediately
+
+        A source is the file's bytes or a readable file object such as a werkzeug
+        FileStorage; it is copied in chunks, so the request can return without
+        the job keeping its uploads in memory.
+        """
+        from database import db
+        from models import ScreeningJob, ScreeningJobFile
+
+        job = ScreeningJob(job_description=job_description, total_files=len(uploads), heartbeat_at=datetime.utcnow())
+        db.session.add(job)
+        db.session.flush()
+
+        spool_dir = tempfile.mkdtemp(prefix=f'screening-job-{job.id}-', dir=self._spool_root())
+        try:
+            spooled = []
+            for number, (filename, source) in enumerate(uploads):
+                path = os.path.join(spool_dir, str(number))
+                self._spool(source, path)
+                spooled.append((filename, path))
+
+            db.session.add_all([ScreeningJobFile(job_id=job.id, filename=filename) for filename, _ in uploads])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            shutil.rmtree(spool_dir, ignore_errors=True)
+            raise
+
+        with self._lock:
+            self._active.add(job.id)
+        self._executor.submit(self._run, job.id, spooled, spool_dir, job_description)
+        return job.id
+
+    def _spool_root(self):
+        """Directory holding the per-job spool directories"""
+        return self.app.config.get('SCREENING_SPOOL_DIR') or tempfile.gettempdir()
+
+    def _spool(self, source, path):
+        """Copy one upload's bytes or file object to path"""
+        with open(path, 'wb') as spool_file:
+            if isinstance(source, bytes):
+                spool_file.write(source)
+            else:
+                source.seek(0)
+                shutil.copyfileobj(source, spool_file)
+
+    def fail_orphaned(self, timeout):
+        """Fail queued or running jobs whose heartbeat is older than `timeout` seconds
+
+        Their worker stopped (restart, deploy, crash) before finishing them, so
+        nothing will ever pick them up again. Returns the number of jobs failed.
+        """
+        from database import db
+        from models import ScreeningJob
+
+        now = datetime.utcnow()
+        heartbeat = db.func.coalesce(ScreeningJob.heartbeat_at, ScreeningJob.started_at, ScreeningJob.created_at)
+        job_ids = [job_id for (job_id,) in db.session.query(ScreeningJob.id).filter(
+            ScreeningJob.status.in_(('queued', 'running')),
+            heartbeat < now - timedelta(seconds=timeout)
+        )]
+        if not job_ids:
+            return 0
+
+        ScreeningJob.query.filter(ScreeningJob.id.in_(job_ids)).update({
+            'status': 'failed',
+            'error': 'Worker stopped before the job finished; please upload the files again',
+            'completed_at': now
+        }, synchronize_session=False)
+        db.session.commit()
+
+        # Their spooled uploads will never be read
+        for job_id in job_ids:
+            for spool_dir in glob.glob(os.path.join(self._spool_root(), f'screening-job-{job_id}-*')):
+                shutil.rmtree(spool_dir, ignore_errors=True)
+        return len(job_ids)
+
+    def _heartbeat(self):
+        """Mark every job this process still owns as alive"""
+        from database import db
+        from models import ScreeningJob
+
+        with self._lock:
+            job_ids = list(self._active)
+        if job_ids:
+            ScreeningJob.query.filter(ScreeningJob.id.in_(job_ids)).update(
+                {'heartbeat_at': datetime.utcnow()}, synchronize_session=False
+            )
+
+    def _run(self, job_id, uploads, spool_dir, job_description):
+        """Screen every upload for a job, committing each file's result as it finishes"""
+        from database import db
+        from models import ScreeningJob, ScreeningJobFile
+
+        with self.app.app_context():
+            job = db.session.get(ScreeningJob, job_id)
+            job.status = 'running'
+            job.started_at = job.heartbeat_at = datetime.utcnow()
+            db.session.commit()
+
+            try:
+                # Duplicate filenames are allowed, so hand out pending rows per name
+                pending_files = defaultdict(list)
+                for job_file in ScreeningJobFile.query.filter_by(job_id=job_id).order_by(ScreeningJobFile.id.desc()):
+                    pending_files[job_file.filename].append(job_file)
+
+                idf = None
+                if self.resume_index is not None:
+                    self.resume_index.sync()
+                    idf = self.resume_index.inverse_document_frequencies()
+
+                pipeline = ScreeningPipeline.from_config(self.app.config, feature_cache=ParsedResumeCache())
+                top_candidates = TopCandidates(self.reasoning_top_k)
+                resume_rows = []
+
+                for result in pipeline.run(uploads, job_description, idf=idf, with_reasoning=False, remove_files=True):
+                    job_file = pending_files[result['filename']].pop()
+                    job_file.completed_at = datetime.utcnow()
+
+                    if result.get('error'):
+                        job_file.status = 'failed'
+                        job_file.error = result['error']
+                    else:
+                        job_file.status = 'completed'
+                        job_file.score = result['score']
+                        job_file.skills_extracted = json.dumps(result['skills'])
+                        top_candidates.add(result['score'], (job_file, result))
+                        resume_rows.append({
+                            'filename': result['filename'],
+                            'content': result['content'],
+                            'skills_extracted': job_file.skills_extracted,
+                            'score': result['score'],
+                            'job_description': job_description
+                        })
+
+                    job.processed_files += 1
+                    self._heartbeat()
+                    db.session.commit()
+
+                    if len(resume_rows) >= self.resume_insert_chunk:
+                        self._store_resumes(resume_rows)
+                        resume_rows = []
+
+                if resume_rows:
+                    self._store_resumes(resume_rows)
+                    resume_rows = []
+
+                for job_file, result in top_candidates.ranked():
+                    job_file.reasoning = self.nlp_processor.generate_reasoning(
+                        result['content'], result['skills'], result['score'], job_description,
+                        candidate_profile=result['profile']
+                    )
+
+                job.status = 'completed'
+                job.completed_at = datetime.utcnow()
+                db.session.commit()
+
+            except Exception as e:
+                print(f"Screening job {job_id} failed: {e}")
+                db.session.rollback()
+                # Files already marked completed keep their resumes
+                if resume_rows:
+                    try:
+                        self._store_resumes(resume_rows)
+                    except Exception as store_error:
+                        db.session.rollback()
+                        print(f"Error storing resumes of screening job {job_id}: {store_error}")
+                job = db.session.get(ScreeningJob, job_id)
+                job.status = 'failed'
+                job.error = str(e)
+                job.completed_at = datetime.utcnow()
+                db.session.commit()
+
+            finally:
+                shutil.rmtree(spool_dir, ignore_errors=True)
+                with self._lock:
+                    self._active.discard(job_id)
+
+    def _store_resumes(self, rows):
+        """Insert and commit a chunk of Resume rows, then add them to the resume index"""
+        from database import db
+        from models import Resume
+
+        resume_ids = db.session.scalars(db.insert(Resume).returning(Resume.id, sort_by_parameter_order=True), rows).all()
+        db.session.commit()
+        if self.resume_index is not None:
+            self.resume_index.add_rows([{**row, 'id': resume_id} for row, resume_id in zip(rows, resume_ids)])
+
+    def get_status(self, job_id, limit=10):
+        """Return progress and the current top-ranked results for a job"""
+        from database import db
+        from models import ScreeningJob, ScreeningJobFile
+
+        job = db.session.get(ScreeningJob, job_id)
+        if not job:
+            return None
+
+        files = ScreeningJobFile.query.filter_by(job_id=job_id).order_by(ScreeningJobFile.id).all()
+        ranked = sorted((f for f in files if f.status == 'completed'), key=lambda f: f.score, reverse=True)
+
+        return {
+            'id': job.id,
+            'status': job.status,
+            'total_files': job.total_files,
+            'processed_files': job.processed_files,
+            'failed_files': sum(1 for f in files if f.status == 'failed'),
+            'progress': round(job.processed_files / job.total_files * 100, 1) if job.total_files else 100.0,
+            'error': job.error,
+            'files': [
+                {'filename': f.filename, 'status': f.status, 'score': f.score, 'error': f.error}
+                for f in files
+            ],
+            'results': [
+                {
+                    'filename': f.filename,
+                    'score': f.score,
+                    'skills': json.loads(f.skills_extracted) if f.skills_extracted else [],
+                    'reasoning': f.reasoning
+                }
+                for f in ranked[:limit]
+            ]
+        }
@@ -0,0 +1,257 @@
+"""
+Resume Screening Pipeline - Parse, score and explain uploaded resumes in parallel
+"""
+import hashlib
+import heapq
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+
+from utils.document_parser import DocumentParser
+from utils.nlp_processor import get_nlp_processor
+
+# Per-process parser and NLP engine, created lazily inside each pool worker
+_document_parser = None
+_nlp_processor = None
+# Corpus IDF handed to pool workers once, rather than with every batch
+_idf = None
+
+
+def _init_processors(parser_options=None, idf=None):
+    """Build this process's DocumentParser with the given options; used as the pool initializer"""
+    global _document_parser, _idf
+    _document_parser = DocumentParser(**(parser_options or {}))
+    _idf = idf
+
+
+def _get_processors():
+    """Return this process's DocumentParser and NLPProcessor, building them once"""
+    global _document_parser, _nlp_processor
+    if _document_parser is None:
+        _document_parser = DocumentParser()
+    if _nlp_processor is None:
+        _nlp_processor = get_nlp_processor()
+    return _document_parser, _nlp_processor
+
+
+def screen_resumes(batch, job_description, idf=None, with_reasoning=True):
+    """Parse and score a batch of (filename, bytes, content_hash, features) resumes; runs inside a pool worker
+
+    Resumes with cached features skip parsing and need no file bytes; their
+    skills are re-matched only if they were extracted with another taxonomy. Keyword
+    similarity for the batch is computed in one TF-IDF pass, with the pool
+    worker's IDF when none is passed. Without reasoning, results carry
+    reasoning=None for the caller to fill in for the few it shows, passing each
+    result's CandidateProfile back to generate_reasoning.
+    """
+    document_parser, nlp_processor = _get_processors()
+    idf = idf if idf is not None else _idf
+    taxonomy = nlp_processor.taxonomy
+    results = []
+    parsed = []
+
+    for filename, data, content_hash, features in batch:
+        if features is not None:
+            if features.get('taxonomy_fingerprint') != taxonomy.fingerprint:
+                features = dict(features, skills=taxonomy.extract(features['content']),
+                                taxonomy_fingerprint=taxonomy.fingerprint, skills_refreshed=True)
+            parsed.append((filename, content_hash, features['content'], features, True))
+            continue
+
+        try:
+            content = document_parser.extract_text_from_file(io.BytesIO(data), filename)
+            if not content or (isinstance(content, str) and content.startswith('Error:')):
+                results.append({'filename': filename, 'content_hash': content_hash, 'error': f'Could not parse {filename}. Please ensure the file is not corrupted.'})
+                continue
+            features = dict(nlp_processor.extract_resume_features(content), taxonomy_fingerprint=taxonomy.fingerprint)
+            parsed.append((filename, content_hash, content, features, False))
+        except Exception as e:
+            print(f"Error screening {filename}: {e}")
+            results.append({'filename': filename, 'content_hash': content_hash, 'error': f'Could not process {filename}: {str(e)}'})
+
+    scores = nlp_processor.calculate_match_scores(
+        [content for _, _, content, _, _ in parsed], job_description,
+        resume_features=[features for _, _, _, features, _ in parsed], idf=idf
+    )
+
+    for (filename, content_hash, content, features, cached), score in zip(parsed, scores):
+        results.append({
+            'filename': filename,
+            'content_hash': content_hash,
+            'content': content,
+            'skills': features['skills'],
+            'experience_years': features['experience_years'],
+            'taxonomy_fingerprint': features['taxonomy_fingerprint'],
+            'score': score,
+            # The single-pass analysis built for scoring, so callers can explain the result without redoing it
+            'profile': features['profile'],
+            'reasoning': nlp_processor.generate_reasoning(
+                content, features['skills'], score, job_description, candidate_profile=features['profile']
+            ) if with_reasoning else None,
+            'cached': cached,
+            'skills_refreshed': features.get('skills_refreshed', False)
+        })
+
+    return results
+
+
+class TopCandidates:
+    """Bounded min-heap keeping the k highest-scoring items seen so far
+
+    Items added earlier win ties, matching a stable sort of the full list by score.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self._heap = []
+        self._added = 0
+
+    def add(self, score, item):
+        """Offer an item; it is kept only while it ranks in the top k"""
+        entry = (score, -self._added, item)
+        self._added += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        else:
+            heapq.heappushpop(self._heap, entry)
+
+    def ranked(self):
+        """Return the kept items, best first"""
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+class ScreeningPipeline:
+    """Fan resume screening out to a process pool and stream results back"""
+
+    # Resumes per pool task; each task scores its batch with one TF-IDF product
+    batch_size = 16
+
+    def __init__(self, workers=None, feature_cache=None, parser_options=None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.feature_cache = feature_cache
+        self.parser_options = parser_options
+
+    @classmethod
+    def from_config(cls, config, feature_cache=None):
+        """Build a pipeline from the app's SCREENING_* and OCR_* settings"""
+        return cls(
+            workers=config['SCREENING_WORKERS'],
+            feature_cache=feature_cache,
+            parser_options={
+                'ocr_dpi': config['OCR_DPI'],
+                'ocr_workers': config['OCR_WORKERS'],
+                'ocr_time_budget': config['OCR_TIME_BUDGET']
+            }
+        )
+
+    def run(self, uploads, job_description, idf=None, with_reasoning=True, remove_files=False):
+        """Yield one result dict per (filename, source) upload, in completion order
+
+        A source is the file's bytes, a readable file object such as a werkzeug
+        FileStorage, or the path of a file on disk. Sources are read a batch at a
+        time, and only a couple of batches per worker are in flight, so memory
+        stays bounded however many files are uploaded. With remove_files, path
+        sources are deleted as soon as they have been read.
+
+        With a feature cache, uploads whose content hash is already cached are only
+        re-scored, and newly parsed resumes (or cached ones whose skills were
+        re-matched against a newer taxonomy) are written back as each batch
+        finishes. idf is an InverseDocumentFrequencies snapshot of the stored resume
+        corpus, usually from ResumeIndex.inverse_document_frequencies, that weights
+        both sides of the keyword similarity. Pass with_reasoning=False
+        when only the top few results will be explained.
+        """
+        uploads = list(uploads)
+        size = max(1, min(self.batch_size, -(-len(uploads) // self.workers)))
+        batches = (self._prepare_batch(uploads[start:start + size], remove_files) for start in range(0, len(uploads), size))
+
+        # A pool costs more than it saves for a single batch or a single worker
+        if self.workers == 1 or len(uploads) <= size:
+            batch_results = self._run_in_process(batches, job_description, idf, with_reasoning)
+        else:
+            batch_count = -(-len(uploads) // size)
+            batch_results = self._run_in_pool(batches, min(self.workers, batch_count), job_description, idf, with_reasoning)
+
+        for results in batch_results:
+            if self.feature_cache:
+                self.feature_cache.store({
+                    result['content_hash']: result for result in results
+                    if not result.get('error') and not result['cached']
+                })
+                self.feature_cache.refresh_skills({
+                    result['content_hash']: result for result in results
+                    if not result.get('error') and result['skills_refreshed']
+                })
+            yield from results
+
+    def _prepare_batch(self, uploads, remove_files=False):
+        """Read and hash a slice of uploads into (filename, bytes, content_hash, features) tasks"""
+        uploads = [(filename, data, hashlib.sha256(data).hexdigest()) for filename, data in
+                   ((filename, self._read(source, remove_files)) for filename, source in uploads)]
+        cached = self.feature_cache.lookup({content_hash for _, _, content_hash in uploads}) if self.feature_cache else {}
+
+        # Cached resumes only need re-scoring, so don't ship their bytes to the worker
+        return [
+            (filename, None if content_hash in cached else data, content_hash, cached.get(content_hash))
+            for filename, data, content_hash in uploads
+        ]
+
+    def _read(self, source, remove_files=False):
+        """Return an upload's bytes, reading file objects from the start"""
+        if isinstance(source, bytes):
+            return source
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as upload_file:
+                data = upload_file.read()
+            if remove_files:
+                os.remove(source)
+            return data
+        source.seek(0)
+        return source.read()
+
+    def _run_in_process(self, batches, job_description, idf, with_reasoning):
+        """Screen batches one after another in this process"""
+        if self.parser_options:
+            _init_processors(self.parser_options)
+        for batch in batches:
+            yield self._screen_safely(batch, job_description, idf, with_reasoning)
+
+    def _run_in_pool(self, batches, workers, job_description, idf, with_reasoning):
+        """Screen batches across a process pool, keeping at most two per worker in flight"""
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_processors, initargs=(self.parser_options, idf)) as executor:
+            in_flight = {}
+
+            def finished(futures):
+                for future in futures:
+                    batch_keys = in_flight.pop(future)
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        yield self._batch_errors(batch_keys, e)
+
+            for batch in batches:
+                if len(in_flight) >= workers * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    yield from finished(done)
+
+                # Only names and hashes are kept here; the bytes go with the task
+                future = executor.submit(screen_resumes, batch, job_description, None, with_reasoning)
+                in_flight[future] = [(filename, content_hash) for filename, _, content_hash, _ in batch]
+
+            yield from finished(as_completed(list(in_flight)))
+
+    def _screen_safely(self, batch, job_description, idf, with_reasoning):
+        """Screen one batch in-process, converting failures into error results"""
+        try:
+            return screen_resumes(batch, job_description, idf, with_reasoning)
+        except Exception as e:
+            return self._batch_errors([(filename, content_hash) for filename, _, content_hash, _ in batch], e)
+
+    def _batch_errors(self, batch_keys, error):
+        """Error results for every (filename, content_hash) in a batch that failed as a whole"""
+        print(f"Error screening batch of {len(batch_keys)} resumes: {error}")
+        return [
+            {'filename': filename, 'content_hash': content_hash, 'error': f'Could not process {filename}: {str(error)}'}
+            for filename, content_hash in batch_keys
+        ]
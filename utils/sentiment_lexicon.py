@@ -0,0 +1,177 @@
+"""
+Sentiment Lexicon - Compiled, phrase-aware lexicon scoring for review text
+"""
+from itertools import repeat
+
+import numpy as np
+
+POSITIVE_TERMS = (
+    'excellent', 'outstanding', 'exceptional', 'great', 'good', 'positive', 'strong',
+    'impressed', 'exceeded', 'successful', 'effective', 'innovative', 'creative',
+    'dedicated', 'motivated', 'reliable', 'professional', 'skilled', 'talented',
+    'exceeded expectations', 'above and beyond', 'team player', 'high quality'
+)
+
+NEGATIVE_TERMS = (
+    'poor', 'bad', 'weak', 'inadequate', 'disappointing', 'failed', 'struggling',
+    'needs improvement', 'below average', 'unsatisfactory', 'problematic',
+    'concerning', 'difficult', 'challenging', 'issues', 'problems', 'issue', 'problem',
+    'below expectations', 'missed deadlines', 'lack of'
+)
+
+NEGATORS = (
+    'not', 'no', 'never', 'without', 'hardly', 'nothing', 'neither', 'nor', 'cannot',
+    "isn't", "wasn't", "aren't", "weren't", "don't", "doesn't", "didn't", "won't",
+    "wouldn't", "can't", "couldn't", "shouldn't", "hasn't", "haven't", "hadn't"
+)
+
+# Token ids below the first lexicon term; _CONJUNCTION to _SEPARATOR end a negation's scope
+_NEUTRAL, _PHRASE_TAIL, _NEGATOR, _CONJUNCTION, _BREAK, _SEPARATOR = 0, 1, 2, 3, 4, 5
+
+# Joins texts into one corpus per chunk; replaced by a space if a text contains it
+_DOCUMENT_SEPARATOR = '\x00'
+
+# Sentence punctuation becomes its own token, other punctuation separates words
+_SPLIT_MARKS = '.,!?;' + _DOCUMENT_SEPARATOR
+_WORD_SEPARATORS = str.maketrans({char: ' ' for char in '"#$%&()*+-/:<=>@[\\]^_`{|}~\u2018\u201c\u201d'})
+
+
+class SentimentLexicon:
+    """Score texts by counting lexicon terms, with phrases and negation
+
+    A chunk of texts is joined into one corpus, tokenized with a handful of
+    C-level string passes and one split, and mapped to term ids. Phrase matching, polarity
+    lookup, negation scope and the per-text counts are then numpy operations
+    over the ids of the few tokens that are not neutral words, so a list of
+    texts costs one pass over its characters and a few array operations, not
+    a Python loop per term.
+
+    Words are whole tokens, so 'good' no longer matches 'goodbye', and every
+    occurrence counts. A negator flips the polarity of the first lexicon term
+    up to negation_window tokens after it, unless punctuation or 'but' comes
+    first. Scores keep the original 0-10 scale: (positive - negative) divided
+    by max(words / 10, 1), mapped from -1..1 onto 0..10.
+    """
+
+    negation_window = 3
+    # Texts joined into one corpus at a time, bounding memory on large batches
+    chunk_size = 20000
+
+    def __init__(self, positive_terms, negative_terms, negators):
+        self.vocab = {negator: _NEGATOR for negator in negators}
+        self.vocab.update({token: _BREAK for token in '.,!?;'})
+        self.vocab.update({'but': _CONJUNCTION, _DOCUMENT_SEPARATOR: _SEPARATOR})
+
+        polarity = [0.0] * (_SEPARATOR + 1)
+        phrases = []
+
+        def term_id(word, sign=0.0):
+            if word not in self.vocab:
+                self.vocab[word] = len(polarity)
+                polarity.append(sign)
+            return self.vocab[word]
+
+        for terms, sign in ((positive_terms, 1.0), (negative_terms, -1.0)):
+            for term in terms:
+                words = term.lower().split()
+                if len(words) == 1:
+                    polarity[term_id(words[0])] = sign
+                else:
+                    # Phrases get an id of their own plus ids for their words
+                    phrases.append((term_id(' '.join(words), sign), tuple(term_id(word) for word in words)))
+
+        self.polarity = np.array(polarity)
+        # Longest phrases first so overlapping phrases prefer the longer one
+        self.phrases = sorted(phrases, key=lambda phrase: len(phrase[1]), reverse=True)
+
+    def score(self, text):
+        """Return the 0-10 sentiment score of one text"""
+        return float(self.score_many([text])[0])
+
+    def score_many(self, texts):
+        """Return an array of 0-10 sentiment scores, one per text"""
+        positive, negative, words = self.counts(texts)
+
+        raw = (positive - negative) / np.maximum(words / 10, 1)
+        scores = np.clip((raw + 1) * 5, 0, 10)
+        scores[words == 0] = 0.0
+        return np.round(scores, 2)
+
+    def counts(self, texts):
+        """Return arrays of positive term, negative term and word counts per text"""
+        texts = list(texts)
+        positive = np.zeros(len(texts))
+        negative = np.zeros(len(texts))
+        words = np.zeros(len(texts))
+
+        for start in range(0, len(texts), self.chunk_size):
+            chunk = texts[start:start + self.chunk_size]
+            end = start + len(chunk)
+            positive[start:end], negative[start:end], words[start:end] = self._count_chunk(chunk)
+
+        return positive, negative, words
+
+    def _count_chunk(self, texts):
+        """Count one chunk of texts with a single tokenizer pass"""
+        texts = [text or '' for text in texts]
+        corpus = _DOCUMENT_SEPARATOR.join(texts)
+        if corpus.count(_DOCUMENT_SEPARATOR) != len(texts) - 1:
+            corpus = _DOCUMENT_SEPARATOR.join(text.replace(_DOCUMENT_SEPARATOR, ' ') for text in texts)
+        corpus = corpus.lower().replace('\u2019', "'").translate(_WORD_SEPARATORS)
+        # Chained str.replace is far cheaper than a regex or multi-character translate here
+        for mark in _SPLIT_MARKS:
+            corpus = corpus.replace(mark, f' {mark} ')
+
+        # map() keeps the per-token dictionary lookup out of the bytecode loop
+        tokens = corpus.split()
+        ids = np.fromiter(map(self.vocab.get, tokens, repeat(_NEUTRAL)), dtype=np.intp, count=len(tokens))
+        size = len(texts)
+        if not len(ids):
+            return np.zeros(size), np.zeros(size), np.zeros(size)
+
+        # Everything below only looks at negators, breaks and lexicon words,
+        # which are a small share of real review text; neutral tokens only
+        # matter through their positions
+        position = np.flatnonzero(ids > _PHRASE_TAIL)
+        ids = ids[position]
+
+        # Collapse each phrase onto its first token; the rest are dropped and
+        # only count as words
+        for phrase_id, word_ids in self.phrases:
+            span = len(ids) - len(word_ids) + 1
+            if span <= 0:
+                continue
+            match = ids[:span] == word_ids[0]
+            for offset, word_id in enumerate(word_ids[1:], 1):
+                match &= (ids[offset:offset + span] == word_id) & (position[offset:offset + span] == position[:span] + offset)
+            starts = np.flatnonzero(match)
+            ids[starts] = phrase_id
+            for offset in range(1, len(word_ids)):
+                ids[starts + offset] = _PHRASE_TAIL
+
+        # A term is negated if the latest negator is close, and no break or
+        # other lexicon term sits between them
+        polarity = self.polarity[ids]
+        is_break = (ids >= _CONJUNCTION) & (ids <= _SEPARATOR)
+        last_negator = np.maximum.accumulate(np.where(ids == _NEGATOR, position, -1))
+        last_break = np.maximum.accumulate(np.where(is_break, position, -1))
+        last_term = np.maximum.accumulate(np.where(polarity != 0, position, -1))
+        previous_term = np.concatenate(([-1], last_term[:-1]))
+        negated = (
+            (last_negator > last_break) & (last_negator > previous_term) &
+            (position - last_negator <= self.negation_window)
+        )
+        polarity = np.where(negated, -polarity, polarity)
+
+        # Words per text are its tokens between separators, less punctuation tokens
+        is_separator = ids == _SEPARATOR
+        boundaries = np.concatenate(([-1], position[is_separator], [len(tokens)]))
+        document = np.cumsum(is_separator)
+        return (
+            np.bincount(document, weights=polarity > 0, minlength=size),
+            np.bincount(document, weights=polarity < 0, minlength=size),
+            np.diff(boundaries) - 1 - np.bincount(document, weights=ids == _BREAK, minlength=size)
+        )
+
+
+SENTIMENT_LEXICON = SentimentLexicon(POSITIVE_TERMS, NEGATIVE_TERMS, NEGATORS)
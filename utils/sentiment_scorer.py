@@ -0,0 +1,109 @@
+"""
+Sentiment Scorer - Batch sentiment analysis for performance reviews
+"""
+import threading
+from datetime import datetime
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+
+class SentimentBatchScorer:
+    """Score PerformanceReview rows that have no sentiment yet
+
+    A review is unscored while sentiment_scored_at is null, so a genuine 0.0
+    score is never re-analysed. Pending reviews are walked in id order,
+    chunk_size at a time, loading only id and feedback, and each chunk is
+    written with one bulk UPDATE and one commit.
+
+    Reviews added through the ORM session are scored as they are flushed, so
+    the batch pass only has rows written around the ORM (bulk inserts, imports)
+    or left over from before scoring existed.
+    """
+
+    chunk_size = 500
+
+    def __init__(self, app, nlp_processor):
+        self.app = app
+        self.nlp_processor = nlp_processor
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def score_reviews(self, reviews):
+        """Score new PerformanceReview objects in place before they are committed"""
+        _score_in_place(reviews, self.nlp_processor)
+
+    def score_pending(self, limit=None):
+        """Score unscored reviews chunk by chunk and return how many were scored"""
+        from database import db
+        from models import PerformanceReview
+
+        scored = 0
+        last_id = 0
+
+        while limit is None or scored < limit:
+            chunk_size = self.chunk_size if limit is None else min(self.chunk_size, limit - scored)
+            rows = db.session.query(PerformanceReview.id, PerformanceReview.feedback).filter(
+                PerformanceReview.sentiment_scored_at.is_(None),
+                PerformanceReview.id > last_id
+            ).order_by(PerformanceReview.id).limit(chunk_size).all()
+
+            if not rows:
+                break
+
+            scores = self.nlp_processor.analyze_sentiments([feedback for _, feedback in rows])
+            scored_at = datetime.utcnow()
+            db.session.execute(update(PerformanceReview), [
+                {'id': row.id, 'sentiment_score': score, 'sentiment_scored_at': scored_at}
+                for row, score in zip(rows, scores)
+            ])
+            db.session.commit()
+
+            last_id = rows[-1].id
+            scored += len(rows)
+
+        return scored
+
+    def start(self):
+        """Score pending reviews on a background thread; returns False if a run is already going"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(target=self._run, name='sentiment-scorer', daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self):
+        from database import db
+
+        with self.app.app_context():
+            try:
+                scored = self.score_pending()
+                if scored:
+                    print(f"Scored sentiment for {scored} performance reviews")
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error scoring review sentiment: {e}")
+
+
+def _score_in_place(reviews, nlp_processor):
+    """Set sentiment_score and sentiment_scored_at on PerformanceReview objects"""
+    scores = nlp_processor.analyze_sentiments([review.feedback for review in reviews])
+    scored_at = datetime.utcnow()
+    for review, score in zip(reviews, scores):
+        review.sentiment_score = score
+        review.sentiment_scored_at = scored_at
+
+
+@event.listens_for(Session, 'before_flush')
+def _score_new_reviews(session, flush_context, instances):
+    """Score unscored reviews added to the session, in one pass, before they are inserted"""
+    from models import PerformanceReview
+    from utils.nlp_processor import get_nlp_processor
+
+    reviews = [
+        instance for instance in session.new
+        if isinstance(instance, PerformanceReview) and instance.sentiment_scored_at is None
+    ]
+    if reviews:
+        _score_in_place(reviews, get_nlp_processor())
@@ -0,0 +1,199 @@
+"""
+Skill Taxonomy - Shared skill vocabulary loaded from data/skill_taxonomy.json
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+
+from utils.term_matcher import TermMatcher
+
+TAXONOMY_PATH = os.environ.get(
+    'SKILL_TAXONOMY_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'skill_taxonomy.json')
+)
+
+
+class SkillTaxonomy:
+    """Compiled, read-only skill vocabulary
+
+    Categories, variations and aliases are frozen into tuples behind read-only
+    mappings, and the whole vocabulary is compiled into one TermMatcher. A
+    taxonomy is never modified after construction; reloading builds a new one
+    and swaps it in, so readers holding the old one are unaffected.
+    """
+
+    def __init__(self, categories, variations, aliases, display_names=None, role_skills=None,
+                 default_role_skills=(), department_skills=None, version=None, fingerprint=None):
+        self.version = version
+        self.fingerprint = fingerprint
+        self.categories = MappingProxyType({name: tuple(skills) for name, skills in categories.items()})
+        self.variations = MappingProxyType({skill: tuple(terms) for skill, terms in variations.items()})
+        self.aliases = MappingProxyType({skill: tuple(terms) for skill, terms in aliases.items()})
+        self.display_names = MappingProxyType(dict(display_names or {}))
+        self.role_skills = MappingProxyType({role: tuple(skills) for role, skills in (role_skills or {}).items()})
+        self.default_role_skills = tuple(default_role_skills)
+        self.department_skills = MappingProxyType({
+            department: tuple(
+                [skill for category in groups.get('categories', ()) for skill in self.categories.get(category, ())] +
+                list(groups.get('skills', ()))
+            )
+            for department, groups in (department_skills or {}).items()
+        })
+
+        # Flatten categories, then canonical skills and their variations
+        all_skills = [skill for skills in self.categories.values() for skill in skills]
+        for main_skill, terms in self.variations.items():
+            if main_skill not in all_skills:
+                all_skills.append(main_skill)
+            all_skills.extend(terms)
+        self.all_skills = tuple(all_skills)
+        self.skill_set = frozenset(all_skills)
+
+        alias_to_skills = {}
+        for main_skill, terms in self.aliases.items():
+            for alias in terms:
+                alias_to_skills.setdefault(alias, []).append(main_skill)
+        self.alias_to_skills = MappingProxyType({alias: tuple(skills) for alias, skills in alias_to_skills.items()})
+
+        # Compile the vocabulary once so extraction is a single scan per text
+        self.matcher = TermMatcher(all_skills + list(alias_to_skills))
+
+    @classmethod
+    def from_file(cls, path):
+        """Load and compile a taxonomy file, raising ValueError if it is malformed"""
+        with open(path, 'rb') as taxonomy_file:
+            raw = taxonomy_file.read()
+
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid skill taxonomy JSON in {path}: {e}")
+
+        for section in ('categories', 'variations', 'aliases'):
+            if not isinstance(data.get(section), dict):
+                raise ValueError(f"Skill taxonomy {path} is missing the '{section}' mapping")
+
+        return cls(
+            categories=data['categories'],
+            variations=data['variations'],
+            aliases=data['aliases'],
+            display_names=data.get('display_names'),
+            role_skills=data.get('role_skills'),
+            default_role_skills=data.get('default_role_skills', ()),
+            department_skills=data.get('department_skills'),
+            version=data.get('version'),
+            fingerprint=hashlib.sha256(raw).hexdigest()
+        )
+
+    def extract(self, text):
+        """Return the skills mentioned in text, crediting canonical skills behind aliases"""
+        matched_terms = self.matcher.find(text)
+        found_skills = {term for term in matched_terms if term in self.skill_set}
+
+        for term in matched_terms:
+            found_skills.update(self.alias_to_skills.get(term, ()))
+
+        return list(found_skills)
+
+    def display_name(self, skill):
+        """Return the user-facing spelling of a lowercase skill"""
+        return self.display_names.get(skill) or ' '.join(word[:1].upper() + word[1:] for word in skill.split(' '))
+
+    def skills_for_role(self, job_role):
+        """Return the skills typical of a job title, or the default set"""
+        role_lower = job_role.lower()
+        for role_type, skills in self.role_skills.items():
+            if role_type in role_lower:
+                return skills
+        return self.default_role_skills
+
+    def summary(self):
+        """Describe the taxonomy for status endpoints"""
+        return {
+            'version': self.version,
+            'fingerprint': self.fingerprint,
+            'categories': len(self.categories),
+            'skills': len(self.skill_set)
+        }
+
+
+class TaxonomyStore:
+    """Holds the current SkillTaxonomy and swaps in reloaded ones atomically
+
+    Reloads compile the new taxonomy before taking the lock, and replacing the
+    reference is a single assignment, so readers never wait on a rebuild. Each
+    process also watches the file's modification time, so an edit or a reload
+    triggered in one gunicorn worker reaches the others without a restart; that
+    rebuild runs on a background thread while requests keep the old taxonomy.
+    """
+
+    # Seconds between checks of the taxonomy file's modification time
+    check_interval = 5
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._taxonomy = SkillTaxonomy.from_file(path)
+        self._mtime = self._file_mtime()
+        self._next_check = time.monotonic() + self.check_interval
+        self._reloading = False
+
+    def current(self):
+        """Return the current taxonomy, scheduling a background reload if the file changed"""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            if self._file_mtime() != self._mtime and not self._reloading:
+                self._reloading = True
+                threading.Thread(target=self._reload_in_background, name='skill-taxonomy-reload', daemon=True).start()
+        return self._taxonomy
+
+    def reload(self):
+        """Compile the taxonomy file now and swap it in; on error the current one is kept"""
+        mtime = self._file_mtime()
+        taxonomy = SkillTaxonomy.from_file(self.path)
+        with self._lock:
+            self._taxonomy = taxonomy
+            self._mtime = mtime
+        return taxonomy
+
+    def _reload_in_background(self):
+        try:
+            self.reload()
+        except (OSError, ValueError) as e:
+            print(f"Skill taxonomy reload failed, keeping version {self._taxonomy.version}: {e}")
+            # Don't retry a broken file until it changes again
+            self._mtime = self._file_mtime()
+        finally:
+            self._reloading = False
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+
+_store = TaxonomyStore(TAXONOMY_PATH)
+
+
+def get_skill_taxonomy():
+    """Return the current shared SkillTaxonomy"""
+    return _store.current()
+
+
+def reload_skill_taxonomy():
+    """Reload the taxonomy file in this process and return the new taxonomy"""
+    return _store.reload()
+
+
+def _reset_after_fork():
+    """A reload thread does not survive fork, so let the child start its own"""
+    _store._reloading = False
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
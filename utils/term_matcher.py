@@ -0,0 +1,92 @@
+"""
+Term Matcher - Find every occurrence of a fixed vocabulary in a single scan
+"""
+import re
+
+
+class TermMatcher:
+    """Precompiled matcher that finds all vocabulary terms present in a text
+
+    The vocabulary is compiled once into a trie-shaped regular expression wrapped
+    in a lookahead, so a single ``finditer`` pass reports the longest term starting
+    at every position. Shorter terms starting at the same position are always
+    prefixes of that longest term, so they are resolved from a precomputed prefix
+    table instead of another scan of the text.
+    """
+
+    def __init__(self, terms, whole_words=True):
+        self.whole_words = whole_words
+        self.terms = sorted({term.lower() for term in terms if term})
+
+        boundary = r'\b' if whole_words else ''
+        trie = self._build_trie(self.terms)
+        self._pattern = re.compile(f'(?={boundary}({self._trie_to_regex(trie)}){boundary})')
+
+        # Terms that are strict prefixes of another term, checked only when the
+        # longer term matched at the same position
+        self._prefixes = self._collect_prefixes(trie)
+        prefix_terms = {prefix for prefixes in self._prefixes.values() for prefix in prefixes}
+        self._term_patterns = {
+            term: re.compile(boundary + re.escape(term) + boundary) for term in prefix_terms
+        }
+
+    def find(self, text):
+        """Return the set of vocabulary terms present in the text"""
+        if not self.terms or not text:
+            return set()
+
+        text_lower = text.lower()
+        found = set()
+
+        for match in self._pattern.finditer(text_lower):
+            term = match.group(1)
+            found.add(term)
+
+            for prefix in self._prefixes.get(term, ()):
+                if prefix in found:
+                    continue
+                if not self.whole_words or self._term_patterns[prefix].match(text_lower, match.start()):
+                    found.add(prefix)
+
+        return found
+
+    def _build_trie(self, terms):
+        """Build a character trie from the vocabulary"""
+        trie = {}
+        for term in terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = True
+        return trie
+
+    def _collect_prefixes(self, trie):
+        """Map each term to the shorter terms that end on its path through the trie"""
+        prefixes = {}
+
+        def walk(node, path, ancestors):
+            if '' in node:
+                if ancestors:
+                    prefixes[path] = list(ancestors)
+                ancestors = ancestors + [path]
+            for char, child in node.items():
+                if char:
+                    walk(child, path + char, ancestors)
+
+        walk(trie, '', [])
+        return prefixes
+
+    def _trie_to_regex(self, node):
+        """Convert a trie node into a regex that prefers the longest branch"""
+        branches = [re.escape(char) + self._trie_to_regex(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+
+        is_terminal = '' in node
+        if len(branches) == 1 and not is_terminal:
+            return branches[0]
+
+        # Greedy optional group tries the longer continuation before stopping here
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if is_terminal else group